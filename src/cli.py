@@ -714,7 +714,8 @@ def reset(clear: bool) -> None:
 @click.option("--port", "-p", default=8000, help="端口号")
 @click.option("--host", "-h", default="127.0.0.1", help="主机地址")
 @click.option("--reload", is_flag=True, help="自动重载（开发模式）")
-def serve(port: int, host: str, reload: bool) -> None:
+@click.option("--workers", "-w", default=1, help="工作进程数（自动重载时固定为 1）")
+def serve(port: int, host: str, reload: bool, workers: int) -> None:
     """启动 Web 服务器。
 
     提供可视化报告查看和实时分析功能。
@@ -725,6 +726,9 @@ def serve(port: int, host: str, reload: bool) -> None:
         click.echo("✗ 需要安装 uvicorn: pip install uvicorn[standard]", err=True)
         sys.exit(1)
 
+    from src.server import server_implementations, server_workers, warn_missing_accelerators
+
+    warn_missing_accelerators()
     click.echo(f"🚀 启动 Web 服务器: http://{host}:{port}", err=True)
     click.echo("按 Ctrl+C 停止服务器", err=True)
 
@@ -734,6 +738,8 @@ def serve(port: int, host: str, reload: bool) -> None:
             host=host,
             port=port,
             reload=reload,
+            workers=server_workers(reload, workers),
+            **server_implementations(),
         )
     except KeyboardInterrupt:
         click.echo("\n\n👋 服务器已停止", err=True)
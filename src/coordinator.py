@@ -4,6 +4,7 @@
 """
 
 import logging
+import threading
 import time
 import uuid
 from dataclasses import dataclass, field
@@ -68,22 +69,7 @@ class Coordinator:
         self._scheduler = scheduler  # backward-compatible attribute, intentionally unused
 
         # 初始化搜索工具
-        self._search_tool = search_tool
-        if self._search_tool is None:
-            try:
-                config = get_config()
-                if hasattr(config, "search") and config.search.api_key:
-                    self._search_tool = get_search_tool(
-                        provider=config.search.provider,
-                        api_key=config.search.api_key,
-                    )
-                elif hasattr(config, "search"):
-                    self._search_tool = get_search_tool(
-                        provider=config.search.provider,
-                    )
-            except Exception as e:
-                logger.warning(f"Failed to initialize search tool: {e}")
-                self._search_tool = None
+        self._search_tool = search_tool if search_tool is not None else _create_search_tool()
 
     def analyze(
         self,
@@ -507,9 +493,32 @@ class Coordinator:
         return summary
 
 
+def _create_search_tool() -> Any:
+    """按配置创建搜索工具，失败时返回 None。"""
+    try:
+        config = get_config()
+        if hasattr(config, "search") and config.search.api_key:
+            return get_search_tool(
+                provider=config.search.provider,
+                api_key=config.search.api_key,
+            )
+        elif hasattr(config, "search"):
+            return get_search_tool(
+                provider=config.search.provider,
+            )
+    except Exception as e:
+        logger.warning(f"Failed to initialize search tool: {e}")
+    return None
+
+
 # 全局编排器实例（延迟加载）
 _coordinator: Coordinator | None = None
 
+# 进程内共享的搜索工具（延迟加载）；创建失败时缓存 None，reset_coordinator 后才重试
+_search_tool: Any = None
+_search_tool_ready = False
+_search_tool_lock = threading.Lock()
+
 
 def get_coordinator() -> Coordinator:
     """获取全局编排器实例。
@@ -523,7 +532,47 @@ def get_coordinator() -> Coordinator:
     return _coordinator
 
 
+def get_shared_search_tool() -> Any:
+    """获取进程内共享的搜索工具。
+
+    Web 服务为每次分析构建独立环境的编排器，搜索工具（连接池、缓存、配额状态）
+    在各次分析间复用，避免每次请求重新创建。
+
+    Returns:
+        搜索工具，创建失败时为 None
+    """
+    global _search_tool, _search_tool_ready
+    if _search_tool_ready:
+        return _search_tool
+    with _search_tool_lock:
+        if not _search_tool_ready:
+            _search_tool = _create_search_tool()
+            _search_tool_ready = True
+        return _search_tool
+
+
+def _close_search_tool(tool: Any) -> None:
+    """关闭搜索工具持有的配额数据库连接。
+
+    进程内共享的 HTTP 客户端不在此关闭：各搜索源单例在构造时已持有它，
+    关闭后它们的后续请求都会失败；该客户端由 src.search.http 在进程退出时关闭。
+    """
+    close = getattr(tool, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception as e:
+            logger.warning(f"Failed to close search tool: {e}")
+
+
 def reset_coordinator() -> None:
-    """重置全局编排器。"""
-    global _coordinator
+    """重置全局编排器，并关闭共享搜索工具。"""
+    global _coordinator, _search_tool, _search_tool_ready
     _coordinator = None
+    with _search_tool_lock:
+        tool = _search_tool
+        was_ready = _search_tool_ready
+        _search_tool = None
+        _search_tool_ready = False
+    if was_ready:
+        _close_search_tool(tool)
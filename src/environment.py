@@ -7,11 +7,14 @@
 - Signal: 新版本信号格式（推荐使用）
 """
 
-import json
+import heapq
+import itertools
 import math
 import re
 import threading
+import time
 import uuid
+from bisect import bisect_left, insort
 from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -20,6 +23,35 @@ from pathlib import Path
 from typing import Any
 
 from src.utils.config import get_config
+from src.utils.imports import json_dumps_bytes, json_loads
+
+# msgpack（可选）：以 .msgpack 结尾的文件使用二进制格式持久化
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+# ijson（可选）：加载大文件时逐条解析 discoveries，峰值内存与单条发现相当
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    ijson = None
+    IJSON_AVAILABLE = False
+
+# 二进制持久化格式的文件后缀
+MSGPACK_SUFFIX = ".msgpack"
+
+# 保存时的写缓冲大小
+SAVE_BUFFER_SIZE = 1 << 20
+
+# 超过该大小的 JSON 文件在安装 ijson 时流式加载
+STREAM_LOAD_THRESHOLD = 10 * 1024 * 1024
+
+# 逐条序列化的大数组段（值为带 to_dict 的对象列表）
+STREAMED_SECTIONS = ("discoveries", "signals")
 
 # 导入新的 Signal 结构
 try:
@@ -49,7 +81,7 @@ class SignalGraphEdgeType(str, Enum):
     DEBATE_ATTACK = "debate_attack"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Discovery:
     """发现数据类。
 
@@ -177,17 +209,21 @@ class StigmergyEnvironment:
         max_discoveries: int | None = None,
         run_isolation: bool | None = None,
         discovery_migration_deadline: str | None = None,
+        persistent: bool = True,
     ) -> None:
         """初始化环境。
 
         Args:
-            cache_path: 缓存目录路径
+            cache_path: 缓存目录路径，None 表示使用配置中的缓存目录
+            persistent: 是否落盘；False 时不创建缓存目录，save / load 不读写文件
         """
         config = get_config()
         env_config = getattr(config, "environment", None)
 
-        self._cache_path = Path(cache_path or config.cache.path)
-        self._cache_path.mkdir(parents=True, exist_ok=True)
+        self._cache_path: Path | None = None
+        if persistent:
+            self._cache_path = Path(cache_path or config.cache.path)
+            self._cache_path.mkdir(parents=True, exist_ok=True)
         self._lock = threading.RLock()
 
         self._signal_ttl_hours = (
@@ -250,6 +286,19 @@ class StigmergyEnvironment:
         self._discoveries: dict[str, Discovery] = {}
         self._pheromones: dict[str, VirtualPheromone] = {}
 
+        # Discovery 反向索引（随增删同步维护，查询不再全量扫描）
+        # 插入序号：按序号排序即恢复 _discoveries 的插入顺序
+        self._discovery_seq: dict[str, int] = {}
+        self._discovery_counter = itertools.count()
+        # Agent 类型 -> {发现 ID: 质量评分}（按插入顺序；按 Agent 过滤质量时无需访问 Discovery 对象）
+        self._discoveries_by_agent: dict[str, dict[str, float]] = {}
+        # (质量评分, 插入序号, 发现 ID)，按质量升序
+        self._discovery_quality_index: list[tuple[float, int, str]] = []
+        # 被引用的发现 ID -> 引用它的发现 ID
+        self._discovery_referrers: dict[str, set[str]] = {}
+        # 被引用的发现 ID -> 引用方 Agent 类型计数（写入时累计，跨 Agent 洞察直接读取）
+        self._discovery_referrer_agents: dict[str, Counter[str]] = {}
+
         # 新版本 Signal 存储
         self._signals: dict[str, Any] = {} if not SIGNALS_AVAILABLE else {}
         self._signal_pheromones: dict[str, VirtualPheromone] = {}
@@ -303,8 +352,11 @@ class StigmergyEnvironment:
             return False
         return (datetime.now() - dt).total_seconds() > ttl_hours * 3600
 
+    def _isolation_active(self) -> bool:
+        return bool(self._run_isolation and self._current_run_id)
+
     def _is_discovery_visible(self, discovery: Discovery) -> bool:
-        if not self._run_isolation or not self._current_run_id:
+        if not self._isolation_active():
             return True
         return self._extract_run_id(discovery.metadata) == self._current_run_id
 
@@ -694,8 +746,7 @@ class StigmergyEnvironment:
             if self._is_expired(discovery.timestamp, self._discovery_ttl_hours)
         ]
         for item_id in expired_discovery_ids:
-            self._discoveries.pop(item_id, None)
-            self._pheromones.pop(item_id, None)
+            self._remove_discovery(item_id)
 
         expired_signal_ids = [
             item_id
@@ -725,8 +776,7 @@ class StigmergyEnvironment:
                 key=lambda item_id: self._parse_timestamp(self._discoveries[item_id].timestamp) or datetime.min,
             )
             for item_id in ordered_ids[:overflow]:
-                self._discoveries.pop(item_id, None)
-                self._pheromones.pop(item_id, None)
+                self._remove_discovery(item_id)
 
         if self._max_signals > 0 and len(self._signals) > self._max_signals:
             overflow = len(self._signals) - self._max_signals
@@ -748,6 +798,61 @@ class StigmergyEnvironment:
             for key in stale_keys:
                 self._signal_graph_edges.pop(key, None)
 
+    def _index_discovery(self, discovery: Discovery) -> None:
+        """将发现加入反向索引。"""
+        seq = next(self._discovery_counter)
+        self._discovery_seq[discovery.id] = seq
+        self._discoveries_by_agent.setdefault(discovery.agent_type, {})[discovery.id] = discovery.quality_score
+        insort(self._discovery_quality_index, (discovery.quality_score, seq, discovery.id))
+        for ref_id in set(discovery.references):
+            self._discovery_referrers.setdefault(ref_id, set()).add(discovery.id)
+            self._discovery_referrer_agents.setdefault(ref_id, Counter())[discovery.agent_type] += 1
+
+    def _remove_discovery(self, item_id: str) -> None:
+        """移除发现及其信息素，并同步更新反向索引。"""
+        discovery = self._discoveries.pop(item_id, None)
+        self._pheromones.pop(item_id, None)
+        if discovery is None:
+            return
+
+        seq = self._discovery_seq.pop(item_id, None)
+        agent_ids = self._discoveries_by_agent.get(discovery.agent_type)
+        if agent_ids is not None:
+            agent_ids.pop(item_id, None)
+            if not agent_ids:
+                del self._discoveries_by_agent[discovery.agent_type]
+        if seq is not None:
+            entry = (discovery.quality_score, seq, item_id)
+            index = bisect_left(self._discovery_quality_index, entry)
+            if index < len(self._discovery_quality_index) and self._discovery_quality_index[index] == entry:
+                del self._discovery_quality_index[index]
+        for ref_id in set(discovery.references):
+            referrers = self._discovery_referrers.get(ref_id)
+            if referrers is not None:
+                referrers.discard(item_id)
+                if not referrers:
+                    del self._discovery_referrers[ref_id]
+            agent_counts = self._discovery_referrer_agents.get(ref_id)
+            if agent_counts is not None:
+                agent_counts[discovery.agent_type] -= 1
+                if agent_counts[discovery.agent_type] <= 0:
+                    del agent_counts[discovery.agent_type]
+                if not agent_counts:
+                    del self._discovery_referrer_agents[ref_id]
+        self._discovery_referrers.pop(item_id, None)
+        self._discovery_referrer_agents.pop(item_id, None)
+
+    def _rebuild_discovery_indexes(self) -> None:
+        """按 _discoveries 的当前内容重建反向索引。"""
+        self._discovery_seq.clear()
+        self._discovery_counter = itertools.count()
+        self._discoveries_by_agent.clear()
+        self._discovery_quality_index.clear()
+        self._discovery_referrers.clear()
+        self._discovery_referrer_agents.clear()
+        for discovery in self._discoveries.values():
+            self._index_discovery(discovery)
+
     # ========== Discovery 方法（向后兼容） ==========
 
     def add_discovery(
@@ -789,6 +894,7 @@ class StigmergyEnvironment:
 
             self._discoveries[discovery_id] = discovery
             self._pheromones[discovery_id] = VirtualPheromone(discovery_id)
+            self._index_discovery(discovery)
 
             # 更新被引用发现的计数
             for ref_id in discovery.references:
@@ -827,9 +933,14 @@ class StigmergyEnvironment:
         """
         with self._lock:
             self.prune()
+            discoveries = self._discoveries
+            agent_ids = self._discoveries_by_agent.get(agent_type, ())
+            if not self._isolation_active():
+                return [discoveries[item_id] for item_id in agent_ids]
             return [
-                d for d in self._discoveries.values()
-                if d.agent_type == agent_type and self._is_discovery_visible(d)
+                discoveries[item_id]
+                for item_id in agent_ids
+                if self._is_discovery_visible(discoveries[item_id])
             ]
 
     def get_relevant_discoveries(
@@ -852,12 +963,22 @@ class StigmergyEnvironment:
         """
         with self._lock:
             self.prune()
-            discoveries = [d for d in self._discoveries.values() if self._is_discovery_visible(d)]
-
-            # 筛选
+            # 筛选：按 Agent 类型走 Agent 索引，否则在质量索引上二分定位 min_quality
             if agent_type:
-                discoveries = [d for d in discoveries if d.agent_type == agent_type]
-            discoveries = [d for d in discoveries if d.quality_score >= min_quality]
+                candidate_ids = [
+                    item_id
+                    for item_id, quality in self._discoveries_by_agent.get(agent_type, {}).items()
+                    if quality >= min_quality
+                ]
+            else:
+                start = bisect_left(self._discovery_quality_index, (min_quality,))
+                candidate_ids = [entry[2] for entry in self._discovery_quality_index[start:]]
+                # 恢复插入顺序，同分时与原先的稳定排序结果一致
+                candidate_ids.sort(key=self._discovery_seq.__getitem__)
+
+            discoveries = [self._discoveries[item_id] for item_id in candidate_ids]
+            if self._isolation_active():
+                discoveries = [d for d in discoveries if self._is_discovery_visible(d)]
 
             # 按虚拟信息素排序
             def score(d: Discovery) -> float:
@@ -865,8 +986,7 @@ class StigmergyEnvironment:
                 ref_count = pheromone.reference_count if pheromone else 0
                 return ref_count * d.quality_score
 
-            discoveries.sort(key=score, reverse=True)
-            return discoveries[:limit]
+            return heapq.nlargest(max(0, limit), discoveries, key=score)
 
     def get_hot_discoveries(self, limit: int = 5) -> list[Discovery]:
         """获取热门发现（高引用计数）（旧版本）。
@@ -879,13 +999,27 @@ class StigmergyEnvironment:
         """
         with self._lock:
             self.prune()
+            if limit <= 0:
+                return []
+            # 先取被引用过的发现排序，不足 limit 时再按插入顺序补充未被引用的发现
             scored = [
-                (d, self._pheromones[d.id].reference_count)
-                for d in self._discoveries.values()
-                if self._is_discovery_visible(d)
+                (discovery, pheromone.reference_count)
+                for item_id, pheromone in self._pheromones.items()
+                if pheromone.reference_count > 0
+                and (discovery := self._discoveries.get(item_id)) is not None
+                and self._is_discovery_visible(discovery)
             ]
-            scored.sort(key=lambda x: x[1], reverse=True)
-            return [d for d, _ in scored[:limit]]
+            # 只需前 limit 个：部分选择 O(n log k)，无需整体排序
+            top = heapq.nlargest(limit, scored, key=lambda x: (x[1], -self._discovery_seq.get(x[0].id, 0)))
+            hot = [d for d, _ in top]
+            if len(hot) < limit:
+                for discovery in self._discoveries.values():
+                    if len(hot) >= limit:
+                        break
+                    pheromone = self._pheromones.get(discovery.id)
+                    if (pheromone is None or pheromone.reference_count <= 0) and self._is_discovery_visible(discovery):
+                        hot.append(discovery)
+            return hot
 
     # ========== Signal 方法（新版本） ==========
 
@@ -998,7 +1132,7 @@ class StigmergyEnvironment:
 
             # 应用过滤器
             if filter_obj:
-                signals = [s for s in signals if filter_obj.matches(s)]
+                signals = filter_obj.matches_many(signals)
 
             signals.sort(
                 key=lambda signal: self._signal_gradient_score(signal, query=query),
@@ -1202,9 +1336,10 @@ class StigmergyEnvironment:
         with self._lock:
             self.prune()
             self._apply_decay_to_all_signal_pheromones()
+            now_epoch = time.time()
             signals = [
                 s for s in self._signals.values()
-                if self._is_signal_visible(s) and s.is_fresh(max_age_hours)
+                if self._is_signal_visible(s) and s.is_fresh_at(now_epoch, max_age_hours)
             ]
 
             signals.sort(key=lambda s: self._signal_gradient_score(s), reverse=True)
@@ -1319,15 +1454,19 @@ class StigmergyEnvironment:
                     if not discovery or not self._is_discovery_visible(discovery):
                         continue
 
-                    referrers = [
-                        d.agent_type
-                        for d in self._discoveries.values()
-                        if (
-                            self._is_discovery_visible(d)
-                            and discovery_id in d.references
-                            and d.agent_type != discovery.agent_type
-                        )
-                    ]
+                    if self._isolation_active():
+                        # 运行隔离时需逐个检查引用方是否属于当前运行
+                        referrers = {
+                            d.agent_type
+                            for d in (
+                                self._discoveries[referrer_id]
+                                for referrer_id in self._discovery_referrers.get(discovery_id, ())
+                            )
+                            if self._is_discovery_visible(d)
+                        }
+                    else:
+                        referrers = set(self._discovery_referrer_agents.get(discovery_id, ()))
+                    referrers.discard(discovery.agent_type)
                     if not referrers:
                         continue
 
@@ -1336,7 +1475,7 @@ class StigmergyEnvironment:
                         "discovery_id": discovery_id,
                         "content": discovery.content[:100] + "..." if len(discovery.content) > 100 else discovery.content,
                         "from_agent": discovery.agent_type,
-                        "referenced_by": sorted(set(referrers)),
+                        "referenced_by": sorted(referrers),
                         "reference_count": pheromone.reference_count,
                         "dimension": "",
                     })
@@ -1349,9 +1488,16 @@ class StigmergyEnvironment:
     def save(self, filename: str = "environment.json") -> None:
         """保存环境到文件。
 
+        文件名以 .msgpack 结尾时写入 msgpack 二进制格式，否则写入 JSON
+        （orjson 可用时由其编码）。
+
+        不落盘的环境（persistent=False）不写文件。
+
         Args:
             filename: 文件名
         """
+        if self._cache_path is None:
+            return
         cache_file = self._cache_path / filename
         with self._lock:
             self.prune()
@@ -1363,12 +1509,13 @@ class StigmergyEnvironment:
                 s.id for s in self._signals.values() if self._is_signal_visible(s)
             }
 
+            # discoveries / signals 保留对象列表，写文件时逐条序列化，不构建完整的字典树
             data = {
                 "discoveries": [
-                    d.to_dict() for d in self._discoveries.values() if d.id in visible_discovery_ids
+                    d for d in self._discoveries.values() if d.id in visible_discovery_ids
                 ],
                 "signals": [
-                    s.to_dict() for s in self._signals.values() if s.id in visible_signal_ids
+                    s for s in self._signals.values() if s.id in visible_signal_ids
                 ] if SIGNALS_AVAILABLE else [],
                 "pheromones": [
                     {
@@ -1415,33 +1562,118 @@ class StigmergyEnvironment:
                 "run_id": self._current_run_id,
             }
 
-            with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(cache_file, "wb", buffering=SAVE_BUFFER_SIZE) as f:
+                self._write_payload(f, cache_file, data)
+
+    @staticmethod
+    def _is_msgpack_file(path: Path) -> bool:
+        if path.suffix != MSGPACK_SUFFIX:
+            return False
+        if not MSGPACK_AVAILABLE:
+            raise ImportError("msgpack is required for .msgpack environment files: pip install msgpack")
+        return True
+
+    def _write_payload(self, f: Any, path: Path, data: dict[str, Any]) -> None:
+        """按文件后缀写出持久化数据，STREAMED_SECTIONS 中的数组逐条编码写入。"""
+        if self._is_msgpack_file(path):
+            packer = msgpack.Packer(use_bin_type=True)
+            f.write(packer.pack_map_header(len(data)))
+            for key, value in data.items():
+                f.write(packer.pack(key))
+                if key in STREAMED_SECTIONS:
+                    f.write(packer.pack_array_header(len(value)))
+                    for item in value:
+                        f.write(packer.pack(item.to_dict()))
+                else:
+                    f.write(packer.pack(value))
+            return
+
+        f.write(b"{")
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                f.write(b",")
+            f.write(json_dumps_bytes(key))
+            f.write(b":")
+            if key in STREAMED_SECTIONS:
+                f.write(b"[")
+                for item_index, item in enumerate(value):
+                    if item_index:
+                        f.write(b",")
+                    f.write(json_dumps_bytes(item.to_dict()))
+                f.write(b"]")
+            else:
+                f.write(json_dumps_bytes(value))
+        f.write(b"}")
+
+    def _read_payload(self, path: Path, on_discovery: Any) -> dict[str, Any]:
+        """按文件后缀读取持久化数据。
+
+        安装 ijson 且 JSON 文件超过 STREAM_LOAD_THRESHOLD 时逐条解析，
+        每条发现交给 on_discovery 后即丢弃，返回的数据不含 discoveries 段；
+        其他情况整体解析，返回完整数据。
+        """
+        if self._is_msgpack_file(path):
+            return msgpack.unpackb(path.read_bytes(), raw=False)
+        if not IJSON_AVAILABLE or path.stat().st_size <= STREAM_LOAD_THRESHOLD:
+            return json_loads(path.read_bytes())
+
+        data: dict[str, Any] = {}
+        builder: Any = None
+        section = ""
+        is_container = False
+        try:
+            with open(path, "rb") as f:
+                for prefix, event, value in ijson.parse(f, use_float=True):
+                    if not prefix or prefix == "discoveries":
+                        # 根对象与 discoveries 数组本身的事件
+                        continue
+                    if builder is None:
+                        # 新的一段：一条发现，或一个顶层字段的值
+                        builder = ijson.ObjectBuilder()
+                        section = prefix
+                        is_container = event in ("start_map", "start_array")
+                    builder.event(event, value)
+                    if is_container and not (prefix == section and event in ("end_map", "end_array")):
+                        continue
+                    if section == "discoveries.item":
+                        on_discovery(builder.value)
+                    else:
+                        data[section] = builder.value
+                    builder = None
+        except ijson.JSONError as e:
+            raise ValueError(str(e)) from e
+        return data
 
     def load(self, filename: str = "environment.json") -> bool:
-        """从文件加载环境。
+        """从文件加载环境（格式由文件后缀决定，见 save）。
 
         Args:
             filename: 文件名
 
         Returns:
-            是否成功加载
+            是否成功加载；不落盘的环境始终返回 False
         """
+        if self._cache_path is None:
+            return False
         cache_file = self._cache_path / filename
 
         if not cache_file.exists():
             return False
 
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            discoveries: dict[str, Discovery] = {}
+
+            def add_loaded_discovery(item: dict[str, Any]) -> None:
+                discoveries[item["id"]] = Discovery.from_dict(item)
+
+            data = self._read_payload(cache_file, add_loaded_discovery)
+            for item in data.pop("discoveries", None) or []:
+                add_loaded_discovery(item)
 
             with self._lock:
                 # 加载 Discoveries
-                self._discoveries = {
-                    d["id"]: Discovery.from_dict(d)
-                    for d in data.get("discoveries", [])
-                }
+                self._discoveries = discoveries
+                self._rebuild_discovery_indexes()
 
                 # 加载 Signals
                 if SIGNALS_AVAILABLE:
@@ -1530,7 +1762,7 @@ class StigmergyEnvironment:
                 self.prune()
             return True
 
-        except (json.JSONDecodeError, KeyError):
+        except (ValueError, KeyError):
             return False
 
     def clear(self) -> None:
@@ -1538,6 +1770,7 @@ class StigmergyEnvironment:
         with self._lock:
             self._discoveries.clear()
             self._pheromones.clear()
+            self._rebuild_discovery_indexes()
             self._signals.clear()
             self._signal_pheromones.clear()
             self._signal_pheromone_states.clear()
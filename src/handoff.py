@@ -3,12 +3,19 @@
 实现 Agent 之间的任务交接。
 """
 
+import itertools
 import uuid
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
+from types import MappingProxyType
 from typing import Any
 
+# 空上下文共用的只读默认值（HandoffContext 为 frozen，无需每个实例各自分配空 dict/list）
+_EMPTY_DATA: Mapping[str, Any] = MappingProxyType({})
+_EMPTY_ACTIONS: Sequence[str] = ()
+
 
 class HandoffStatus(str, Enum):
     """交接状态。"""
@@ -29,7 +36,20 @@ class HandoffPriority(str, Enum):
     CRITICAL = "critical"
 
 
-@dataclass(frozen=True)
+# 枚举值 -> 成员的查找表，from_dict 直接查表，不走 Enum 的值查找流程
+_STATUS_BY_VALUE: dict[str, HandoffStatus] = {status.value: status for status in HandoffStatus}
+_PRIORITY_BY_VALUE: dict[str, HandoffPriority] = {priority.value: priority for priority in HandoffPriority}
+
+# 待处理交接的返回顺序：优先级从高到低，同优先级按创建顺序
+_PRIORITY_ORDER = (
+    HandoffPriority.CRITICAL,
+    HandoffPriority.HIGH,
+    HandoffPriority.MEDIUM,
+    HandoffPriority.LOW,
+)
+
+
+@dataclass(frozen=True, slots=True)
 class HandoffContext:
     """交接上下文。
 
@@ -38,11 +58,12 @@ class HandoffContext:
 
     source_discovery_id: str | None = None
     reasoning: str = ""
-    relevant_data: dict[str, Any] = field(default_factory=dict)
-    suggested_actions: list[str] = field(default_factory=list)
+    # mappingproxy 不可哈希，dataclass 不允许直接作默认值；工厂返回共用对象而非新 dict
+    relevant_data: Mapping[str, Any] = field(default_factory=lambda: _EMPTY_DATA)
+    suggested_actions: Sequence[str] = _EMPTY_ACTIONS
 
 
-@dataclass
+@dataclass(slots=True)
 class Handoff:
     """任务交接。
 
@@ -62,15 +83,16 @@ class Handoff:
 
     def to_dict(self) -> dict[str, Any]:
         """转换为字典。"""
+        context = self.context
         return {
             "id": self.id,
             "from_agent": self.from_agent,
             "to_agent": self.to_agent,
             "context": {
-                "source_discovery_id": self.context.source_discovery_id,
-                "reasoning": self.context.reasoning,
-                "relevant_data": self.context.relevant_data,
-                "suggested_actions": self.context.suggested_actions,
+                "source_discovery_id": context.source_discovery_id,
+                "reasoning": context.reasoning,
+                "relevant_data": dict(context.relevant_data),
+                "suggested_actions": list(context.suggested_actions),
             },
             "priority": self.priority.value,
             "status": self.status.value,
@@ -87,8 +109,8 @@ class Handoff:
         context = HandoffContext(
             source_discovery_id=context_data.get("source_discovery_id"),
             reasoning=context_data.get("reasoning", ""),
-            relevant_data=context_data.get("relevant_data", {}),
-            suggested_actions=context_data.get("suggested_actions", []),
+            relevant_data=context_data.get("relevant_data") or _EMPTY_DATA,
+            suggested_actions=context_data.get("suggested_actions") or _EMPTY_ACTIONS,
         )
 
         return cls(
@@ -96,8 +118,9 @@ class Handoff:
             from_agent=data["from_agent"],
             to_agent=data["to_agent"],
             context=context,
-            priority=HandoffPriority(data["priority"]),
-            status=HandoffStatus(data["status"]),
+            # 未知值回退到枚举构造，保持原有的 ValueError
+            priority=_PRIORITY_BY_VALUE.get(data["priority"]) or HandoffPriority(data["priority"]),
+            status=_STATUS_BY_VALUE.get(data["status"]) or HandoffStatus(data["status"]),
             created_at=data["created_at"],
             updated_at=data["updated_at"],
             result=data.get("result"),
@@ -114,6 +137,35 @@ class HandoffManager:
     def __init__(self) -> None:
         """初始化管理器。"""
         self._handoffs: dict[str, Handoff] = {}
+        # 创建序号，同优先级的待处理交接按此排序
+        self._handoff_seq: dict[str, int] = {}
+        self._seq_counter = itertools.count()
+        # 待处理交接索引：优先级 -> 交接 ID（dict 作为有序集合），以及按目标 Agent 分组的同结构索引
+        self._pending_by_priority: dict[HandoffPriority, dict[str, None]] = {}
+        self._pending_by_target: dict[str, dict[HandoffPriority, dict[str, None]]] = {}
+        # 目标 Agent -> 全部交接 ID（含已结束的），按创建顺序
+        self._handoffs_by_target: dict[str, list[str]] = {}
+
+    def _add_pending(self, handoff: Handoff) -> None:
+        """将交接加入待处理索引。"""
+        seq = self._handoff_seq[handoff.id]
+        for buckets in (
+            self._pending_by_priority,
+            self._pending_by_target.setdefault(handoff.to_agent, {}),
+        ):
+            bucket = buckets.setdefault(handoff.priority, {})
+            needs_reorder = bool(bucket) and self._handoff_seq[next(reversed(bucket))] > seq
+            bucket[handoff.id] = None
+            if needs_reorder:
+                # 重新回到待处理状态的旧交接：恢复创建顺序
+                buckets[handoff.priority] = dict.fromkeys(sorted(bucket, key=self._handoff_seq.__getitem__))
+
+    def _discard_pending(self, handoff: Handoff) -> None:
+        """将交接移出待处理索引。"""
+        self._pending_by_priority.get(handoff.priority, {}).pop(handoff.id, None)
+        target_buckets = self._pending_by_target.get(handoff.to_agent)
+        if target_buckets is not None:
+            target_buckets.get(handoff.priority, {}).pop(handoff.id, None)
 
     def create_handoff(
         self,
@@ -147,6 +199,9 @@ class HandoffManager:
         )
 
         self._handoffs[handoff.id] = handoff
+        self._handoff_seq[handoff.id] = next(self._seq_counter)
+        self._handoffs_by_target.setdefault(to_agent, []).append(handoff.id)
+        self._add_pending(handoff)
         return handoff
 
     def get_handoff(self, handoff_id: str) -> Handoff | None:
@@ -174,25 +229,16 @@ class HandoffManager:
         Returns:
             待处理交接列表，按优先级排序
         """
-        pending = [
-            h for h in self._handoffs.values()
-            if h.status == HandoffStatus.PENDING
+        buckets = self._pending_by_target.get(to_agent, {}) if to_agent else self._pending_by_priority
+        handoffs = self._handoffs
+        # 索引已按优先级分桶、桶内按创建顺序，直接拼接即为排序结果
+        return [
+            handoff
+            for priority in _PRIORITY_ORDER
+            for handoff_id in buckets.get(priority, ())
+            if (handoff := handoffs[handoff_id]).status == HandoffStatus.PENDING
         ]
 
-        if to_agent:
-            pending = [h for h in pending if h.to_agent == to_agent]
-
-        # 按优先级排序
-        priority_order = {
-            HandoffPriority.CRITICAL: 0,
-            HandoffPriority.HIGH: 1,
-            HandoffPriority.MEDIUM: 2,
-            HandoffPriority.LOW: 3,
-        }
-
-        pending.sort(key=lambda h: priority_order[h.priority])
-        return pending
-
     def update_status(
         self,
         handoff_id: str,
@@ -215,6 +261,10 @@ class HandoffManager:
         if not handoff:
             return False
 
+        if handoff.status == HandoffStatus.PENDING and status != HandoffStatus.PENDING:
+            self._discard_pending(handoff)
+        elif handoff.status != HandoffStatus.PENDING and status == HandoffStatus.PENDING:
+            self._add_pending(handoff)
         handoff.status = status
         handoff.updated_at = datetime.now().isoformat()
 
@@ -226,16 +276,15 @@ class HandoffManager:
         return True
 
     def get_context_for_agent(self, agent_type: str) -> list[HandoffContext]:
-        """获取特定 Agent 的所有交接上下文。
+        """获取特定 Agent 待处理交接的上下文（经目标 Agent 索引，不扫描全部交接）。
 
         Args:
             agent_type: Agent 类型
 
         Returns:
-            交接上下文列表
+            交接上下文列表，按优先级排序
         """
-        handoffs = self.get_pending_handoffs(to_agent=agent_type)
-        return [h.context for h in handoffs]
+        return [h.context for h in self.get_pending_handoffs(to_agent=agent_type)]
 
     def get_handoffs_by_agents(
         self,
@@ -251,12 +300,13 @@ class HandoffManager:
         Returns:
             交接列表
         """
-        handoffs = list(self._handoffs.values())
+        if to_agent:
+            handoffs = [self._handoffs[handoff_id] for handoff_id in self._handoffs_by_target.get(to_agent, ())]
+        else:
+            handoffs = list(self._handoffs.values())
 
         if from_agent:
             handoffs = [h for h in handoffs if h.from_agent == from_agent]
-        if to_agent:
-            handoffs = [h for h in handoffs if h.to_agent == to_agent]
 
         return handoffs
 
@@ -274,14 +324,15 @@ class HandoffManager:
     def clear(self) -> None:
         """清空所有交接。"""
         self._handoffs.clear()
+        self._handoff_seq.clear()
+        self._pending_by_priority.clear()
+        self._pending_by_target.clear()
+        self._handoffs_by_target.clear()
 
     @property
     def pending_count(self) -> int:
         """待处理交接数量。"""
-        return len([
-            h for h in self._handoffs.values()
-            if h.status == HandoffStatus.PENDING
-        ])
+        return len(self.get_pending_handoffs())
 
     @property
     def all_handoffs(self) -> list[Handoff]:
@@ -2111,6 +2111,31 @@ class HTMLReportGenerator:
                 return;
             }
 
+            // 标签映射在循环外只构建一次，冻结后各卡片共享
+            const priorityLabels = Object.freeze({
+                high: '🔴 高优先级',
+                medium: '🟡 中优先级',
+                low: '🟢 低优先级'
+            });
+
+            const difficultyLabels = Object.freeze({
+                high: '困难',
+                medium: '中等',
+                low: '简单'
+            });
+
+            const roiLabels = Object.freeze({
+                high: '高',
+                medium: '中',
+                low: '低'
+            });
+
+            const timelineLabels = Object.freeze({
+                short: '短期(1-3月)',
+                medium: '中期(3-6月)',
+                long: '长期(6-12月)'
+            });
+
             data.recommendations.forEach((rec, index) => {
                 const card = document.createElement('div');
                 const priority = rec.priority || 'medium';
@@ -2125,30 +2150,6 @@ class HTMLReportGenerator:
                 const title = cleanMarkdownArtifacts(rec.title || `建议 ${index + 1}`);
                 const description = cleanMarkdownArtifacts(rec.description || rec.content || '');
 
-                const priorityLabels = {
-                    high: '🔴 高优先级',
-                    medium: '🟡 中优先级',
-                    low: '🟢 低优先级'
-                };
-
-                const difficultyLabels = {
-                    high: '困难',
-                    medium: '中等',
-                    low: '简单'
-                };
-
-                const roiLabels = {
-                    high: '高',
-                    medium: '中',
-                    low: '低'
-                };
-
-                const timelineLabels = {
-                    short: '短期(1-3月)',
-                    medium: '中期(3-6月)',
-                    long: '长期(6-12月)'
-                };
-
                 let cardHtml = `
                     <div class="flex items-start justify-between mb-3">
                         <h4 class="font-semibold text-lg">${title}</h4>
@@ -6,8 +6,10 @@
 import asyncio
 import logging
 import time
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
 from typing import Any, Callable
 
 from src.utils.config import get_config
@@ -16,6 +18,9 @@ from src.handoff import HandoffContext, HandoffPriority, HandoffStatus, get_hand
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# 无上下文任务共用的只读空上下文
+EMPTY_CONTEXT: Mapping[str, Any] = MappingProxyType({})
+
 
 class TaskStatus(str, Enum):
     """任务状态。"""
@@ -27,29 +32,35 @@ class TaskStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentTask:
     """Agent 任务。"""
 
     id: str
     agent: Any  # BaseAgent 实例
-    context: dict[str, Any]
+    context: Mapping[str, Any]  # 执行时只读，多个任务可共用同一只读映射
     handoff_context: HandoffContext | None = None
     status: TaskStatus = TaskStatus.PENDING
     result: Any = None
     error: str | None = None
     started_at: str | None = None
     completed_at: str | None = None
+    # 构造时缓存的 Agent 类型值，分组与错误汇总时不再逐个访问 agent.agent_type.value
+    _agent_type: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        agent_type = getattr(self.agent, "agent_type", None)
+        self._agent_type = agent_type.value if agent_type is not None else "unknown"
 
     def to_dict(self) -> dict[str, Any]:
         """转换为字典。"""
         return {
             "id": self.id,
-            "agent_type": self.agent.agent_type.value if hasattr(self.agent, "agent_type") else "unknown",
-            "context": self.context,
+            "agent_type": self._agent_type,
+            "context": dict(self.context),
             "handoff_context": {
                 "reasoning": self.handoff_context.reasoning,
-                "suggested_actions": self.handoff_context.suggested_actions,
+                "suggested_actions": list(self.handoff_context.suggested_actions),
             } if self.handoff_context else None,
             "status": self.status.value,
             "result": str(self.result)[:200] if self.result else None,
@@ -132,16 +143,8 @@ class SimpleScheduler:
         import time
         start_time = time.time()
 
-        # 创建信号量
-        semaphore = asyncio.Semaphore(self._max_concurrent)
-
-        async def run_with_limit(task: AgentTask) -> None:
-            """在信号量限制下运行任务。"""
-            async with semaphore:
-                await self._run_single_task(task)
-
         # 并发执行所有任务
-        await asyncio.gather(*[run_with_limit(t) for t in tasks], return_exceptions=True)
+        await self._run_batch(tasks)
 
         # 处理高优先级 handoff
         handoff_tasks = await self._process_handoffs(tasks)
@@ -159,6 +162,33 @@ class SimpleScheduler:
             total_duration=duration,
         )
 
+    async def _run_batch(self, tasks: list[AgentTask]) -> None:
+        """在 TaskGroup 中并发执行一批任务，由信号量限制并发数。
+
+        Args:
+            tasks: 任务列表
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrent)
+
+        async with asyncio.TaskGroup() as tg:
+            for task in tasks:
+                tg.create_task(self._guarded(task, semaphore))
+
+    async def _guarded(self, task: AgentTask, semaphore: asyncio.Semaphore) -> None:
+        """在信号量限制下运行任务，意外异常只标记该任务失败，不取消同组其他任务。
+
+        Args:
+            task: 任务对象
+            semaphore: 并发限制信号量
+        """
+        async with semaphore:
+            try:
+                await self._run_single_task(task)
+            except Exception as e:
+                logger.exception(f"[Task {task.id}] Unexpected scheduler error: {e}")
+                task.error = str(e)
+                task.status = TaskStatus.FAILED
+
     async def _run_single_task(self, task: AgentTask) -> None:
         """运行单个任务（带重试机制）。
 
@@ -187,11 +217,9 @@ class SimpleScheduler:
             logger.info(f"[Task {task.id}] Starting {task.agent.agent_type.value} agent{retry_info}...")
 
             try:
-                # 创建超时
-                timeout_task = asyncio.create_task(
-                    self._execute_agent(task)
-                )
-                result = await asyncio.wait_for(timeout_task, timeout=self._timeout)
+                # 在当前协程内设置超时，无需额外创建任务
+                async with asyncio.timeout(self._timeout):
+                    result = await self._execute_agent(task)
 
                 task.result = result
                 task.status = TaskStatus.COMPLETED
@@ -301,15 +329,16 @@ class SimpleScheduler:
         """
         agent = task.agent
 
-        # 合并上下文
-        execute_context = {**task.context}
-
-        # 添加 handoff 上下文
+        # 上下文直接按关键字参数展开（展开时即生成新字典），仅在附加 handoff 上下文时合并
+        execute_context = task.context
         if task.handoff_context:
-            execute_context["_handoff"] = {
-                "reasoning": task.handoff_context.reasoning,
-                "suggested_actions": task.handoff_context.suggested_actions,
-                "relevant_data": task.handoff_context.relevant_data,
+            execute_context = {
+                **task.context,
+                "_handoff": {
+                    "reasoning": task.handoff_context.reasoning,
+                    "suggested_actions": list(task.handoff_context.suggested_actions),
+                    "relevant_data": dict(task.handoff_context.relevant_data),
+                },
             }
 
         # 执行 Agent（可能是同步或异步）
@@ -355,22 +384,15 @@ class SimpleScheduler:
                 new_task = AgentTask(
                     id=f"handoff-{handoff.id}",
                     agent=target_agent,
-                    context={},
+                    context=EMPTY_CONTEXT,
                     handoff_context=handoff.context,
                 )
                 new_tasks.append(new_task)
 
         # 执行新任务（使用并发执行而非递归调用 run_tasks）
         if new_tasks:
-            semaphore = asyncio.Semaphore(self._max_concurrent)
-
-            async def run_with_limit(task: AgentTask) -> None:
-                """在信号量限制下运行任务。"""
-                async with semaphore:
-                    await self._run_single_task(task)
-
             # 并发执行 handoff 任务（不递归处理 handoff）
-            await asyncio.gather(*[run_with_limit(t) for t in new_tasks], return_exceptions=True)
+            await self._run_batch(new_tasks)
 
             # 标记 handoff 为已完成
             for new_task in new_tasks:
@@ -391,13 +413,8 @@ class SimpleScheduler:
         results: dict[str, list[Any]] = {}
 
         for task in tasks:
-            if task.status == TaskStatus.COMPLETED and task.result is not None:
-                agent_type = task.agent.agent_type.value if hasattr(task.agent, "agent_type") else "unknown"
-
-                if agent_type not in results:
-                    results[agent_type] = []
-
-                results[agent_type].append(task.result)
+            if task.status is TaskStatus.COMPLETED and task.result is not None:
+                results.setdefault(task._agent_type, []).append(task.result)
 
         return results
 
@@ -410,17 +427,11 @@ class SimpleScheduler:
         Returns:
             错误信息列表
         """
-        errors = []
-
-        for task in tasks:
-            if task.status == TaskStatus.FAILED:
-                errors.append({
-                    "task_id": task.id,
-                    "agent_type": task.agent.agent_type.value if hasattr(task.agent, "agent_type") else "unknown",
-                    "error": task.error,
-                })
-
-        return errors
+        return [
+            {"task_id": task.id, "agent_type": task._agent_type, "error": task.error}
+            for task in tasks
+            if task.status is TaskStatus.FAILED
+        ]
 
 
 # 全局调度器实例（延迟加载）
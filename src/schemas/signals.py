@@ -4,9 +4,13 @@
 Signal 是 Agent 之间通信的基本单元，替代原有的 Discovery 结构。
 """
 
-from dataclasses import dataclass, field
+import sys
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from enum import Enum
+from types import MappingProxyType
 from typing import Any
 from uuid import uuid4
 
@@ -61,7 +65,41 @@ class Actionability(str, Enum):
     INFORMATIONAL = "informational"  # 信息性，无需行动
 
 
-@dataclass(frozen=True)
+# 取值 → 枚举成员的只读查找表，from_dict 批量反序列化时绕过 Enum.__call__
+_SIGNAL_TYPE_BY_VALUE = MappingProxyType({e.value: e for e in SignalType})
+_DIMENSION_BY_VALUE = MappingProxyType({e.value: e for e in Dimension})
+_SENTIMENT_BY_VALUE = MappingProxyType({e.value: e for e in Sentiment})
+_ACTIONABILITY_BY_VALUE = MappingProxyType({e.value: e for e in Actionability})
+
+
+# 枚举成员 → 定义顺序的小整数编码，分组/排序时以整数比较替代字符串比较
+_SIGNAL_TYPE_CODE = MappingProxyType({e: i for i, e in enumerate(SignalType)})
+_DIMENSION_CODE = MappingProxyType({e: i for i, e in enumerate(Dimension)})
+_ACTIONABILITY_CODE = MappingProxyType({e: i for i, e in enumerate(Actionability)})
+
+
+def _lookup_enum(table: Mapping[str, Any], enum_cls: type[Enum], raw: Any) -> Any:
+    """查表获取枚举成员，未命中时回退到枚举构造（保留非法值报错）。"""
+    member = table.get(raw)
+    if member is None:
+        member = enum_cls(raw)
+    return member
+
+
+def _intern(value: Any) -> Any:
+    """驻留字符串，非 str 值原样返回。"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _parse_epoch(timestamp: str) -> float | None:
+    """将 ISO 8601 时间戳解析为 epoch 秒，无法解析时返回 None。"""
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
 class Signal:
     """信号数据类。
 
@@ -103,6 +141,16 @@ class Signal:
     debate_points: list[str] = field(default_factory=list)
     actionability: Actionability = Actionability.INFORMATIONAL
     metadata: dict[str, Any] = field(default_factory=dict)
+    # 构造时派生的缓存字段，不参与初始化与比较
+    _ts_epoch: float | None = field(default=None, init=False, repr=False, compare=False)
+    _tag_set: frozenset[str] = field(default=frozenset(), init=False, repr=False, compare=False)
+    _signal_type_value: str = field(default="", init=False, repr=False, compare=False)
+    _dimension_value: str = field(default="", init=False, repr=False, compare=False)
+    _sentiment_value: str = field(default="", init=False, repr=False, compare=False)
+    _actionability_value: str = field(default="", init=False, repr=False, compare=False)
+    _sort_key: tuple[int, int, int] = field(
+        default=(0, 0, 0), init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         """初始化后验证。
@@ -123,6 +171,35 @@ class Signal:
         if not self.id:
             object.__setattr__(self, "id", str(uuid4()))
 
+        # 构造时解析一次时间戳，过滤热路径只做浮点比较
+        object.__setattr__(self, "_ts_epoch", _parse_epoch(self.timestamp))
+
+        # 来源、作者与标签在大量信号间高度重复，驻留后共享同一对象
+        object.__setattr__(self, "source", _intern(self.source))
+        object.__setattr__(self, "author_agent", _intern(self.author_agent))
+        interned_tags = [_intern(tag) for tag in self.tags]
+        if any(new is not old for new, old in zip(interned_tags, self.tags)):
+            object.__setattr__(self, "tags", interned_tags)
+
+        # 标签集合供过滤器做 C 层集合求交
+        object.__setattr__(self, "_tag_set", frozenset(self.tags))
+
+        # 缓存枚举取值，to_dict 不再逐次访问 .value
+        object.__setattr__(self, "_signal_type_value", self.signal_type.value)
+        object.__setattr__(self, "_dimension_value", self.dimension.value)
+        object.__setattr__(self, "_sentiment_value", self.sentiment.value)
+        object.__setattr__(self, "_actionability_value", self.actionability.value)
+
+        object.__setattr__(
+            self,
+            "_sort_key",
+            (
+                _SIGNAL_TYPE_CODE[self.signal_type],
+                _DIMENSION_CODE[self.dimension],
+                _ACTIONABILITY_CODE[self.actionability],
+            ),
+        )
+
     def to_dict(self) -> dict[str, Any]:
         """转换为字典。
 
@@ -131,13 +208,13 @@ class Signal:
         """
         return {
             "id": self.id,
-            "signal_type": self.signal_type.value,
-            "dimension": self.dimension.value,
+            "signal_type": self._signal_type_value,
+            "dimension": self._dimension_value,
             "evidence": self.evidence,
             "content": self.evidence,  # 添加 content 字段以兼容 Reporter
             "confidence": self.confidence,
             "strength": self.strength,
-            "sentiment": self.sentiment.value,
+            "sentiment": self._sentiment_value,
             "tags": self.tags,
             "source": self.source,
             "timestamp": self.timestamp,
@@ -145,10 +222,23 @@ class Signal:
             "author_agent": self.author_agent,
             "verified": self.verified,
             "debate_points": self.debate_points,
-            "actionability": self.actionability.value,
+            "actionability": self._actionability_value,
             "metadata": self.metadata,
         }
 
+    def to_json(self) -> bytes:
+        """序列化为 UTF-8 JSON 字节串。
+
+        安装 orjson 时走 C 实现的编码；字段与 to_dict 一致。
+
+        Returns:
+            JSON 字节串
+        """
+        # 延迟导入：src.utils.imports 反向依赖本模块
+        from src.utils.imports import json_dumps_bytes
+
+        return json_dumps_bytes(self.to_dict())
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Signal":
         """从字典创建 Signal。
@@ -161,12 +251,18 @@ class Signal:
         """
         return cls(
             id=data.get("id", ""),
-            signal_type=SignalType(data.get("signal_type", SignalType.INSIGHT)),
-            dimension=Dimension(data.get("dimension", Dimension.PRODUCT)),
+            signal_type=_lookup_enum(
+                _SIGNAL_TYPE_BY_VALUE, SignalType, data.get("signal_type", SignalType.INSIGHT)
+            ),
+            dimension=_lookup_enum(
+                _DIMENSION_BY_VALUE, Dimension, data.get("dimension", Dimension.PRODUCT)
+            ),
             evidence=data.get("evidence", ""),
             confidence=data.get("confidence", 0.5),
             strength=data.get("strength", 0.5),
-            sentiment=Sentiment(data.get("sentiment", Sentiment.NEUTRAL)),
+            sentiment=_lookup_enum(
+                _SENTIMENT_BY_VALUE, Sentiment, data.get("sentiment", Sentiment.NEUTRAL)
+            ),
             tags=data.get("tags", []),
             source=data.get("source", ""),
             timestamp=data.get("timestamp", ""),
@@ -174,10 +270,22 @@ class Signal:
             author_agent=data.get("author_agent", ""),
             verified=data.get("verified", False),
             debate_points=data.get("debate_points", []),
-            actionability=Actionability(data.get("actionability", Actionability.INFORMATIONAL)),
+            actionability=_lookup_enum(
+                _ACTIONABILITY_BY_VALUE,
+                Actionability,
+                data.get("actionability", Actionability.INFORMATIONAL),
+            ),
             metadata=data.get("metadata", {}),
         )
 
+    def sort_key(self) -> tuple[int, int, int]:
+        """获取 (类型, 维度, 可行动性) 的整数编码，用于分组与排序。
+
+        Returns:
+            按枚举定义顺序编码的整数元组
+        """
+        return self._sort_key
+
     def is_fresh(self, max_age_hours: int = 24) -> bool:
         """检查信号是否新鲜。
 
@@ -187,12 +295,23 @@ class Signal:
         Returns:
             是否新鲜
         """
-        try:
-            signal_time = datetime.fromisoformat(self.timestamp)
-            age_hours = (datetime.now() - signal_time).total_seconds() / 3600
-            return age_hours <= max_age_hours
-        except (ValueError, TypeError):
+        return self.is_fresh_at(time.time(), max_age_hours)
+
+    def is_fresh_at(self, now_epoch: float, max_age_hours: int = 24) -> bool:
+        """以给定的当前时间检查信号是否新鲜。
+
+        批量检查时由调用方取一次当前时间，避免逐条取时钟。
+
+        Args:
+            now_epoch: 当前 epoch 秒
+            max_age_hours: 最大允许年龄（小时）
+
+        Returns:
+            是否新鲜
+        """
+        if self._ts_epoch is None:
             return False
+        return (now_epoch - self._ts_epoch) / 3600.0 <= max_age_hours
 
     def age_hours(self) -> float:
         """获取信号年龄（小时）。
@@ -200,11 +319,9 @@ class Signal:
         Returns:
             年龄（小时）
         """
-        try:
-            signal_time = datetime.fromisoformat(self.timestamp)
-            return (datetime.now() - signal_time).total_seconds() / 3600
-        except (ValueError, TypeError):
+        if self._ts_epoch is None:
             return float("inf")
+        return (time.time() - self._ts_epoch) / 3600.0
 
     def with_updated_strength(
         self,
@@ -222,28 +339,18 @@ class Signal:
         Returns:
             新的 Signal 对象
         """
-        debate_points = list(self.debate_points)
-        if debate_point:
-            debate_points.append(debate_point)
-
-        # 创建新对象（因为 dataclass 是 frozen 的）
-        return Signal(
-            id=self.id,
-            signal_type=self.signal_type,
-            dimension=self.dimension,
-            evidence=self.evidence,
-            confidence=self.confidence,
+        # 未变化的列表与元数据直接复用（Signal 视为不可变），只为变化的字段分配新对象
+        debate_points = (
+            [*self.debate_points, debate_point] if debate_point else self.debate_points
+        )
+        metadata = {**self.metadata, "verified_by": verifier} if verifier else self.metadata
+
+        return replace(
+            self,
             strength=max(0.0, min(1.0, new_strength)),
-            sentiment=self.sentiment,
-            tags=list(self.tags),
-            source=self.source,
-            timestamp=self.timestamp,
-            references=list(self.references),
-            author_agent=self.author_agent,
             verified=verifier != "" or self.verified,
             debate_points=debate_points,
-            actionability=self.actionability,
-            metadata={**self.metadata, "verified_by": verifier},
+            metadata=metadata,
         )
 
     def __repr__(self) -> str:
@@ -278,59 +385,135 @@ class SignalFilter:
     author_agents: set[str] | None = None
     tags: set[str] | None = None
     actionabilities: set[Actionability] | None = None
+    _checks: list[Callable[[Signal, float], bool]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
 
-    def matches(self, signal: Signal) -> bool:
-        """检查信号是否匹配过滤器。
+    def __post_init__(self) -> None:
+        """构建谓词链。
 
-        Args:
-            signal: 信号对象
+        只为实际设置的条件生成检查函数，稀疏过滤器在热循环中
+        不再逐条判断未使用的字段。过滤条件在构造后视为只读。
 
-        Returns:
-            是否匹配
+        检查按"代价低、淘汰率高者优先"排列，不匹配的信号尽早退出：
+        数值阈值 → 验证状态 → 枚举集合（覆盖面窄者优先）→ 作者
+        → 年龄 → 标签求交。
         """
-        # 检查信号类型
-        if self.signal_types and signal.signal_type not in self.signal_types:
-            return False
-
-        # 检查维度
-        if self.dimensions and signal.dimension not in self.dimensions:
-            return False
-
-        # 检查情感
-        if self.sentiments and signal.sentiment not in self.sentiments:
-            return False
+        checks: list[Callable[[Signal, float], bool]] = []
 
         # 检查置信度
-        if signal.confidence < self.min_confidence:
-            return False
+        if self.min_confidence > 0:
+            min_confidence = self.min_confidence
+            checks.append(lambda s, now: s.confidence >= min_confidence)
 
         # 检查强度
-        if signal.strength < self.min_strength:
-            return False
+        if self.min_strength > 0:
+            min_strength = self.min_strength
+            checks.append(lambda s, now: s.strength >= min_strength)
 
         # 检查验证状态
-        if self.verified_only and not signal.verified:
-            return False
+        if self.verified_only:
+            checks.append(lambda s, now: s.verified)
 
-        # 检查年龄
-        if self.max_age_hours and not signal.is_fresh(self.max_age_hours):
-            return False
+        # 检查类型 / 维度 / 情感 / 可行动性：按集合覆盖的枚举比例升序
+        enum_checks: list[tuple[float, Callable[[Signal, float], bool]]] = []
+        if self.signal_types:
+            signal_types = frozenset(self.signal_types)
+            enum_checks.append((
+                len(signal_types) / len(SignalType),
+                lambda s, now: s.signal_type in signal_types,
+            ))
+        if self.dimensions:
+            dimensions = frozenset(self.dimensions)
+            enum_checks.append((
+                len(dimensions) / len(Dimension),
+                lambda s, now: s.dimension in dimensions,
+            ))
+        if self.sentiments:
+            sentiments = frozenset(self.sentiments)
+            enum_checks.append((
+                len(sentiments) / len(Sentiment),
+                lambda s, now: s.sentiment in sentiments,
+            ))
+        if self.actionabilities:
+            actionabilities = frozenset(self.actionabilities)
+            enum_checks.append((
+                len(actionabilities) / len(Actionability),
+                lambda s, now: s.actionability in actionabilities,
+            ))
+        enum_checks.sort(key=lambda item: item[0])
+        checks.extend(check for _, check in enum_checks)
 
         # 检查作者
-        if self.author_agents and signal.author_agent not in self.author_agents:
-            return False
+        if self.author_agents:
+            author_agents = frozenset(self.author_agents)
+            checks.append(lambda s, now: s.author_agent in author_agents)
+
+        # 检查年龄
+        if self.max_age_hours:
+            max_age_seconds = self.max_age_hours * 3600.0
+            checks.append(
+                lambda s, now: s._ts_epoch is not None
+                and now - s._ts_epoch <= max_age_seconds
+            )
 
         # 检查标签
         if self.tags:
-            if not any(tag in signal.tags for tag in self.tags):
-                return False
+            tags = frozenset(self.tags)
+            checks.append(lambda s, now: not tags.isdisjoint(s._tag_set))
 
-        # 检查可行动性
-        if self.actionabilities and signal.actionability not in self.actionabilities:
-            return False
+        self._checks = checks
+
+    def matches(self, signal: Signal, now_epoch: float | None = None) -> bool:
+        """检查信号是否匹配过滤器。
+
+        Args:
+            signal: 信号对象
+            now_epoch: 当前 epoch 秒，默认取 time.time()；批量调用时可由调用方传入
 
+        Returns:
+            是否匹配
+        """
+        return self._matches_at(signal, time.time() if now_epoch is None else now_epoch)
+
+    def _matches_at(self, signal: Signal, now: float) -> bool:
+        """以给定的当前 epoch 秒检查信号是否匹配。"""
+        for check in self._checks:
+            if not check(signal, now):
+                return False
         return True
 
+    def matches_many(self, signals: Iterable[Signal]) -> list[Signal]:
+        """批量过滤信号。
+
+        整个批次只取一次当前时间，年龄检查直接比较缓存的 epoch 秒。
+        谓词链在循环内直接展开，不再逐条经过方法调用；
+        空过滤器与单条件过滤器走专门路径。
+
+        Args:
+            signals: 信号序列
+
+        Returns:
+            匹配的信号列表
+        """
+        checks = self._checks
+        if not checks:
+            return list(signals)
+
+        now = time.time()
+        if len(checks) == 1:
+            check = checks[0]
+            return [s for s in signals if check(s, now)]
+
+        matched = []
+        for signal in signals:
+            for check in checks:
+                if not check(signal, now):
+                    break
+            else:
+                matched.append(signal)
+        return matched
+
     def __repr__(self) -> str:
         """字符串表示。
 
@@ -3,14 +3,40 @@
 合并和去重多个搜索源的结果。
 """
 
+import heapq
+import re
 from collections import defaultdict
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from operator import attrgetter
 from typing import Callable
+from urllib.parse import urlparse, urlunparse
 
 from src.search.base import SearchProviderType, SearchResult
 
+# 规整的 http(s) URL 拆分为 netloc / path / query（片段被丢弃）；
+# 含 ;params、IPv6 方括号或控制字符的 URL 不匹配，交给 urlparse 处理
+_HTTP_URL_RE = re.compile(
+    r"https?://([^/?#;\[\]\x00-\x20]+)((?:/[^?#;\x00-\x20]*)?)"
+    r"(?:\?([^#\x00-\x20]*))?(?:#[^\x00-\x20]*)?"
+)
+# 常见的跟踪参数
+_TRACKING_PARAM_RE = re.compile(r"utm_|fbclid=|gclid=")
 
-@dataclass(frozen=True)
+
+def _strip_tracking_params(query: str) -> str:
+    """移除查询串中的跟踪参数。"""
+    return "&".join(
+        param for param in query.split("&")
+        if param and not _TRACKING_PARAM_RE.search(param)
+    )
+
+
+# C 层属性读取器作为评分排序键
+_score_key = attrgetter("score")
+
+
+@dataclass(frozen=True, slots=True)
 class AggregatedResult:
     """聚合结果数据类。"""
 
@@ -26,6 +52,11 @@ class SortStrategy:
     SCORE = "score"  # 按相关性评分
     LATEST = "latest"  # 按发布日期
     DIVERSE = "diverse"  # 多样性排序（混合来源）
+    RRF = "rrf"  # 倒数排名融合（各搜索源评分尺度不同，按名次融合）
+
+
+# 倒数排名融合的平滑常数
+DEFAULT_RRF_K = 60
 
 
 class ResultAggregator:
@@ -38,15 +69,18 @@ class ResultAggregator:
         self,
         deduplication_enabled: bool = True,
         sort_strategy: str = SortStrategy.SCORE,
+        rrf_k: int = DEFAULT_RRF_K,
     ) -> None:
         """初始化聚合器。
 
         Args:
             deduplication_enabled: 是否启用去重
             sort_strategy: 排序策略
+            rrf_k: 倒数排名融合的平滑常数，仅 RRF 策略使用
         """
         self._deduplication_enabled = deduplication_enabled
         self._sort_strategy = sort_strategy
+        self._rrf_k = rrf_k
         self._url_normalizer: Callable[[str], str] = self._normalize_url
 
     def aggregate(
@@ -63,96 +97,106 @@ class ResultAggregator:
         Returns:
             聚合后的结果
         """
-        # 收集所有结果
+        # 单次遍历完成来源标记、计数与去重
+        seen_urls: dict[str, SearchResult] = {}
         all_results: list[SearchResult] = []
-        provider_counts: dict[SearchProviderType, int] = defaultdict(int)
+        provider_counts: dict[SearchProviderType, int] = {}
+        total_count = 0
+        dedup = self._deduplication_enabled
+        normalize = self._url_normalizer
+
+        # RRF：各搜索源评分不可比，以 1/(k + 名次) 代替原始评分，同一 URL 的得分累加
+        fuse = self._sort_strategy == SortStrategy.RRF
+        rrf_k = self._rrf_k
+        fused_scores: dict[str, float] = {}
 
         for provider_type, results in provider_results.items():
-            # 为每个结果添加来源标记
-            tagged_results = [
-                SearchResult(
-                    url=r.url,
-                    title=r.title,
-                    summary=r.summary,
-                    site_name=r.site_name,
-                    published_date=r.published_date,
-                    icon_url=r.icon_url,
-                    score=r.score,
-                    provider=provider_type,
-                )
-                for r in results
-            ]
-            all_results.extend(tagged_results)
             provider_counts[provider_type] = len(results)
-
-        total_count = len(all_results)
-
-        # 去重
-        if self._deduplication_enabled:
-            all_results = self._deduplicate(all_results)
+            total_count += len(results)
+            ranked_urls: set[str] = set()
+
+            for rank, r in enumerate(results, start=1):
+                # 搜索源在自身边界已标记来源，这里只为未标记的结果补充
+                if r.provider is None:
+                    r = replace(r, provider=provider_type)
+
+                if not dedup:
+                    if fuse:
+                        r = replace(r, score=1.0 / (rrf_k + rank))
+                    all_results.append(r)
+                    continue
+
+                # 基于 URL 去重，保留评分最高的结果
+                normalized_url = normalize(r.url)
+                if fuse and normalized_url not in ranked_urls:
+                    # 同一搜索源内重复的 URL 只按最好名次计一次
+                    ranked_urls.add(normalized_url)
+                    fused_scores[normalized_url] = (
+                        fused_scores.get(normalized_url, 0.0) + 1.0 / (rrf_k + rank)
+                    )
+                existing = seen_urls.get(normalized_url)
+                if existing is None or r.score > existing.score:
+                    seen_urls[normalized_url] = r
+
+        if dedup:
+            if fuse:
+                all_results = [
+                    replace(r, score=fused_scores[normalized_url])
+                    for normalized_url, r in seen_urls.items()
+                ]
+            else:
+                all_results = list(seen_urls.values())
 
         deduped_count = len(all_results)
 
-        # 排序
-        all_results = self._sort_results(all_results)
-
-        # 限制结果数量
-        all_results = all_results[:max_results]
+        # 排序并限制结果数量
+        all_results = self._sort_results(all_results, max_results)
 
         return AggregatedResult(
             results=all_results,
             total_count=total_count,
-            provider_counts=dict(provider_counts),
+            provider_counts=provider_counts,
             deduped_count=deduped_count,
         )
 
-    def _deduplicate(self, results: list[SearchResult]) -> list[SearchResult]:
-        """去重搜索结果。
-
-        基于 URL 去重，保留评分最高的结果。
-
-        Args:
-            results: 搜索结果列表
-
-        Returns:
-            去重后的结果列表
-        """
-        seen_urls: dict[str, SearchResult] = {}
-
-        for result in results:
-            normalized_url = self._url_normalizer(result.url)
-            if normalized_url not in seen_urls:
-                seen_urls[normalized_url] = result
-            else:
-                # 保留评分更高的结果
-                if result.score > seen_urls[normalized_url].score:
-                    seen_urls[normalized_url] = result
-
-        return list(seen_urls.values())
-
-    def _sort_results(self, results: list[SearchResult]) -> list[SearchResult]:
+    def _sort_results(
+        self,
+        results: list[SearchResult],
+        limit: int | None = None,
+    ) -> list[SearchResult]:
         """排序搜索结果。
 
         Args:
             results: 搜索结果列表
+            limit: 只返回前 limit 条，None 表示全部
 
         Returns:
             排序后的结果列表
         """
-        if self._sort_strategy == SortStrategy.SCORE:
-            return self._sort_by_score(results)
-        elif self._sort_strategy == SortStrategy.LATEST:
-            return self._sort_by_date(results)
+        if self._sort_strategy == SortStrategy.LATEST:
+            return self._sort_by_date(results, limit)
         elif self._sort_strategy == SortStrategy.DIVERSE:
-            return self._sort_by_diversity(results)
+            # 交替选取依赖完整排序，无法只取前 K 条
+            return self._sort_by_diversity(results)[:limit]
         else:
-            return self._sort_by_score(results)
+            return self._sort_by_score(results, limit)
 
-    def _sort_by_score(self, results: list[SearchResult]) -> list[SearchResult]:
+    def _sort_by_score(
+        self,
+        results: list[SearchResult],
+        limit: int | None = None,
+    ) -> list[SearchResult]:
         """按相关性评分排序。"""
-        return sorted(results, key=lambda r: r.score, reverse=True)
+        if limit is not None and limit < len(results):
+            # 只需前 K 条时用堆选取，O(N log K)
+            return heapq.nlargest(limit, results, key=_score_key)
+        return sorted(results, key=_score_key, reverse=True)
 
-    def _sort_by_date(self, results: list[SearchResult]) -> list[SearchResult]:
+    def _sort_by_date(
+        self,
+        results: list[SearchResult],
+        limit: int | None = None,
+    ) -> list[SearchResult]:
         """按发布日期排序。"""
         def sort_key(r: SearchResult) -> tuple:
             # 有日期的优先，然后按日期降序
@@ -160,6 +204,8 @@ class ResultAggregator:
                 return (1, r.published_date)
             return (0, "")
 
+        if limit is not None and limit < len(results):
+            return heapq.nlargest(limit, results, key=sort_key)
         return sorted(results, key=sort_key, reverse=True)
 
     def _sort_by_diversity(self, results: list[SearchResult]) -> list[SearchResult]:
@@ -190,6 +236,7 @@ class ResultAggregator:
         return diversified
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def _normalize_url(url: str) -> str:
         """标准化 URL 用于去重比较。
 
@@ -199,26 +246,24 @@ class ResultAggregator:
         Returns:
             标准化后的 URL
         """
-        try:
-            from urllib.parse import urlparse, urlunparse
+        lowered = url.lower()
 
-            parsed = urlparse(url.lower())
+        # 常见的 http(s) URL 走正则快速路径，跳过 urlparse/urlunparse
+        match = _HTTP_URL_RE.fullmatch(lowered)
+        if match is not None:
+            netloc, path, query = match.groups()
+            query = _strip_tracking_params(query or "")
+            return f"https://{netloc}{path}?{query}" if query else f"https://{netloc}{path}"
 
-            # 移除常见的跟踪参数
-            query_params = []
-            for param in parsed.query.split("&"):
-                if param and not any(
-                    tracking_prefix in param
-                    for tracking_prefix in ["utm_", "fbclid=", "gclid="]
-                ):
-                    query_params.append(param)
+        try:
+            parsed = urlparse(lowered)
 
             normalized = parsed._replace(
                 scheme="https",  # 统一使用 https
-                query="&".join(query_params),
+                query=_strip_tracking_params(parsed.query),
                 fragment="",  # 移除片段
             )
 
             return urlunparse(normalized)
         except Exception:
-            return url.lower()
+            return lowered
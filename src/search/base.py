@@ -24,6 +24,12 @@ class SearchProviderType(str, Enum):
     MULTI = "multi"
 
 
+# 搜索源 → 字符串取值，to_dict 热路径中替代 .value 访问
+_PROVIDER_VALUES: dict[SearchProviderType | None, str | None] = {
+    provider: provider.value for provider in SearchProviderType
+}
+
+
 class SearchTimeRange(str, Enum):
     """搜索时间范围。
 
@@ -37,7 +43,7 @@ class SearchTimeRange(str, Enum):
     NO_LIMIT = "noLimit"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SearchResult:
     """搜索结果数据类。
 
@@ -63,11 +69,26 @@ class SearchResult:
             "published_date": self.published_date,
             "icon_url": self.icon_url,
             "score": self.score,
-            "provider": self.provider.value if self.provider else None,
+            "provider": _PROVIDER_VALUES.get(self.provider),
         }
 
-
-@dataclass(frozen=True)
+    @classmethod
+    def from_dict(cls, data: dict) -> "SearchResult":
+        """从字典创建。"""
+        provider = data.get("provider")
+        return cls(
+            url=data["url"],
+            title=data.get("title", ""),
+            summary=data.get("summary", ""),
+            site_name=data.get("site_name"),
+            published_date=data.get("published_date"),
+            icon_url=data.get("icon_url"),
+            score=data.get("score", 0.0),
+            provider=SearchProviderType(provider) if provider else None,
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class ProviderMetadata:
     """搜索源元数据。
 
@@ -83,7 +104,7 @@ class ProviderMetadata:
     description: str = ""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SearchQuery:
     """搜索查询数据类。
 
@@ -117,7 +138,7 @@ class SearchTool(Protocol):
             max_results: 最大结果数
 
         Returns:
-            搜索结果列表
+            搜索结果列表，每个结果的 provider 字段应标记为本搜索源
         """
         ...
 
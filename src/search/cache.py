@@ -1,14 +1,19 @@
 """搜索缓存管理。
 
 基于文件系统的搜索结果缓存，支持自动过期清理。
+
+缓存文件格式：16 字节头部（小端 float64 的 cached_at 与 ttl），
+后接结果列表的 JSON 字节串。写入后文件 mtime 被设为过期时间，
+清理与统计只需 stat，无需打开文件。
 """
 
 import hashlib
-import json
 import logging
-import pickle
+import os
+import struct
 import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -16,9 +21,14 @@ from typing import Any
 logger = logging.getLogger(__name__)
 
 from src.search.base import SearchResult, SearchTimeRange
+from src.utils.imports import json_dumps_bytes, json_loads
+
+# 缓存文件后缀与头部布局
+CACHE_SUFFIX = ".bin"
+_HEADER = struct.Struct("<dd")
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CacheEntry:
     """缓存条目数据类。"""
 
@@ -26,11 +36,36 @@ class CacheEntry:
     cached_at: float
     ttl: int
 
+    def is_expired(self, current_time: float) -> bool:
+        """检查条目是否已过期。"""
+        return current_time - self.cached_at > self.ttl
+
+    def to_bytes(self) -> bytes:
+        """编码为缓存文件内容。"""
+        payload = json_dumps_bytes([r.to_dict() for r in self.results])
+        return _HEADER.pack(self.cached_at, float(self.ttl)) + payload
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CacheEntry":
+        """从缓存文件内容解码。"""
+        cached_at, ttl = _HEADER.unpack_from(data)
+        results = [SearchResult.from_dict(d) for d in json_loads(data[_HEADER.size:])]
+        return cls(results=results, cached_at=cached_at, ttl=int(ttl))
+
+
+def _is_file_expired(stat_result: os.stat_result, current_time: float) -> bool:
+    """根据 stat 判断缓存文件是否过期（mtime 即过期时间）。
+
+    长度不足头部的文件视为损坏，同样按过期处理。
+    """
+    return stat_result.st_size < _HEADER.size or current_time > stat_result.st_mtime
+
 
 class SearchCache:
     """搜索缓存。
 
     基于文件系统的缓存，支持 TTL 过期和自动清理。
+    磁盘层之前有一个小型内存 LRU 层，重复查询无需读盘和解码。
     """
 
     def __init__(
@@ -38,6 +73,7 @@ class SearchCache:
         cache_dir: str | Path = "data/cache/search",
         default_ttl: int = 3600,
         enabled: bool = True,
+        memory_max_entries: int = 256,
     ) -> None:
         """初始化搜索缓存。
 
@@ -45,11 +81,14 @@ class SearchCache:
             cache_dir: 缓存目录路径
             default_ttl: 默认缓存过期时间（秒）
             enabled: 是否启用缓存
+            memory_max_entries: 内存层最多保留的条目数，0 表示禁用内存层
         """
         self._cache_dir = Path(cache_dir)
         self._default_ttl = default_ttl
         self._enabled = enabled
         self._lock = threading.RLock()
+        self._memory: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._memory_max_entries = memory_max_entries
 
         if self._enabled:
             self._cache_dir.mkdir(parents=True, exist_ok=True)
@@ -74,22 +113,31 @@ class SearchCache:
             return None
 
         cache_key = self._make_cache_key(query, time_range, max_results)
-        cache_file = self._cache_dir / f"{cache_key}.pkl"
+        cache_file = self._cache_dir / f"{cache_key}{CACHE_SUFFIX}"
 
         with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                if entry.is_expired(time.time()):
+                    self._memory.pop(cache_key, None)
+                    cache_file.unlink(missing_ok=True)
+                    return None
+                self._memory.move_to_end(cache_key)
+                return list(entry.results)
+
             if not cache_file.exists():
                 return None
 
             try:
-                with open(cache_file, "rb") as f:
-                    entry: CacheEntry = pickle.load(f)
+                entry = CacheEntry.from_bytes(cache_file.read_bytes())
 
                 # 检查是否过期
-                if time.time() - entry.cached_at > entry.ttl:
+                if entry.is_expired(time.time()):
                     cache_file.unlink(missing_ok=True)
                     return None
 
-                return entry.results
+                self._remember(cache_key, entry)
+                return list(entry.results)
             except Exception as e:
                 logger.warning(f"Failed to read cache: {e}")
                 return None
@@ -115,19 +163,25 @@ class SearchCache:
             return
 
         cache_key = self._make_cache_key(query, time_range, max_results)
-        cache_file = self._cache_dir / f"{cache_key}.pkl"
+        cache_file = self._cache_dir / f"{cache_key}{CACHE_SUFFIX}"
 
         entry = CacheEntry(
-            results=results,
+            results=list(results),
             cached_at=time.time(),
             ttl=ttl or self._default_ttl,
         )
 
         with self._lock:
+            self._remember(cache_key, entry)
+            # 先写临时文件再原子替换，中途崩溃不会留下半写的缓存文件
+            tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
             try:
-                with open(cache_file, "wb") as f:
-                    pickle.dump(entry, f)
+                tmp_file.write_bytes(entry.to_bytes())
+                expires_at = entry.cached_at + entry.ttl
+                os.utime(tmp_file, (expires_at, expires_at))
+                os.replace(tmp_file, cache_file)
             except Exception as e:
+                tmp_file.unlink(missing_ok=True)
                 logger.warning(f"Failed to write cache: {e}")
 
     def invalidate(
@@ -147,9 +201,10 @@ class SearchCache:
             return
 
         cache_key = self._make_cache_key(query, time_range, max_results)
-        cache_file = self._cache_dir / f"{cache_key}.pkl"
+        cache_file = self._cache_dir / f"{cache_key}{CACHE_SUFFIX}"
 
         with self._lock:
+            self._memory.pop(cache_key, None)
             cache_file.unlink(missing_ok=True)
 
     def clear(self) -> None:
@@ -158,7 +213,8 @@ class SearchCache:
             return
 
         with self._lock:
-            for cache_file in self._cache_dir.glob("*.pkl"):
+            self._memory.clear()
+            for cache_file in self._cache_dir.glob(f"*{CACHE_SUFFIX}"):
                 cache_file.unlink(missing_ok=True)
 
     def cleanup_expired(self) -> int:
@@ -174,21 +230,33 @@ class SearchCache:
         current_time = time.time()
 
         with self._lock:
-            for cache_file in self._cache_dir.glob("*.pkl"):
-                try:
-                    with open(cache_file, "rb") as f:
-                        entry: CacheEntry = pickle.load(f)
+            for cache_key in [
+                key for key, entry in self._memory.items()
+                if entry.is_expired(current_time)
+            ]:
+                del self._memory[cache_key]
 
-                    if current_time - entry.cached_at > entry.ttl:
-                        cache_file.unlink()
+            for cache_file in self._cache_dir.glob(f"*{CACHE_SUFFIX}"):
+                try:
+                    # 过期判断只需 stat，无需读取文件内容
+                    if _is_file_expired(cache_file.stat(), current_time):
+                        cache_file.unlink(missing_ok=True)
                         count += 1
-                except Exception:
-                    # 损坏的缓存文件也删除
-                    cache_file.unlink(missing_ok=True)
-                    count += 1
+                except OSError as e:
+                    logger.warning(f"Failed to inspect cache file {cache_file}: {e}")
 
         return count
 
+    def _remember(self, cache_key: str, entry: CacheEntry) -> None:
+        """写入内存层并按 LRU 淘汰超出容量的条目（调用方需持有锁）。"""
+        if self._memory_max_entries <= 0:
+            return
+
+        self._memory[cache_key] = entry
+        self._memory.move_to_end(cache_key)
+        while len(self._memory) > self._memory_max_entries:
+            self._memory.popitem(last=False)
+
     @staticmethod
     def _make_cache_key(
         query: str,
@@ -203,10 +271,11 @@ class SearchCache:
             max_results: 最大结果数
 
         Returns:
-            缓存键（MD5 哈希）
+            缓存键（16 位十六进制 BLAKE2b 摘要）
         """
         key_data = f"{query}:{time_range.value}:{max_results}"
-        return hashlib.md5(key_data.encode()).hexdigest()[:16]
+        # 只需唯一性，8 字节 BLAKE2b 比 MD5 更快且仍保持 16 字符文件名
+        return hashlib.blake2b(key_data.encode(), digest_size=8).hexdigest()
 
     def get_stats(self) -> dict[str, Any]:
         """获取缓存统计信息。
@@ -223,17 +292,15 @@ class SearchCache:
         current_time = time.time()
 
         with self._lock:
-            for cache_file in self._cache_dir.glob("*.pkl"):
-                total_files += 1
-                total_size += cache_file.stat().st_size
-
+            for cache_file in self._cache_dir.glob(f"*{CACHE_SUFFIX}"):
                 try:
-                    with open(cache_file, "rb") as f:
-                        entry: CacheEntry = pickle.load(f)
+                    stat_result = cache_file.stat()
+                except OSError:
+                    continue
 
-                    if current_time - entry.cached_at > entry.ttl:
-                        expired_files += 1
-                except Exception:
+                total_files += 1
+                total_size += stat_result.st_size
+                if _is_file_expired(stat_result, current_time):
                     expired_files += 1
 
         return {
@@ -244,3 +311,71 @@ class SearchCache:
             "expired_files": expired_files,
             "cache_dir": str(self._cache_dir),
         }
+
+
+class TTLCache:
+    """进程内的搜索结果 LRU 缓存，条目在 TTL 后过期。
+
+    不落盘，适合在搜索工具前挡住短时间内的重复查询（交互式迭代、重试）。
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 60.0) -> None:
+        """初始化缓存。
+
+        Args:
+            maxsize: 最多保留的条目数
+            ttl: 条目过期时间（秒）
+        """
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, tuple[float, tuple[SearchResult, ...]]] = OrderedDict()
+
+    @staticmethod
+    def make_key(query: str, time_range: SearchTimeRange, max_results: int) -> bytes:
+        """生成缓存键（16 字节 BLAKE2b 摘要）。"""
+        return hashlib.blake2b(
+            f"{query}|{time_range.value}|{max_results}".encode(), digest_size=16
+        ).digest()
+
+    def get(
+        self,
+        query: str,
+        time_range: SearchTimeRange = SearchTimeRange.ONE_YEAR,
+        max_results: int = 10,
+    ) -> list[SearchResult] | None:
+        """获取未过期的缓存结果，不存在或已过期时返回 None。"""
+        key = self.make_key(query, time_range, max_results)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, results = entry
+            if time.monotonic() > expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return list(results)
+
+    def set(
+        self,
+        query: str,
+        results: list[SearchResult],
+        time_range: SearchTimeRange = SearchTimeRange.ONE_YEAR,
+        max_results: int = 10,
+    ) -> None:
+        """写入结果（以元组保存，避免调用方修改缓存内容）。"""
+        key = self.make_key(query, time_range, max_results)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, tuple(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空所有条目。"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -3,17 +3,86 @@
 为 Elite Agent 收集外部专家观点和分析。
 """
 
+import concurrent.futures
+import hashlib
+import heapq
 import logging
+import os
+import threading
+import time
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
 from src.search.base import SearchTool, SearchTimeRange, SearchResult
-
-
-@dataclass
+from src.search.multi_source import MultiSourceSearchTool
+from src.search.providers._util import extract_site_name
+from src.utils.imports import json_dumps_bytes, json_loads
+
+# 最多返回的外部洞察数
+MAX_INSIGHTS = 30
+
+# 增强查询对时效不敏感，缓存保留 7 天
+ENRICHMENT_CACHE_TTL = 7 * 24 * 3600
+
+# 一次增强的整体超时（秒），超时后放弃未完成的查询
+ENRICHMENT_TIMEOUT = 60.0
+
+_relevance_key = attrgetter("relevance_score")
+
+# 按优先级排列的来源类型：(域名后缀, 主机名关键词)；只匹配主机名，路径中的词不参与判断
+_SOURCE_HOST_RULES: tuple[tuple[str, tuple[str, ...], tuple[str, ...]], ...] = (
+    ("expert_blog", ("medium.com", "substack.com"), ("blog",)),
+    ("tech_paper", ("arxiv.org", "acm.org", "ieee.org"), ()),
+    ("news", ("techcrunch.com", "36kr.com", "ifanr.com"), ("news",)),
+    ("video", ("youtube.com", "bilibili.com"), ()),
+)
+
+
+@lru_cache(maxsize=4096)
+def _classify_host(host: str) -> str | None:
+    """根据主机名判断来源类型，无法判断时返回 None。"""
+    for source_type, domains, keywords in _SOURCE_HOST_RULES:
+        for domain in domains:
+            if host == domain or host.endswith("." + domain):
+                return source_type
+        for keyword in keywords:
+            if keyword in host:
+                return source_type
+    return None
+
+
+# 查询类型与查询模板，每次调用只需 format 目标名称
+_QUERY_TEMPLATES: tuple[tuple[str, str], ...] = (
+    # 专家观点
+    ("expert", '"{target}" 专家分析 深度评测'),
+    ("industry", '"{target}" 行业报告 市场分析'),
+    # 技术视角
+    ("technical", '"{target}" 技术架构 开发者'),
+    # 商业视角
+    ("business", '"{target}" 商业模式 盈利'),
+    # 用户反馈
+    ("review", '"{target}" 用户评价 体验分析'),
+)
+_TREND_TEMPLATE = "{category} 发展趋势 行业分析"
+
+# 域名无法判断时，根据查询类型推断
+_QUERY_TYPE_SOURCES: dict[str, str] = {
+    "expert": "analysis",
+    "industry": "analysis",
+    "technical": "analysis",
+    "business": "analysis",
+    "review": "review",
+    "trend": "analysis",
+}
+
+
+@dataclass(frozen=True, slots=True)
 class ExternalInsight:
     """外部洞察数据类。
 
@@ -27,7 +96,7 @@ class ExternalInsight:
     site_name: str | None = None
     published_date: str | None = None
     relevance_score: float = 0.0
-    quoted_content: list[str] | None = None
+    quoted_content: tuple[str, ...] = ()
 
     def to_dict(self) -> dict:
         """转换为字典。"""
@@ -39,9 +108,70 @@ class ExternalInsight:
             "site_name": self.site_name,
             "published_date": self.published_date,
             "relevance_score": self.relevance_score,
-            "quoted_content": self.quoted_content or [],
+            "quoted_content": list(self.quoted_content),
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "ExternalInsight":
+        """从字典创建。"""
+        return cls(
+            url=data["url"],
+            title=data.get("title", ""),
+            summary=data.get("summary", ""),
+            source_type=data.get("source_type", "article"),
+            site_name=data.get("site_name"),
+            published_date=data.get("published_date"),
+            relevance_score=data.get("relevance_score", 0.0),
+            quoted_content=tuple(data.get("quoted_content") or ()),
+        )
+
+
+class _InsightCache:
+    """增强结果的磁盘缓存。
+
+    与 SearchCache 相同的约定：文件 mtime 即过期时间，写入先落临时文件再原子替换。
+    """
+
+    def __init__(self, cache_dir: str | Path, ttl: int) -> None:
+        self._cache_dir = Path(cache_dir)
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(target: str, category: str | None, max_results_per_query: int) -> str:
+        """生成缓存键（32 位十六进制 BLAKE2b 摘要）。"""
+        key_data = f"{target}\0{category or ''}\0{max_results_per_query}"
+        return hashlib.blake2b(key_data.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> list[ExternalInsight] | None:
+        """读取未过期的缓存，不存在、已过期或损坏时返回 None。"""
+        cache_file = self._cache_dir / f"{key}.json"
+        try:
+            if time.time() > cache_file.stat().st_mtime:
+                cache_file.unlink(missing_ok=True)
+                return None
+            return [ExternalInsight.from_dict(d) for d in json_loads(cache_file.read_bytes())]
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read enrichment cache: {e}")
+            return None
+
+    def set(self, key: str, insights: list[ExternalInsight]) -> None:
+        """写入缓存。"""
+        cache_file = self._cache_dir / f"{key}.json"
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        with self._lock:
+            try:
+                tmp_file.write_bytes(json_dumps_bytes([i.to_dict() for i in insights]))
+                expires_at = time.time() + self._ttl
+                os.utime(tmp_file, (expires_at, expires_at))
+                os.replace(tmp_file, cache_file)
+            except Exception as e:
+                tmp_file.unlink(missing_ok=True)
+                logger.warning(f"Failed to write enrichment cache: {e}")
+
 
 class ContextEnricher:
     """上下文增强器。
@@ -49,19 +179,31 @@ class ContextEnricher:
     为 Elite Agent 收集外部专家观点和分析。
     """
 
-    def __init__(self, search_tool: SearchTool) -> None:
+    def __init__(
+        self,
+        search_tool: SearchTool,
+        cache_enabled: bool = True,
+        cache_dir: str | Path = "data/cache/enrichment",
+        cache_ttl: int = ENRICHMENT_CACHE_TTL,
+    ) -> None:
         """初始化上下文增强器。
 
         Args:
             search_tool: 搜索工具实例
+            cache_enabled: 是否按 (target, category) 缓存增强结果
+            cache_dir: 增强结果缓存目录
+            cache_ttl: 增强结果缓存过期时间（秒）
         """
         self._search = search_tool
+        self._insight_cache = _InsightCache(cache_dir, cache_ttl) if cache_enabled else None
 
     def enrich_for_elite(
         self,
         target: str,
         category: str | None = None,
         max_results_per_query: int = 5,
+        cache_ttl: int | None = ENRICHMENT_CACHE_TTL,
+        overall_timeout: float | None = ENRICHMENT_TIMEOUT,
     ) -> list[ExternalInsight]:
         """为 Elite Agent 收集外部上下文。
 
@@ -69,50 +211,130 @@ class ContextEnricher:
             target: 目标产品/公司名称
             category: 产品类别（用于搜索行业趋势）
             max_results_per_query: 每个查询的最大结果数
+            cache_ttl: 搜索结果的缓存过期时间（秒），None 使用搜索工具的默认值；
+                仅对带缓存的多源搜索工具生效
+            overall_timeout: 所有查询的整体超时（秒），None 表示不限制；
+                超时后只使用已完成查询的结果
 
         Returns:
             外部洞察列表
         """
+        # 相同目标的增强结果直接复用缓存
+        cache_key = None
+        if self._insight_cache is not None:
+            cache_key = self._insight_cache.make_key(target, category, max_results_per_query)
+            cached = self._insight_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         # 构建搜索查询
         queries = self._build_search_queries(target, category)
 
-        insights = []
-
-        for query_type, query in queries.items():
+        # 各查询相互独立，并发执行；结果按查询顺序拼接，保证去重结果稳定
+        insights_by_type: dict[str, list[ExternalInsight]] = {}
+        if queries:
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=len(queries))
             try:
-                results = self._search.search(
-                    query=query,
-                    time_range=SearchTimeRange.ONE_YEAR,
-                    max_results=max_results_per_query,
-                )
-
-                for result in results:
-                    insights.append(ExternalInsight(
-                        url=result.url,
-                        title=result.title,
-                        summary=result.summary,
-                        source_type=self._classify_source(result, query_type),
-                        site_name=result.site_name,
-                        published_date=result.published_date,
-                        relevance_score=result.score,
-                    ))
-
-            except Exception as e:
-                # 单个搜索失败不应影响整体
-                logger.warning(f"Search failed for '{query}': {e}")
-                continue
-
-        # 去重并排序
-        unique_insights = self._deduplicate(insights)
-        sorted_insights = sorted(
-            unique_insights,
-            key=lambda x: x.relevance_score,
-            reverse=True,
-        )
+                future_map = {
+                    pool.submit(
+                        self._search_insights,
+                        query_type,
+                        query,
+                        max_results_per_query,
+                        cache_ttl,
+                    ): (query_type, query)
+                    for query_type, query in queries
+                }
+                try:
+                    for future in concurrent.futures.as_completed(
+                        future_map, timeout=overall_timeout
+                    ):
+                        query_type, query = future_map[future]
+                        try:
+                            insights_by_type[query_type] = future.result()
+                        except Exception as e:
+                            # 单个搜索失败不应影响整体
+                            logger.warning(f"Search failed for '{query}': {e}")
+                except concurrent.futures.TimeoutError:
+                    pending = [qt for f, (qt, _) in future_map.items() if not f.done()]
+                    logger.warning(
+                        f"Enrichment timed out after {overall_timeout}s, skipping: {pending}"
+                    )
+            finally:
+                # 不等待超时未完成的查询
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        # 按查询顺序合并，同一 URL 只保留评分更高的一条（评分相同保留先出现的）
+        insights: dict[str, ExternalInsight] = {}
+        for query_type, _ in queries:
+            for insight in insights_by_type.get(query_type, ()):
+                existing = insights.get(insight.url)
+                if existing is None or existing.relevance_score < insight.relevance_score:
+                    insights[insight.url] = insight
+
+        top_insights = heapq.nlargest(MAX_INSIGHTS, insights.values(), key=_relevance_key)
+
+        # 只缓存所有查询都成功完成、且至少有一个查询返回结果的增强内容：
+        # 搜索源吞掉异常时会返回空列表，离线时的空结果不能在整个 TTL 内被复用
+        if (
+            cache_key is not None
+            and len(insights_by_type) == len(queries)
+            and any(insights_by_type.values())
+        ):
+            self._insight_cache.set(cache_key, top_insights)
+
+        return top_insights
+
+    def _search_insights(
+        self,
+        query_type: str,
+        query: str,
+        max_results: int,
+        cache_ttl: int | None = None,
+    ) -> list[ExternalInsight]:
+        """执行单个查询并转换为外部洞察。
 
-        return sorted_insights[:30]  # 最多返回 30 条
+        Args:
+            query_type: 查询类型
+            query: 查询字符串
+            max_results: 最大结果数
+            cache_ttl: 搜索结果的缓存过期时间（秒）
 
-    def _build_search_queries(self, target: str, category: str | None) -> dict[str, str]:
+        Returns:
+            外部洞察列表
+        """
+        if isinstance(self._search, MultiSourceSearchTool):
+            results = self._search.search(
+                query=query,
+                time_range=SearchTimeRange.ONE_YEAR,
+                max_results=max_results,
+                cache_ttl=cache_ttl,
+            )
+        else:
+            results = self._search.search(
+                query=query,
+                time_range=SearchTimeRange.ONE_YEAR,
+                max_results=max_results,
+            )
+
+        return [
+            ExternalInsight(
+                url=result.url,
+                title=result.title,
+                summary=result.summary,
+                source_type=self._classify_source(result, query_type),
+                site_name=result.site_name,
+                published_date=result.published_date,
+                relevance_score=result.score,
+            )
+            for result in results
+        ]
+
+    def _build_search_queries(
+        self,
+        target: str,
+        category: str | None,
+    ) -> list[tuple[str, str]]:
         """构建搜索查询。
 
         Args:
@@ -120,25 +342,15 @@ class ContextEnricher:
             category: 产品类别
 
         Returns:
-            查询类型到查询字符串的映射
+            (查询类型, 查询字符串) 列表
         """
-        queries = {
-            # 专家观点
-            "expert": f'"{target}" 专家分析 深度评测',
-            "industry": f'"{target}" 行业报告 市场分析',
-
-            # 技术视角
-            "technical": f'"{target}" 技术架构 开发者',
-
-            # 商业视角
-            "business": f'"{target}" 商业模式 盈利',
-
-            # 用户反馈
-            "review": f'"{target}" 用户评价 体验分析',
-        }
+        queries = [
+            (query_type, template.format(target=target))
+            for query_type, template in _QUERY_TEMPLATES
+        ]
 
         if category:
-            queries["trend"] = f"{category} 发展趋势 行业分析"
+            queries.append(("trend", _TREND_TEMPLATE.format(category=category)))
 
         return queries
 
@@ -152,44 +364,13 @@ class ContextEnricher:
         Returns:
             来源类型
         """
-        url = result.url.lower()
+        # 主机名解析按 URL 缓存，分类结果按主机名缓存
+        host = (extract_site_name(result.url) or "").lower().rpartition("@")[2].partition(":")[0]
 
         # 根据域名判断来源类型
-        if any(domain in url for domain in ["medium.com", "blog", "substack"]):
-            return "expert_blog"
-        elif any(domain in url for domain in ["arxiv.org", "acm.org", "ieee.org"]):
-            return "tech_paper"
-        elif any(domain in url for domain in ["news", "techcrunch", "36kr", "ifanr"]):
-            return "news"
-        elif any(domain in url for domain in ["youtube.com", "bilibili"]):
-            return "video"
-        else:
-            # 根据查询类型推断
-            type_map = {
-                "expert": "analysis",
-                "industry": "analysis",
-                "technical": "analysis",
-                "business": "analysis",
-                "review": "review",
-                "trend": "analysis",
-            }
-            return type_map.get(query_type, "article")
-
-    def _deduplicate(self, insights: list[ExternalInsight]) -> list[ExternalInsight]:
-        """去重。
-
-        Args:
-            insights: 外部洞察列表
-
-        Returns:
-            去重后的列表
-        """
-        seen_urls = set()
-        unique = []
-
-        for insight in insights:
-            if insight.url not in seen_urls:
-                seen_urls.add(insight.url)
-                unique.append(insight)
+        source_type = _classify_host(host)
+        if source_type is not None:
+            return source_type
 
-        return unique
+        # 根据查询类型推断
+        return _QUERY_TYPE_SOURCES.get(query_type, "article")
@@ -0,0 +1,134 @@
+"""搜索源共享的 HTTP 客户端。
+
+所有基于 httpx 的搜索源共用同一个连接池（以及 DNS 解析与 TLS 会话），
+避免每个搜索源各自维护一份连接池。超时与请求头由各搜索源按请求传入。
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+import weakref
+from collections.abc import AsyncGenerator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# h2（可选）：安装后启用 HTTP/2 多路复用
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 共享连接池上限
+MAX_CONNECTIONS = 200
+MAX_KEEPALIVE_CONNECTIONS = 50
+KEEPALIVE_EXPIRY = 300.0
+
+# 默认超时（秒），各搜索源可按请求覆盖
+DEFAULT_TIMEOUT = 30.0
+
+# 默认请求头，各搜索源可按请求覆盖
+USER_AGENT = "CompetitorSwarm/1.0"
+
+_lock = threading.Lock()
+_client: httpx.Client | None = None
+# 事件循环 -> (异步客户端, 循环关闭前负责关闭它的异步生成器)；循环被回收后条目自动消失
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, AsyncGenerator[None, None]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _client_options() -> dict:
+    """共享客户端的构造参数。"""
+    return {
+        "timeout": DEFAULT_TIMEOUT,
+        "http2": HTTP2_AVAILABLE,
+        "headers": {"User-Agent": USER_AGENT},
+        "limits": httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+    }
+
+
+def get_client() -> httpx.Client:
+    """获取进程内共享的同步客户端，首次调用时创建。"""
+    global _client
+    client = _client
+    if client is None or client.is_closed:
+        with _lock:
+            if _client is None or _client.is_closed:
+                _client = httpx.Client(**_client_options())
+            client = _client
+    return client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """获取当前事件循环共享的异步客户端。
+
+    异步连接绑定在创建它的事件循环上，因此每个事件循环各持有一个客户端，
+    并在该循环关闭前（asyncio.run 等调用 loop.shutdown_asyncgens 时）在循环内关闭。
+    """
+    loop = asyncio.get_running_loop()
+    entry = _async_clients.get(loop)
+    if entry is None or entry[0].is_closed:
+        with _lock:
+            entry = _async_clients.get(loop)
+            if entry is None or entry[0].is_closed:
+                client = httpx.AsyncClient(**_client_options())
+                entry = (client, _close_on_loop_shutdown(client))
+                _async_clients[loop] = entry
+    return entry[0]
+
+
+def _close_on_loop_shutdown(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    """返回一个已启动并挂起的异步生成器，事件循环结束时借它在循环内关闭客户端。
+
+    首次迭代时事件循环通过 firstiter 钩子登记该生成器，loop.shutdown_asyncgens()
+    会对其调用 aclose()，从而执行 finally 中的 client.aclose()。生成器由
+    _async_clients 强引用，避免在循环运行期间被回收而提前关闭客户端。
+    """
+    async def closer() -> AsyncGenerator[None, None]:
+        try:
+            yield
+        finally:
+            await client.aclose()
+            loop = asyncio.get_running_loop()
+            with _lock:
+                entry = _async_clients.get(loop)
+                if entry is not None and entry[0] is client:
+                    del _async_clients[loop]
+
+    generator = closer()
+    try:
+        generator.asend(None).send(None)
+    except StopIteration:
+        pass
+    return generator
+
+
+def close_clients() -> None:
+    """关闭共享的同步客户端（进程退出时自动调用）。
+
+    异步客户端在各自事件循环关闭前自动关闭，也可由 aclose_async_client 在循环内提前关闭。
+    """
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+async def aclose_async_client() -> None:
+    """在当前事件循环内关闭该循环共享的异步客户端。"""
+    with _lock:
+        entry = _async_clients.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[1].aclose()
+
+
+atexit.register(close_clients)
@@ -3,8 +3,12 @@
 支持多个搜索源的聚合、降级和负载均衡。
 """
 
+import concurrent.futures
 import logging
-from typing import Any
+import time
+from dataclasses import asdict
+from types import MappingProxyType
+from typing import Any, Mapping
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +28,35 @@ from src.search.cache import SearchCache
 from src.search.quota import QuotaManager
 from src.search.registry import registry
 
+# 并发搜索的整体超时（秒）
+PARALLEL_SEARCH_TIMEOUT = 45
+
+# 搜索源健康状态的缓存时间（秒）
+HEALTH_CHECK_TTL = 30
+
+# Agent 到默认搜索源的映射（只读）
+_AGENT_PROVIDERS: Mapping[str, tuple[SearchProviderType, ...]] = MappingProxyType({
+    "scout": (
+        SearchProviderType.TAVILY,
+        SearchProviderType.DUCKDUCKGO,
+        SearchProviderType.WIKIPEDIA,
+    ),
+    "experience": (SearchProviderType.TAVILY, SearchProviderType.DUCKDUCKGO),
+    "technical": (SearchProviderType.TAVILY, SearchProviderType.DUCKDUCKGO),
+    "market": (SearchProviderType.TAVILY, SearchProviderType.DUCKDUCKGO),
+    "red_team": (SearchProviderType.TAVILY, SearchProviderType.DUCKDUCKGO),
+    "blue_team": (SearchProviderType.TAVILY, SearchProviderType.WIKIPEDIA),
+    "elite": (
+        SearchProviderType.TAVILY,
+        SearchProviderType.DUCKDUCKGO,
+        SearchProviderType.WIKIPEDIA,
+    ),
+})
+_DEFAULT_PROVIDERS: tuple[SearchProviderType, ...] = (
+    SearchProviderType.TAVILY,
+    SearchProviderType.DUCKDUCKGO,
+)
+
 
 class MultiSourceSearchTool(SearchTool):
     """多源搜索工具。
@@ -59,6 +92,10 @@ class MultiSourceSearchTool(SearchTool):
         self._aggregation_mode = aggregation_mode
         self._max_parallel_providers = max_parallel_providers
 
+        # 搜索源健康状态缓存：类型 -> (检查时刻, 是否可用)
+        self._health_cache: dict[SearchProviderType, tuple[float, bool]] = {}
+        self._health_ttl = HEALTH_CHECK_TTL
+
         # 根据配置选择搜索源
         self._preferred_providers = (
             preferred_providers
@@ -78,7 +115,7 @@ class MultiSourceSearchTool(SearchTool):
         # 初始化聚合器
         self._aggregator = ResultAggregator(
             deduplication_enabled=True,
-            sort_strategy=SortStrategy.SCORE,
+            sort_strategy=SortStrategy.RRF,
         )
 
         # 注册默认搜索源（如果尚未注册）
@@ -116,50 +153,14 @@ class MultiSourceSearchTool(SearchTool):
         Returns:
             搜索源类型列表
         """
-        # Agent 到搜索源的映射
-        agent_providers = {
-            "scout": [
-                SearchProviderType.TAVILY,
-                SearchProviderType.DUCKDUCKGO,
-                SearchProviderType.WIKIPEDIA,
-            ],
-            "experience": [
-                SearchProviderType.TAVILY,
-                SearchProviderType.DUCKDUCKGO,
-            ],
-            "technical": [
-                SearchProviderType.TAVILY,
-                SearchProviderType.DUCKDUCKGO,
-            ],
-            "market": [
-                SearchProviderType.TAVILY,
-                SearchProviderType.DUCKDUCKGO,
-            ],
-            "red_team": [
-                SearchProviderType.TAVILY,
-                SearchProviderType.DUCKDUCKGO,
-            ],
-            "blue_team": [
-                SearchProviderType.TAVILY,
-                SearchProviderType.WIKIPEDIA,
-            ],
-            "elite": [
-                SearchProviderType.TAVILY,
-                SearchProviderType.DUCKDUCKGO,
-                SearchProviderType.WIKIPEDIA,
-            ],
-        }
-
-        return agent_providers.get(agent_type, [
-            SearchProviderType.TAVILY,
-            SearchProviderType.DUCKDUCKGO,
-        ])
+        return list(_AGENT_PROVIDERS.get(agent_type, _DEFAULT_PROVIDERS))
 
     def search(
         self,
         query: str,
         time_range: SearchTimeRange = SearchTimeRange.ONE_YEAR,
         max_results: int = 10,
+        cache_ttl: int | None = None,
     ) -> list[SearchResult]:
         """执行多源搜索。
 
@@ -167,6 +168,7 @@ class MultiSourceSearchTool(SearchTool):
             query: 搜索查询
             time_range: 时间范围
             max_results: 最大结果数
+            cache_ttl: 本次结果的缓存过期时间（秒），默认使用构造时的 cache_ttl
 
         Returns:
             搜索结果列表
@@ -193,7 +195,7 @@ class MultiSourceSearchTool(SearchTool):
         aggregated = self._aggregator.aggregate(provider_results, max_results)
 
         # 缓存结果
-        self._cache.set(query, aggregated.results, time_range, max_results)
+        self._cache.set(query, aggregated.results, time_range, max_results, ttl=cache_ttl)
 
         return aggregated.results
 
@@ -207,11 +209,36 @@ class MultiSourceSearchTool(SearchTool):
 
         for provider_type in self._preferred_providers:
             provider = registry.get_provider(provider_type)
-            if provider and provider.check_health():
+            if provider and self._is_healthy(provider_type, provider):
                 selected[provider_type] = provider
 
         return selected
 
+    def _is_healthy(self, provider_type: SearchProviderType, provider: SearchTool) -> bool:
+        """检查搜索源健康状态，TTL 内复用上次结果。
+
+        部分搜索源的 check_health 会发起真实查询，不宜每次搜索都调用。
+
+        Args:
+            provider_type: 搜索源类型
+            provider: 搜索源实例
+
+        Returns:
+            True 表示可用
+        """
+        now = time.monotonic()
+        cached = self._health_cache.get(provider_type)
+        if cached is not None and now - cached[0] < self._health_ttl:
+            return cached[1]
+
+        healthy = provider.check_health()
+        self._health_cache[provider_type] = (now, healthy)
+        return healthy
+
+    def _invalidate_health(self, provider_type: SearchProviderType) -> None:
+        """搜索失败后丢弃缓存的健康状态，下次选择时重新检查。"""
+        self._health_cache.pop(provider_type, None)
+
     def _search_with_fallback(
         self,
         query: str,
@@ -249,12 +276,10 @@ class MultiSourceSearchTool(SearchTool):
                         break  # 使用第一个成功的搜索源
                 except Exception as e:
                     logger.warning(f"Search with {provider_type.value} failed: {e}")
+                    self._invalidate_health(provider_type)
 
         elif self._aggregation_mode == "parallel":
-            # 并行模式：真正并发请求多个搜索源
-            import concurrent.futures
-
-            # 筛选通过配额检查的 provider
+            # 并行模式：并发请求至多 max_parallel_providers 个搜索源
             eligible: list[tuple[SearchProviderType, SearchTool]] = []
             for provider_type, provider in providers.items():
                 if len(eligible) >= self._max_parallel_providers:
@@ -263,42 +288,78 @@ class MultiSourceSearchTool(SearchTool):
                     continue
                 eligible.append((provider_type, provider))
 
-            def _search_one(ptype: SearchProviderType, prov: SearchTool) -> tuple[SearchProviderType, list[SearchResult]]:
-                return ptype, prov.search(query, time_range, max_results)
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(eligible))) as pool:
-                future_map = {
-                    pool.submit(_search_one, ptype, prov): ptype
-                    for ptype, prov in eligible
-                }
-                for future in concurrent.futures.as_completed(future_map, timeout=45):
-                    ptype = future_map[future]
-                    try:
-                        _, provider_results = future.result()
-                        if provider_results:
-                            results[ptype] = provider_results
-                            logger.info(f"Got {len(provider_results)} results from {ptype.value}")
-                    except Exception as e:
-                        logger.warning(f"Search with {ptype.value} failed: {e}")
+            results = self._search_concurrently(query, time_range, max_results, eligible)
 
         else:  # "all" 或其他
-            # 使用所有搜索源
-            for provider_type, provider in providers.items():
-                # 检查配额
-                if self._quota_manager:
-                    if not self._quota_manager.check_and_consume(provider_type):
-                        continue
+            # 使用所有搜索源，同样并发请求
+            eligible = [
+                (provider_type, provider)
+                for provider_type, provider in providers.items()
+                if not self._quota_manager
+                or self._quota_manager.check_and_consume(provider_type)
+            ]
 
-                try:
-                    provider_results = provider.search(query, time_range, max_results)
-                    if provider_results:
-                        results[provider_type] = provider_results
-                        logger.info(f"Got {len(provider_results)} results from {provider_type.value}")
-                except Exception as e:
-                    logger.warning(f"Search with {provider_type.value} failed: {e}")
+            results = self._search_concurrently(query, time_range, max_results, eligible)
 
         return results
 
+    def _search_concurrently(
+        self,
+        query: str,
+        time_range: SearchTimeRange,
+        max_results: int,
+        eligible: list[tuple[SearchProviderType, SearchTool]],
+    ) -> dict[SearchProviderType, list[SearchResult]]:
+        """并发请求多个搜索源。
+
+        总耗时约为最慢搜索源的耗时而非各源之和；超过整体超时后
+        放弃未完成的请求。结果按 eligible 的顺序返回，保证聚合去重稳定。
+
+        Args:
+            query: 搜索查询
+            time_range: 时间范围
+            max_results: 最大结果数
+            eligible: 已通过配额检查的搜索源
+
+        Returns:
+            各搜索源的结果
+        """
+        if not eligible:
+            return {}
+
+        collected: dict[SearchProviderType, list[SearchResult]] = {}
+        pool = concurrent.futures.ThreadPoolExecutor(max_workers=len(eligible))
+        try:
+            future_map = {
+                pool.submit(provider.search, query, time_range, max_results): provider_type
+                for provider_type, provider in eligible
+            }
+            try:
+                for future in concurrent.futures.as_completed(
+                    future_map, timeout=PARALLEL_SEARCH_TIMEOUT
+                ):
+                    provider_type = future_map[future]
+                    try:
+                        provider_results = future.result()
+                        if provider_results:
+                            collected[provider_type] = provider_results
+                            logger.info(f"Got {len(provider_results)} results from {provider_type.value}")
+                    except Exception as e:
+                        logger.warning(f"Search with {provider_type.value} failed: {e}")
+                        self._invalidate_health(provider_type)
+            except concurrent.futures.TimeoutError:
+                pending = [pt.value for f, pt in future_map.items() if not f.done()]
+                logger.warning(f"Search timed out after {PARALLEL_SEARCH_TIMEOUT}s, skipping: {pending}")
+        finally:
+            # 不等待超时未完成的请求
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        return {
+            provider_type: collected[provider_type]
+            for provider_type, _ in eligible
+            if provider_type in collected
+        }
+
     @property
     def metadata(self) -> ProviderMetadata:
         """获取搜索源元数据。"""
@@ -315,6 +376,20 @@ class MultiSourceSearchTool(SearchTool):
     def check_health(self) -> bool:
         """检查搜索源是否可用。
 
+        只读取各搜索源的元数据，不发起网络探测，适合频繁的存活检查。
+
+        Returns:
+            True 表示至少有一个搜索源可用
+        """
+        for provider_type in self._preferred_providers:
+            provider = registry.get_provider(provider_type)
+            if provider is not None and provider.metadata.is_available:
+                return True
+        return False
+
+    def check_health_live(self) -> bool:
+        """逐个探测搜索源的实际可用性（可能发起网络请求）。
+
         Returns:
             True 表示至少有一个搜索源可用
         """
@@ -333,7 +408,7 @@ class MultiSourceSearchTool(SearchTool):
         return {
             "enabled": True,
             "providers": {
-                k.value: v.__dict__
+                k.value: asdict(v)
                 for k, v in self._quota_manager.get_all_status().items()
             },
         }
@@ -341,3 +416,8 @@ class MultiSourceSearchTool(SearchTool):
     def clear_cache(self) -> None:
         """清空缓存。"""
         self._cache.clear()
+
+    def close(self) -> None:
+        """写入配额用量并关闭配额数据库连接。"""
+        if self._quota_manager is not None:
+            self._quota_manager.close()
@@ -0,0 +1,79 @@
+"""搜索源共用的工具函数。"""
+
+from functools import lru_cache
+from typing import Iterable
+from urllib.parse import urlparse
+
+from src.search.aggregator import ResultAggregator
+from src.search.base import SearchResult
+
+
+@lru_cache(maxsize=4096)
+def extract_site_name(url: str) -> str | None:
+    """从 URL 中提取站点名称。
+
+    同一 URL 在分页、重试和多源搜索中会反复出现，解析结果按 URL 缓存。
+
+    Args:
+        url: URL 字符串
+
+    Returns:
+        站点名称
+    """
+    if not url:
+        return None
+
+    try:
+        return urlparse(url).netloc
+    except ValueError:
+        # 方括号不配对的 IPv6 主机等畸形 URL 会抛出 ValueError
+        return None
+
+
+# content 为空时依次拼接的备选字段
+_CONTENT_FALLBACK_KEYS = ("title", "snippet", "description")
+
+
+def item_content(item: dict) -> str:
+    """提取 Tavily 结果条目的正文。
+
+    优先使用 content 字段，缺失时拼接标题、片段和描述。
+
+    Args:
+        item: API 返回的结果条目
+
+    Returns:
+        正文内容
+    """
+    content = item.get("content", "")
+    if content:
+        return content
+    return " - ".join(str(item[key]) for key in _CONTENT_FALLBACK_KEYS if key in item)
+
+
+@lru_cache(maxsize=4096)
+def canonical_url(url: str) -> str:
+    """搜索源内部去重使用的规范化 URL。
+
+    规则与聚合器一致（忽略大小写、协议、片段与跟踪参数），另外忽略路径末尾的斜杠。
+    """
+    base, sep, query = ResultAggregator._normalize_url(url).partition("?")
+    return base.rstrip("/") + sep + query
+
+
+def dedupe_results(
+    results: Iterable[SearchResult],
+    limit: int | None = None,
+) -> list[SearchResult]:
+    """按规范化 URL 去重，保留首次出现（排名更高）的结果；没有 URL 的结果全部保留。
+
+    可传入惰性的结果迭代器：凑够 limit 条不重复结果后立即停止消费。
+    """
+    if limit is not None and limit <= 0:
+        return []
+    seen: dict[object, SearchResult] = {}
+    for result in results:
+        seen.setdefault(canonical_url(result.url) if result.url else id(result), result)
+        if limit is not None and len(seen) >= limit:
+            break
+    return list(seen.values())
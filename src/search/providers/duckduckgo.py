@@ -4,6 +4,8 @@
 """
 
 import logging
+import threading
+import time
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -15,6 +17,12 @@ from src.search.base import (
     SearchTimeRange,
     SearchTool,
 )
+from src.search.providers._util import extract_site_name
+
+# 重试策略：最多尝试次数、首次退避时间（秒）与整体时间预算（秒）
+MAX_SEARCH_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.25
+DEFAULT_RETRY_BUDGET = 5.0
 
 
 class DuckDuckGoSearchTool(SearchTool):
@@ -23,33 +31,66 @@ class DuckDuckGoSearchTool(SearchTool):
     使用 DuckDuckGo 进行免费搜索，无需 API Key。
     """
 
-    def __init__(self) -> None:
-        """初始化 DuckDuckGo 搜索工具。"""
+    # 进程内共享的 DDGS 客户端，多个实例复用同一连接池
+    _shared_client: Any = None
+    _shared_client_lock = threading.Lock()
+
+    def __init__(self, retry_budget: float = DEFAULT_RETRY_BUDGET) -> None:
+        """初始化 DuckDuckGo 搜索工具。
+
+        Args:
+            retry_budget: 重试的整体时间预算（秒），超出后不再发起新的尝试
+        """
         self._client: Any = None
+        self._retry_budget = retry_budget
         self._is_available = True
+        self._metadata: ProviderMetadata | None = None
         self._init_client()
 
     def _init_client(self) -> None:
-        """初始化 DuckDuckGo 客户端。"""
+        """初始化 DuckDuckGo 客户端（复用进程内共享的客户端）。"""
+        self._client = self._get_shared_client()
+        if self._client is None:
+            self._is_available = False
+
+    @classmethod
+    def _get_shared_client(cls) -> Any:
+        """获取共享的 DDGS 客户端，首次调用时创建。
+
+        Returns:
+            DDGS 客户端，依赖缺失或初始化失败时返回 None
+        """
+        if cls._shared_client is not None:
+            return cls._shared_client
+
+        with cls._shared_client_lock:
+            if cls._shared_client is None:
+                cls._shared_client = cls._create_client()
+            return cls._shared_client
+
+    @staticmethod
+    def _create_client() -> Any:
+        """创建 DDGS 客户端。"""
         try:
             # 使用新的 ddgs 包名（duckduckgo_search 已重命名）
             from ddgs import DDGS
-            self._client = DDGS(timeout=30)
+            client = DDGS(timeout=30)
             logger.info("DuckDuckGo search initialized.")
+            return client
         except ImportError:
             # 回退到旧包名
             try:
                 from duckduckgo_search import DDGS
-                self._client = DDGS(timeout=30)
+                client = DDGS(timeout=30)
                 logger.info("DuckDuckGo search initialized (legacy package).")
+                return client
             except ImportError:
                 logger.warning(
                     "ddgs not installed. Install with: pip install ddgs"
                 )
-                self._is_available = False
         except Exception as e:
             logger.warning(f"Failed to initialize DuckDuckGo: {e}")
-            self._is_available = False
+        return None
 
     def search(
         self,
@@ -81,14 +122,24 @@ class DuckDuckGoSearchTool(SearchTool):
 
         time_param = time_map.get(time_range)
 
-        # 重试逻辑（最多 3 次）- 使用 HTML 后端绕过 Bing 路由问题
-        import time
+        # 重试逻辑：指数退避，且受整体时间预算约束 - 使用 HTML 后端绕过 Bing 路由问题
+        deadline = time.monotonic() + self._retry_budget
+        last_duration = 0.0
+
+        for attempt in range(MAX_SEARCH_ATTEMPTS):
+            if attempt > 0:
+                remaining = deadline - time.monotonic()
+                delay = RETRY_BASE_DELAY * 2 ** (attempt - 1)
+                # 剩余预算不足以完成退避加一次调用时放弃重试
+                if remaining <= delay + last_duration:
+                    logger.warning(
+                        f"DuckDuckGo search gave up after {attempt} attempts: retry budget exhausted"
+                    )
+                    return []
+                time.sleep(delay)
 
-        for attempt in range(3):
+            started = time.monotonic()
             try:
-                if attempt > 0:
-                    time.sleep(1)
-
                 # 兼容新旧版本的 ddgs 包
                 # 新版本使用 query 参数，旧版本使用 keywords 参数
                 # 注意: ddgs >= 6.0.0 不再支持 "html" 后端，使用 "duckduckgo"
@@ -110,9 +161,12 @@ class DuckDuckGoSearchTool(SearchTool):
                     return self._parse_results(results)
 
             except Exception as e:
-                if attempt == 2:
-                    logger.warning(f"DuckDuckGo search failed after 3 attempts: {e}")
+                if attempt == MAX_SEARCH_ATTEMPTS - 1:
+                    logger.warning(
+                        f"DuckDuckGo search failed after {MAX_SEARCH_ATTEMPTS} attempts: {e}"
+                    )
                     return []
+            last_duration = time.monotonic() - started
 
         return []
 
@@ -137,7 +191,7 @@ class DuckDuckGoSearchTool(SearchTool):
                 url=item.get("link", ""),
                 title=item.get("title", ""),
                 summary=body,
-                site_name=self._extract_site_name(item.get("link", "")),
+                site_name=extract_site_name(item.get("link", "")),
                 published_date=None,  # DuckDuckGo 通常不提供发布日期
                 icon_url=None,
                 score=0.7,  # 默认评分
@@ -146,38 +200,21 @@ class DuckDuckGoSearchTool(SearchTool):
 
         return results
 
-    @staticmethod
-    def _extract_site_name(url: str) -> str | None:
-        """从 URL 中提取站点名称。
-
-        Args:
-            url: URL 字符串
-
-        Returns:
-            站点名称
-        """
-        if not url:
-            return None
-
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            return parsed.netloc
-        except Exception:
-            return None
-
     @property
     def metadata(self) -> ProviderMetadata:
-        """获取搜索源元数据。"""
-        return ProviderMetadata(
-            provider_type=SearchProviderType.DUCKDUCKGO,
-            is_available=self._is_available,
-            rate_limit=None,  # 无严格速率限制
-            daily_quota=0,  # 无限制
-            supports_time_range=True,
-            priority=10,
-            description="DuckDuckGo - 免费搜索引擎",
-        )
+        """获取搜索源元数据（复用同一实例，可用性变化时才重建）。"""
+        metadata = self._metadata
+        if metadata is None or metadata.is_available != self._is_available:
+            metadata = self._metadata = ProviderMetadata(
+                provider_type=SearchProviderType.DUCKDUCKGO,
+                is_available=self._is_available,
+                rate_limit=None,  # 无严格速率限制
+                daily_quota=0,  # 无限制
+                supports_time_range=True,
+                priority=10,
+                description="DuckDuckGo - 免费搜索引擎",
+            )
+        return metadata
 
     def check_health(self) -> bool:
         """检查搜索源是否可用。
@@ -35,6 +35,7 @@ class GitHubSearchTool(SearchTool):
         self._api_token = api_token or os.getenv("GITHUB_TOKEN")
         self._base_url = "https://api.github.com"
         self._is_available = True
+        self._metadata: ProviderMetadata | None = None
         self._check_availability()
 
     def _check_availability(self) -> None:
@@ -307,19 +308,22 @@ class GitHubSearchTool(SearchTool):
 
     @property
     def metadata(self) -> ProviderMetadata:
-        """获取搜索源元数据。"""
-        # GitHub API 速率限制：认证 5000/小时，未认证 60/小时
-        rate_limit = 5000 if self._api_token else 60
-
-        return ProviderMetadata(
-            provider_type=SearchProviderType.GITHUB,
-            is_available=self._is_available,
-            rate_limit=rate_limit,  # 每小时
-            daily_quota=None,
-            supports_time_range=True,
-            priority=50,
-            description="GitHub - 代码仓库搜索",
-        )
+        """获取搜索源元数据（复用同一实例，可用性变化时才重建）。"""
+        metadata = self._metadata
+        if metadata is None or metadata.is_available != self._is_available:
+            # GitHub API 速率限制：认证 5000/小时，未认证 60/小时
+            rate_limit = 5000 if self._api_token else 60
+
+            metadata = self._metadata = ProviderMetadata(
+                provider_type=SearchProviderType.GITHUB,
+                is_available=self._is_available,
+                rate_limit=rate_limit,  # 每小时
+                daily_quota=None,
+                supports_time_range=True,
+                priority=50,
+                description="GitHub - 代码仓库搜索",
+            )
+        return metadata
 
     def check_health(self) -> bool:
         """检查搜索源是否可用。
@@ -3,13 +3,29 @@
 当 Tavily API 不可用时，使用 Claude Code 的 search skill 进行在线搜索。
 """
 
+import json
 import logging
 import os
+import re
+import shutil
 import subprocess
-from typing import Any
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
 
 logger = logging.getLogger(__name__)
 
+# ijson（可选）：按 results 数组元素流式解析 JSON 输出，未安装时读完整个输出再解析
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    ijson = None
+    IJSON_AVAILABLE = False
+
 from src.search.base import (
     ProviderMetadata,
     SearchProviderType,
@@ -17,6 +33,291 @@ from src.search.base import (
     SearchTimeRange,
     SearchTool,
 )
+from src.search.providers._util import dedupe_results, extract_site_name
+from src.utils.imports import json_loads
+
+
+# 结构化文本输出的行：字段行、列表项或空行（其余行不匹配，直接跳过）
+_TEXT_LINE_RE = re.compile(
+    r"^[ \t]*(?:(?P<key>Title|URL|Summary):(?P<value>.*?)|- [ \t]*(?P<item>\S.*?))?[ \t]*\r?$",
+    re.MULTILINE,
+)
+_TEXT_FIELDS = {"Title": "title", "URL": "url", "Summary": "summary"}
+
+# JSON 对象输出的开头：可选空白后紧跟 {
+_JSON_OBJECT_START_RE = re.compile(r"\s*\{")
+_JSON_OBJECT_START_BYTES_RE = re.compile(rb"\s*\{")
+
+
+def _looks_like_json_object(output: bytes | str) -> bool:
+    """首个非空白字符是否为 {（只有 JSON 对象才可能携带 results）。"""
+    pattern = _JSON_OBJECT_START_BYTES_RE if isinstance(output, bytes) else _JSON_OBJECT_START_RE
+    return pattern.match(output) is not None
+
+
+# search skill 子进程超时（秒）
+SKILL_SEARCH_TIMEOUT = 60.0
+
+# search skill 可用性探测结果的磁盘缓存
+SKILL_AVAILABILITY_CACHE = Path("data/cache/skill_available.json")
+SKILL_CACHE_TTL_ENV = "SKILL_CACHE_TTL"
+DEFAULT_SKILL_CACHE_TTL = 3600
+
+# 串行化首次探测，避免并发调用各自派生子进程
+_PROBE_LOCK = threading.Lock()
+
+
+def _skill_cache_ttl() -> int:
+    """读取可用性缓存的 TTL（秒），0 表示不使用磁盘缓存。"""
+    try:
+        return max(0, int(os.getenv(SKILL_CACHE_TTL_ENV, str(DEFAULT_SKILL_CACHE_TTL))))
+    except ValueError:
+        return DEFAULT_SKILL_CACHE_TTL
+
+
+def _read_cached_availability(ttl: int) -> bool | None:
+    """读取未过期的可用性缓存，不存在、已过期或损坏时返回 None。"""
+    try:
+        data = json.loads(SKILL_AVAILABILITY_CACHE.read_text(encoding="utf-8"))
+        if time.time() - float(data["checked_at"]) < ttl:
+            return bool(data["available"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _write_cached_availability(available: bool) -> None:
+    """写入可用性缓存（先写临时文件再原子替换）。"""
+    tmp_file = SKILL_AVAILABILITY_CACHE.with_name(
+        f"{SKILL_AVAILABILITY_CACHE.name}.{os.getpid()}.tmp"
+    )
+    try:
+        SKILL_AVAILABILITY_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file.write_text(
+            json.dumps({"available": available, "checked_at": time.time()}),
+            encoding="utf-8",
+        )
+        os.replace(tmp_file, SKILL_AVAILABILITY_CACHE)
+    except OSError as e:
+        tmp_file.unlink(missing_ok=True)
+        logger.debug(f"Failed to write skill availability cache: {e}")
+
+
+@lru_cache(maxsize=1)
+def _probe_skill_available() -> bool:
+    """检查 search skill 是否可用（每个进程只探测一次）。
+
+    CLI 不在 PATH 中时直接返回 False，不再派生子进程；
+    否则优先使用 TTL 内的磁盘缓存，避免每次冷启动都调用 CLI。
+    """
+    if shutil.which("claude") is None:
+        return False
+
+    ttl = _skill_cache_ttl()
+    if ttl:
+        cached = _read_cached_availability(ttl)
+        if cached is not None:
+            return cached
+
+    try:
+        result = subprocess.run(
+            ["claude", "skill", "list"],
+            capture_output=True,
+            timeout=10,
+        )
+        # 只需判断是否包含 search，直接在原始字节上查找，无需解码
+        available = b"search" in result.stdout
+    except Exception:
+        # 探测失败不写缓存，下次启动重新探测
+        return False
+
+    if ttl:
+        _write_cached_availability(available)
+    return available
+
+
+def _check_skill_available() -> bool:
+    """线程安全地获取探测结果：并发的首次调用只派生一次子进程。"""
+    with _PROBE_LOCK:
+        return _probe_skill_available()
+
+
+def _json_item_to_result(item: dict[str, Any]) -> SearchResult:
+    """JSON 输出中的单个条目转换为搜索结果。"""
+    url = item.get("url", "")
+    return SearchResult(
+        url=url,
+        title=item.get("title", ""),
+        summary=item.get("summary", item.get("content", "")),
+        site_name=extract_site_name(url),
+        published_date=None,
+        score=item.get("score", 0.5),
+        provider=SearchProviderType.SKILL_FALLBACK,
+    )
+
+
+def _text_fields_to_result(fields: dict[str, str]) -> SearchResult | None:
+    """结构化文本中的一组字段转换为搜索结果，既无标题也无 URL 时返回 None。"""
+    if "title" not in fields and "url" not in fields:
+        return None
+    url = fields.get("url", "")
+    return SearchResult(
+        url=url,
+        title=fields.get("title", url),
+        summary=fields.get("summary", ""),
+        site_name=extract_site_name(url),
+        published_date=None,
+        score=0.5,
+        provider=SearchProviderType.SKILL_FALLBACK,
+    )
+
+
+def _iter_text_results(matches: Iterable[re.Match[str]]) -> Iterator[SearchResult]:
+    """由逐行匹配结果组装结构化文本中的搜索结果。
+
+    字段行按键名写入当前结果；空行或列表项（可能是新的结果项）结束当前结果。
+    """
+    current: dict[str, str] = {}
+    for match in matches:
+        key, value, item = match.group("key", "value", "item")
+        if key is not None:
+            current[_TEXT_FIELDS[key]] = value.strip()
+            continue
+
+        if current:
+            result = _text_fields_to_result(current)
+            if result is not None:
+                yield result
+            current = {}
+        if item is not None:
+            # 尝试从列表项提取信息
+            current["title"] = item
+
+    # 最后一个结果
+    if current:
+        result = _text_fields_to_result(current)
+        if result is not None:
+            yield result
+
+
+def parse_skill_output(output: bytes | str) -> list[SearchResult]:
+    """解析 search skill 的完整输出。
+
+    JSON 输出直接按字节解析（有 orjson 时走 orjson），
+    只有结构化文本才需要解码。
+
+    Args:
+        output: skill 输出（原始字节或文本）
+
+    Returns:
+        搜索结果列表
+    """
+    # search skill 的输出格式通常是 JSON 或结构化文本
+    # 首个非空白字符是 { 时才尝试解析 JSON，纯文本输出不必走一遍解析失败的异常路径
+    if _looks_like_json_object(output):
+        try:
+            data = json_loads(output)
+            if isinstance(data, dict) and "results" in data:
+                return dedupe_results(map(_json_item_to_result, data["results"]))
+        except Exception:
+            pass
+
+    # 如果不是 JSON，尝试解析结构化文本
+    if isinstance(output, bytes):
+        output = output.decode("utf-8", errors="replace")
+    return dedupe_results(_iter_text_results(_TEXT_LINE_RE.finditer(output)))
+
+
+def _peek_non_whitespace(stream: IO[bytes]) -> bytes:
+    """跳过输出开头的空白块，返回首个非空白字节（不消费），输出为空时返回 b""。"""
+    while True:
+        chunk = stream.peek(1)
+        if not chunk:
+            return b""
+        stripped = chunk.lstrip()
+        if stripped:
+            return stripped[:1]
+        stream.read(len(chunk))
+
+
+def _iter_stream_results(stream: IO[bytes]) -> Iterator[SearchResult]:
+    """边读取 skill 输出边解析搜索结果。
+
+    结构化文本逐行解析；JSON 输出在安装 ijson 时按 results 数组元素流式解析，
+    否则读完整个输出后再解析。
+    """
+    if _peek_non_whitespace(stream) != b"{":
+        # UTF-8 多字节字符不含换行字节，逐行解码与整体解码结果一致
+        lines = (line.decode("utf-8", errors="replace") for line in stream)
+        yield from _iter_text_results(
+            match for match in map(_TEXT_LINE_RE.match, lines) if match is not None
+        )
+    elif IJSON_AVAILABLE:
+        yield from map(_json_item_to_result, ijson.items(stream, "results.item", use_float=True))
+    else:
+        yield from parse_skill_output(stream.read())
+
+
+def run_skill_search(
+    query: str,
+    max_results: int,
+    timeout: float = SKILL_SEARCH_TIMEOUT,
+) -> list[SearchResult]:
+    """调用 search skill 子进程并边读取边解析输出（阻塞）。
+
+    凑够 max_results 条不重复结果后立即结束子进程，不再等待和缓冲剩余输出；
+    stderr 写入临时文件，避免管道写满阻塞子进程。
+
+    Args:
+        query: 搜索查询
+        max_results: 最大结果数
+        timeout: 子进程超时（秒）
+
+    Returns:
+        搜索结果列表，失败或超时时为空列表
+    """
+    args = ["claude", "skill", "search", "--query", query, "--max-results", str(max_results)]
+
+    with tempfile.TemporaryFile() as stderr:
+        try:
+            proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=stderr)
+        except OSError as e:
+            logger.warning(f"Search skill error: {e}")
+            return []
+
+        timed_out = threading.Event()
+
+        def kill_on_timeout() -> None:
+            timed_out.set()
+            proc.kill()
+
+        # 超时后结束子进程，读取端随即遇到 EOF
+        watchdog = threading.Timer(timeout, kill_on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            with proc.stdout:
+                results = dedupe_results(_iter_stream_results(proc.stdout), limit=max_results)
+                if len(results) >= max_results:
+                    # 结果已足够，不再读取剩余输出
+                    proc.kill()
+            returncode = proc.wait()
+        except Exception as e:
+            proc.kill()
+            proc.wait()
+            logger.warning(f"Search skill error: {e}")
+            return []
+        finally:
+            watchdog.cancel()
+
+        if timed_out.is_set():
+            logger.warning("Search skill timed out.")
+            return []
+        if returncode != 0 and len(results) < max_results:
+            stderr.seek(0)
+            logger.warning(f"Search skill failed: {stderr.read().decode('utf-8', errors='replace')}")
+            return []
+        return results
 
 
 class SkillFallbackSearchTool(SearchTool):
@@ -32,25 +333,21 @@ class SkillFallbackSearchTool(SearchTool):
             enable_fallback: 是否启用降级机制
         """
         self._enable_fallback = enable_fallback
-        self._skill_available = False
-        self._check_skill_availability()
-
-    def _check_skill_availability(self) -> None:
-        """检查 search skill 是否可用。"""
-        try:
-            # 测试 search skill 是否可用
-            result = subprocess.run(
-                ["claude", "skill", "list"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            self._skill_available = "search" in result.stdout
-        except Exception:
-            self._skill_available = False
-
-        if not self._skill_available:
-            logger.warning("Claude Code 'search' skill not available. Fallback search disabled.")
+        # 可用性在首次使用时才探测，构造时不阻塞
+        self._skill_available: bool | None = None
+        self._metadata: ProviderMetadata | None = None
+
+    def _check_skill_availability(self) -> bool:
+        """检查 search skill 是否可用（首次调用时探测，之后直接返回结果）。"""
+        if self._skill_available is None:
+            self._skill_available = _check_skill_available()
+            if not self._skill_available:
+                logger.warning("Claude Code 'search' skill not available. Fallback search disabled.")
+        return self._skill_available
+
+    def _is_enabled(self) -> bool:
+        """降级搜索已启用且 search skill 可用（未启用时不探测）。"""
+        return self._enable_fallback and self._check_skill_availability()
 
     def search(
         self,
@@ -68,146 +365,38 @@ class SkillFallbackSearchTool(SearchTool):
         Returns:
             搜索结果列表
         """
-        if not self._enable_fallback or not self._skill_available:
+        if not self._is_enabled():
             return []
 
-        try:
-            # 调用 Claude Code 的 search skill
-            result = subprocess.run(
-                ["claude", "skill", "search", "--query", query, "--max-results", str(max_results)],
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
-
-            if result.returncode != 0:
-                logger.warning(f"Search skill failed: {result.stderr}")
-                return []
-
-            return self._parse_skill_output(result.stdout)
-
-        except subprocess.TimeoutExpired:
-            logger.warning("Search skill timed out.")
-            return []
-        except Exception as e:
-            logger.warning(f"Search skill error: {e}")
-            return []
+        return run_skill_search(query, max_results)
 
-    def _parse_skill_output(self, output: str) -> list[SearchResult]:
-        """解析 search skill 的输出。
+    def _parse_skill_output(self, output: bytes | str) -> list[SearchResult]:
+        """解析 search skill 的完整输出。
 
         Args:
-            output: skill 输出文本
+            output: skill 输出（原始字节或文本）
 
         Returns:
             搜索结果列表
         """
-        results = []
-
-        # search skill 的输出格式通常是 JSON 或结构化文本
-        # 尝试解析 JSON
-        try:
-            import json
-
-            data = json.loads(output)
-            if isinstance(data, dict) and "results" in data:
-                for item in data["results"]:
-                    results.append(SearchResult(
-                        url=item.get("url", ""),
-                        title=item.get("title", ""),
-                        summary=item.get("summary", item.get("content", "")),
-                        site_name=self._extract_site_name(item.get("url", "")),
-                        published_date=None,
-                        score=item.get("score", 0.5),
-                        provider=SearchProviderType.SKILL_FALLBACK,
-                    ))
-                return results
-        except Exception:
-            pass
-
-        # 如果不是 JSON，尝试解析结构化文本
-        lines = output.split("\n")
-        current_result: dict[str, Any] = {}
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                if current_result:
-                    self._add_result_from_dict(current_result, results)
-                    current_result = {}
-                continue
-
-            # 解析常见格式
-            if line.startswith("Title:"):
-                current_result["title"] = line[6:].strip()
-            elif line.startswith("URL:"):
-                current_result["url"] = line[4:].strip()
-            elif line.startswith("Summary:"):
-                current_result["summary"] = line[8:].strip()
-            elif line.startswith("- "):
-                # 可能是结果项
-                if current_result:
-                    self._add_result_from_dict(current_result, results)
-                    current_result = {}
-                # 尝试从列表项提取信息
-                current_result["title"] = line[2:].strip()
-
-        # 添加最后一个结果
-        if current_result:
-            self._add_result_from_dict(current_result, results)
-
-        return results
-
-    def _add_result_from_dict(self, data: dict[str, Any], results: list[SearchResult]) -> None:
-        """从字典添加结果到列表。
-
-        Args:
-            data: 结果数据字典
-            results: 结果列表
-        """
-        if "title" in data or "url" in data:
-            results.append(SearchResult(
-                url=data.get("url", ""),
-                title=data.get("title", data.get("url", "")),
-                summary=data.get("summary", ""),
-                site_name=self._extract_site_name(data.get("url", "")),
-                published_date=None,
-                score=0.5,
-                provider=SearchProviderType.SKILL_FALLBACK,
-            ))
-
-    @staticmethod
-    def _extract_site_name(url: str) -> str | None:
-        """从 URL 中提取站点名称。
-
-        Args:
-            url: URL 字符串
-
-        Returns:
-            站点名称
-        """
-        if not url:
-            return None
-
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            return parsed.netloc
-        except Exception:
-            return None
+        return parse_skill_output(output)
 
     @property
     def metadata(self) -> ProviderMetadata:
-        """获取搜索源元数据。"""
-        return ProviderMetadata(
-            provider_type=SearchProviderType.SKILL_FALLBACK,
-            is_available=self._skill_available and self._enable_fallback,
-            rate_limit=None,
-            daily_quota=0,  # 无限制
-            supports_time_range=False,
-            priority=1,  # 最低优先级
-            description="Claude Code Search Skill - 降级搜索",
-        )
+        """获取搜索源元数据（复用同一实例，可用性变化时才重建）。"""
+        is_available = self._is_enabled()
+        metadata = self._metadata
+        if metadata is None or metadata.is_available != is_available:
+            metadata = self._metadata = ProviderMetadata(
+                provider_type=SearchProviderType.SKILL_FALLBACK,
+                is_available=is_available,
+                rate_limit=None,
+                daily_quota=0,  # 无限制
+                supports_time_range=False,
+                priority=1,  # 最低优先级
+                description="Claude Code Search Skill - 降级搜索",
+            )
+        return metadata
 
     def check_health(self) -> bool:
         """检查搜索源是否可用。
@@ -215,4 +404,4 @@ class SkillFallbackSearchTool(SearchTool):
         Returns:
             True 表示可用，False 表示不可用
         """
-        return self._skill_available and self._enable_fallback
+        return self._is_enabled()
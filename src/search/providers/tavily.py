@@ -3,14 +3,26 @@
 使用 Tavily API 进行搜索。
 """
 
+import asyncio
 import logging
 import os
-from typing import Any
+import threading
+from itertools import islice
+from typing import Any, Iterable
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
+# aiohttp（可选）：并发请求下连接池开销低于 httpx.AsyncClient，未安装时异步路径回退到 httpx
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+from src.search import http
 from src.search.base import (
     ProviderMetadata,
     SearchProviderType,
@@ -18,6 +30,22 @@ from src.search.base import (
     SearchTimeRange,
     SearchTool,
 )
+from src.search.providers._util import dedupe_results, extract_site_name, item_content
+from src.search.semantic_cache import SemanticSearchCache
+from src.utils.imports import json_dumps_bytes, json_loads
+
+# 请求体已预先编码为 JSON 字节串，需显式声明内容类型
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# 时间范围 → Tavily days 参数
+_DAYS_BY_TIME_RANGE: dict[SearchTimeRange, int | None] = {
+    SearchTimeRange.ONE_DAY: 1,
+    SearchTimeRange.ONE_WEEK: 7,
+    SearchTimeRange.ONE_MONTH: 30,
+    SearchTimeRange.ONE_YEAR: 365,
+    SearchTimeRange.NO_LIMIT: None,
+}
 
 
 class TavilySearchTool(SearchTool):
@@ -29,20 +57,64 @@ class TavilySearchTool(SearchTool):
     # Tavily API 端点
     API_BASE_URL = "https://api.tavily.com/search"
 
-    def __init__(self, api_key: str | None = None) -> None:
+    # aiohttp 会话的连接池上限
+    ASYNC_MAX_CONNECTIONS = 100
+
+    # 预热连接的请求地址与超时
+    WARMUP_URL = "https://api.tavily.com/"
+    WARMUP_TIMEOUT = 5.0
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        semantic_cache: SemanticSearchCache | None = None,
+        semantic_cache_enabled: bool = True,
+        warm_connection: bool = True,
+        client: httpx.Client | None = None,
+    ) -> None:
         """初始化 Tavily 搜索工具。
 
         Args:
             api_key: Tavily API 密钥，默认从环境变量 TAVILY_API_KEY 读取
+            semantic_cache: 查询缓存，默认为每个实例新建一个（仅关键词集合完全相同时命中）
+            semantic_cache_enabled: 是否启用近似查询缓存
+            warm_connection: 是否在后台预先建立到 Tavily 的 TCP/TLS 连接
+            client: 同步 HTTP 客户端，默认使用搜索源共享的客户端（由调用方或共享模块负责关闭）
         """
         self._api_key = api_key or os.getenv("TAVILY_API_KEY")
+        self._semantic_cache = (
+            (semantic_cache or SemanticSearchCache()) if semantic_cache_enabled else None
+        )
         self._is_available = bool(self._api_key)
-        self._client = httpx.Client(timeout=30.0)
+        self._params_by_range = self._build_param_templates()
+        self._metadata: ProviderMetadata | None = None
+        self._client = client or http.get_client()
+        # aiohttp 会话按事件循环懒创建；未安装 aiohttp 时使用共享的 httpx 异步客户端
+        self._async_client: Any = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+
+        self._warmup_thread: threading.Thread | None = None
 
         if not self._is_available:
             logger.warning("TAVILY_API_KEY not configured. Tavily search will be disabled.")
         else:
             logger.info("Tavily search initialized.")
+            if warm_connection:
+                # 握手放到后台，首次搜索直接复用连接池中的长连接
+                self._warmup_thread = threading.Thread(
+                    target=self._warm_connection,
+                    args=(self._client,),
+                    name="tavily-warmup",
+                    daemon=True,
+                )
+                self._warmup_thread.start()
+
+    def _warm_connection(self, client: httpx.Client) -> None:
+        """预先建立到 Tavily 的连接，失败时忽略。"""
+        try:
+            client.get(self.WARMUP_URL, timeout=self.WARMUP_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Tavily connection warmup failed: {e}")
 
     def search(
         self,
@@ -63,34 +135,22 @@ class TavilySearchTool(SearchTool):
         if not self._is_available:
             return []
 
-        # Tavily 使用 days 参数
-        days_map = {
-            SearchTimeRange.ONE_DAY: 1,
-            SearchTimeRange.ONE_WEEK: 7,
-            SearchTimeRange.ONE_MONTH: 30,
-            SearchTimeRange.ONE_YEAR: 365,
-            SearchTimeRange.NO_LIMIT: None,
-        }
+        cached = self._get_cached(query, time_range, max_results)
+        if cached is not None:
+            return cached
 
-        params: dict[str, Any] = {
-            "api_key": self._api_key,
-            "query": query,
-            "search_depth": "advanced",
-            "max_results": max_results,
-            "include_answer": False,
-            "include_raw_content": False,
-            "include_images": False,
-        }
-
-        if days_map[time_range] is not None:
-            params["days"] = days_map[time_range]
+        params = self._build_params(query, time_range, max_results)
 
         try:
-            response = self._client.post(self.API_BASE_URL, json=params)
+            response = self._client.post(
+                self.API_BASE_URL, content=json_dumps_bytes(params), headers=_JSON_HEADERS
+            )
             response.raise_for_status()
 
-            data = response.json()
-            return self._parse_results(data)
+            data = json_loads(response.content)
+            return self._store_results(
+                query, time_range, max_results, self._parse_results(data, max_results)
+            )
 
         except httpx.HTTPStatusError as e:
             logger.warning(f"Tavily API error ({e.response.status_code}). Search returned empty results.")
@@ -99,73 +159,189 @@ class TavilySearchTool(SearchTool):
             logger.warning(f"Tavily search failed: {e}. Returning empty results.")
             return []
 
-    def _parse_results(self, data: dict[str, Any]) -> list[SearchResult]:
-        """解析 API 响应。
+    async def asearch(
+        self,
+        query: str,
+        time_range: SearchTimeRange = SearchTimeRange.ONE_YEAR,
+        max_results: int = 10,
+    ) -> list[SearchResult]:
+        """异步执行搜索。
 
         Args:
-            data: API 响应数据
+            query: 搜索查询
+            time_range: 时间范围
+            max_results: 最大结果数
 
         Returns:
             搜索结果列表
         """
-        results = []
-
-        for item in data.get("results", []):
-            # 提取内容
-            content = item.get("content", "")
-            if not content:
-                # 如果没有 content 字段，尝试使用其他字段
-                content_parts = []
-                for key in ["title", "snippet", "description"]:
-                    if key in item:
-                        content_parts.append(str(item[key]))
-                content = " - ".join(content_parts)
-
-            results.append(SearchResult(
-                url=item.get("url", ""),
-                title=item.get("title", ""),
-                summary=content,
-                site_name=self._extract_site_name(item.get("url", "")),
-                published_date=item.get("published_date"),
-                icon_url=item.get("image_url"),
-                score=item.get("score", 0.0),
-                provider=SearchProviderType.TAVILY,
-            ))
+        if not self._is_available:
+            return []
+
+        cached = self._get_cached(query, time_range, max_results)
+        if cached is not None:
+            return cached
+
+        params = self._build_params(query, time_range, max_results)
+
+        try:
+            status, data = await self._apost(params)
+        except Exception as e:
+            logger.warning(f"Tavily search failed: {e}. Returning empty results.")
+            return []
+
+        if status >= 400:
+            logger.warning(f"Tavily API error ({status}). Search returned empty results.")
+            return []
+
+        return self._store_results(
+            query, time_range, max_results, self._parse_results(data, max_results)
+        )
 
+    def _get_cached(
+        self,
+        query: str,
+        time_range: SearchTimeRange,
+        max_results: int,
+    ) -> list[SearchResult] | None:
+        """查找近似查询的缓存结果。"""
+        if self._semantic_cache is None:
+            return None
+        cached = self._semantic_cache.get(SearchProviderType.TAVILY, query, time_range, max_results)
+        if cached is not None:
+            logger.debug(f"Tavily semantic cache hit for query: {query[:50]}")
+        return cached
+
+    def _store_results(
+        self,
+        query: str,
+        time_range: SearchTimeRange,
+        max_results: int,
+        results: list[SearchResult],
+    ) -> list[SearchResult]:
+        """写入近似查询缓存并原样返回结果。"""
+        if self._semantic_cache is not None:
+            self._semantic_cache.set(SearchProviderType.TAVILY, query, time_range, max_results, results)
         return results
 
-    @staticmethod
-    def _extract_site_name(url: str) -> str | None:
-        """从 URL 中提取站点名称。
+    async def _apost(self, params: dict[str, Any]) -> tuple[int, Any]:
+        """异步发送搜索请求。
+
+        Returns:
+            (HTTP 状态码, 响应 JSON)；状态码 >= 400 时不解析响应体
+        """
+        client = self._get_async_client()
+        body = json_dumps_bytes(params)
+
+        if AIOHTTP_AVAILABLE:
+            async with client.post(self.API_BASE_URL, data=body, headers=_JSON_HEADERS) as response:
+                if response.status >= 400:
+                    return response.status, None
+                return response.status, json_loads(await response.read())
+
+        response = await client.post(self.API_BASE_URL, content=body, headers=_JSON_HEADERS)
+        if response.status_code >= 400:
+            return response.status_code, None
+        return response.status_code, json_loads(response.content)
+
+    def _get_async_client(self) -> Any:
+        """获取当前事件循环的异步客户端（aiohttp 会话或共享的 httpx.AsyncClient）。
+
+        异步连接绑定在创建它的事件循环上，循环变化时重新创建。
+        """
+        if not AIOHTTP_AVAILABLE:
+            return http.get_async_client()
+
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(
+                    limit=self.ASYNC_MAX_CONNECTIONS,
+                    ttl_dns_cache=300,
+                ),
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """关闭本实例持有的 aiohttp 会话（共享的 httpx 客户端不在此关闭）。"""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+            self._async_loop = None
+
+    def _build_params(
+        self,
+        query: str,
+        time_range: SearchTimeRange,
+        max_results: int,
+    ) -> dict[str, Any]:
+        """构建 API 请求参数（复制对应时间范围的预构建模板，只填入查询相关字段）。"""
+        params = self._params_by_range[time_range].copy()
+        params["query"] = query
+        params["max_results"] = max_results
+        return params
+
+    def _build_param_templates(self) -> dict[SearchTimeRange, dict[str, Any]]:
+        """按时间范围预构建请求参数模板，每次请求只需浅复制。"""
+        base: dict[str, Any] = {
+            "api_key": self._api_key,
+            "search_depth": "advanced",
+            "include_answer": False,
+            "include_raw_content": False,
+            "include_images": False,
+        }
+        # Tavily 使用 days 参数
+        return {
+            time_range: base if days is None else {**base, "days": days}
+            for time_range, days in _DAYS_BY_TIME_RANGE.items()
+        }
+
+    def _parse_results(
+        self,
+        data: dict[str, Any],
+        max_results: int | None = None,
+    ) -> list[SearchResult]:
+        """解析 API 响应。
 
         Args:
-            url: URL 字符串
+            data: API 响应数据
+            max_results: 最多解析的结果数，None 表示全部
 
         Returns:
-            站点名称
+            搜索结果列表
         """
-        if not url:
-            return None
-
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            return parsed.netloc
-        except Exception:
-            return None
+        # 只构建调用方需要的前 max_results 条，多余条目不做内容拼接与站点解析
+        return dedupe_results([
+            SearchResult(
+                url=item.get("url", ""),
+                title=item.get("title", ""),
+                summary=item_content(item),
+                site_name=extract_site_name(item.get("url", "")),
+                published_date=item.get("published_date"),
+                icon_url=item.get("image_url"),
+                score=item.get("score", 0.0),
+                provider=SearchProviderType.TAVILY,
+            )
+            for item in islice(data.get("results", ()), max_results)
+        ])
 
     @property
     def metadata(self) -> ProviderMetadata:
-        """获取搜索源元数据。"""
-        return ProviderMetadata(
-            provider_type=SearchProviderType.TAVILY,
-            is_available=self._is_available,
-            rate_limit=None,  # Tavily 没有严格的速率限制
-            daily_quota=1000,  # 免费额度约 1000 次/月
-            supports_time_range=True,
-            priority=100,
-            description="Tavily - 高质量 AI 搜索 API",
-        )
+        """获取搜索源元数据（复用同一实例，可用性变化时才重建）。"""
+        metadata = self._metadata
+        if metadata is None or metadata.is_available != self._is_available:
+            metadata = self._metadata = ProviderMetadata(
+                provider_type=SearchProviderType.TAVILY,
+                is_available=self._is_available,
+                rate_limit=None,  # Tavily 没有严格的速率限制
+                daily_quota=1000,  # 免费额度约 1000 次/月
+                supports_time_range=True,
+                priority=100,
+                description="Tavily - 高质量 AI 搜索 API",
+            )
+        return metadata
 
     def check_health(self) -> bool:
         """检查搜索源是否可用。
@@ -175,7 +351,30 @@ class TavilySearchTool(SearchTool):
         """
         return self._is_available
 
-    def __del__(self) -> None:
-        """清理资源。"""
-        if hasattr(self, "_client") and self._client is not None:
-            self._client.close()
+    async def __aenter__(self) -> "TavilySearchTool":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+
+async def search_many(
+    tool: TavilySearchTool,
+    queries: Iterable[str],
+    time_range: SearchTimeRange = SearchTimeRange.ONE_YEAR,
+    max_results: int = 10,
+) -> list[list[SearchResult]]:
+    """在同一事件循环内并发执行多个 Tavily 查询。
+
+    Args:
+        tool: Tavily 搜索工具
+        queries: 搜索查询
+        time_range: 时间范围
+        max_results: 每个查询的最大结果数
+
+    Returns:
+        与 queries 顺序一致的结果列表
+    """
+    return list(await asyncio.gather(
+        *(tool.asearch(query, time_range, max_results) for query in queries)
+    ))
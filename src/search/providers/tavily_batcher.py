@@ -0,0 +1,148 @@
+"""Tavily 异步请求合并器。
+
+把短时间窗口内到达的查询合并成一批，由同一个调度循环在共享的
+异步客户端上并发发出，避免每个调用方各自创建连接。
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+from src.search.base import SearchResult, SearchTimeRange
+from src.search.providers.tavily import TavilySearchTool
+
+# 单批最多合并的查询数与最长等待时间（秒）
+DEFAULT_MAX_BATCH_SIZE = 20
+DEFAULT_MAX_QUEUE_TIME = 0.05
+
+
+class TavilyBatcher:
+    """Tavily 请求合并器。
+
+    调度循环在首次调用时于当前事件循环中启动；事件循环变化时重新启动。
+    """
+
+    def __init__(
+        self,
+        tool: TavilySearchTool,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_queue_time: float = DEFAULT_MAX_QUEUE_TIME,
+    ) -> None:
+        """初始化请求合并器。
+
+        Args:
+            tool: Tavily 搜索工具
+            max_batch_size: 单批最多合并的查询数
+            max_queue_time: 首个查询入队后最多等待的时间（秒）
+        """
+        self._tool = tool
+        self._max_batch_size = max_batch_size
+        self._max_queue_time = max_queue_time
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def search(
+        self,
+        query: str,
+        time_range: SearchTimeRange = SearchTimeRange.ONE_YEAR,
+        max_results: int = 10,
+    ) -> list[SearchResult]:
+        """提交查询并等待所在批次完成。
+
+        Args:
+            query: 搜索查询
+            time_range: 时间范围
+            max_results: 最大结果数
+
+        Returns:
+            搜索结果列表
+        """
+        queue = self._ensure_worker()
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await queue.put((query, time_range, max_results, future))
+        return await future
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        """确保当前事件循环中有调度循环在运行。"""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._loop is not loop or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._inflight = set()
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """调度循环：收集一批查询后交给后台任务处理，继续收集下一批。
+
+        收集窗口内被取消时，已收集但未发出的查询随之取消，调用方不会永久等待。
+        """
+        loop = asyncio.get_running_loop()
+        batch: list[tuple[Any, ...]] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self._max_queue_time
+
+                while len(batch) < self._max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                task = loop.create_task(self._process_batch(batch))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+                batch = []
+        except asyncio.CancelledError:
+            for *_, future in batch:
+                if not future.done():
+                    future.cancel()
+            raise
+
+    async def _process_batch(self, batch: list[tuple[Any, ...]]) -> None:
+        """在共享客户端上并发执行一批查询并回填结果。"""
+        logger.debug(f"Dispatching Tavily batch of {len(batch)} queries")
+        outcomes = await asyncio.gather(
+            *(
+                self._tool.asearch(query, time_range, max_results)
+                for query, time_range, max_results, _ in batch
+            ),
+            return_exceptions=True,
+        )
+
+        for (*_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    async def aclose(self) -> None:
+        """停止调度循环并等待已发出的批次完成。"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+        # 尚在队列中、未被收集的查询直接取消
+        if self._queue is not None:
+            while not self._queue.empty():
+                *_, future = self._queue.get_nowait()
+                if not future.done():
+                    future.cancel()
+            self._queue = None
@@ -1,13 +1,18 @@
 """Wikipedia 搜索源实现。
 
-使用 Wikipedia API 获取百科信息。
+直接调用 MediaWiki API 获取百科信息。
 """
 
 import logging
+import re
+from pathlib import Path
 from typing import Any
 
+import httpx
+
 logger = logging.getLogger(__name__)
 
+from src.search import http
 from src.search.base import (
     ProviderMetadata,
     SearchProviderType,
@@ -15,45 +20,62 @@ from src.search.base import (
     SearchTimeRange,
     SearchTool,
 )
+from src.search.cache import SearchCache
+from src.utils.imports import json_loads
+
+# [[link]] / [[target|text]] 维基链接标记，保留链接文本
+_WIKI_LINK_RE = re.compile(r"\[\[([^\]|]+\|)?([^\]]+)\]\]")
+# 连续空白
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 摘要最大长度
+SUMMARY_MAX_CHARS = 500
+
+# 请求超时（秒）
+REQUEST_TIMEOUT = 15.0
+
+# 百科内容变化缓慢，页面查询结果缓存 24 小时
+WIKIPEDIA_CACHE_TTL = 24 * 3600
 
 
 class WikipediaSearchTool(SearchTool):
     """Wikipedia 搜索工具。
 
-    使用 Wikipedia-API 获取百科信息，适合产品背景和概念解释。
-    比原生的 wikipedia 库更稳定可靠。
+    直接调用 MediaWiki API：以 generator=search 做全文搜索，并在同一请求中
+    取回各页面的导言摘要与链接，适合产品背景和概念解释。
     """
 
-    def __init__(self, lang: str = "zh") -> None:
+    USER_AGENT = "CompetitorSwarm/1.0 (https://github.com/competitor-swarm)"
+
+    def __init__(
+        self,
+        lang: str = "zh",
+        cache_enabled: bool = True,
+        cache_dir: str | Path = "data/cache/wikipedia",
+        cache_ttl: int = WIKIPEDIA_CACHE_TTL,
+        client: httpx.Client | None = None,
+    ) -> None:
         """初始化 Wikipedia 搜索工具。
 
         Args:
             lang: Wikipedia 语言版本（默认中文）
+            cache_enabled: 是否按 (语言, 查询) 在磁盘缓存清理后的结果
+            cache_dir: 缓存目录
+            cache_ttl: 缓存过期时间（秒）
+            client: 同步 HTTP 客户端，默认使用搜索源共享的客户端
         """
         self._lang = lang
-        self._client: Any = None
+        self._cache = (
+            SearchCache(cache_dir=cache_dir, default_ttl=cache_ttl, memory_max_entries=64)
+            if cache_enabled
+            else None
+        )
+        self._api_url = f"https://{lang}.wikipedia.org/w/api.php"
+        self._headers = {"User-Agent": self.USER_AGENT}
+        self._client = client or http.get_client()
         self._is_available = True
-        self._init_client()
-
-    def _init_client(self) -> None:
-        """初始化 Wikipedia 客户端。"""
-        try:
-            import wikipediaapi
-
-            self._client = wikipediaapi.Wikipedia(
-                language=self._lang,
-                extract_format=wikipediaapi.ExtractFormat.WIKI,
-                user_agent="CompetitorSwarm/1.0 (https://github.com/competitor-swarm)"
-            )
-            logger.info(f"Wikipedia search initialized (lang={self._lang}).")
-        except ImportError:
-            logger.warning(
-                "wikipedia-api not installed. Install with: pip install wikipedia-api"
-            )
-            self._is_available = False
-        except Exception as e:
-            logger.warning(f"Failed to initialize Wikipedia: {e}")
-            self._is_available = False
+        self._metadata: ProviderMetadata | None = None
+        logger.info(f"Wikipedia search initialized (lang={self._lang}).")
 
     def search(
         self,
@@ -73,54 +95,139 @@ class WikipediaSearchTool(SearchTool):
         Returns:
             搜索结果列表
         """
-        if not self._is_available or self._client is None:
+        if not self._is_available:
             return []
 
+        cached = self._get_cached(query, max_results)
+        if cached is not None:
+            return cached
+
         try:
-            # 使用 wikipedia-api 的搜索功能
-            # wikipedia-api 本身不直接提供搜索，需要使用其 page 方法
-            # 这里我们使用 pywiki 或直接尝试获取页面
-            # 为了保持简单，我们使用一个简单的搜索策略
+            response = self._client.get(
+                self._api_url,
+                params=self._build_params(query, max_results),
+                headers=self._headers,
+                timeout=REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+            results = self._parse_pages(json_loads(response.content), max_results)
+        except Exception as e:
+            logger.warning(f"Wikipedia search failed: {e}. Returning empty results.")
+            return []
+
+        return self._store_results(query, max_results, results)
 
-            # 尝试直接获取匹配的页面
-            results = []
+    async def asearch(
+        self,
+        query: str,
+        time_range: SearchTimeRange = SearchTimeRange.ONE_YEAR,
+        max_results: int = 10,
+    ) -> list[SearchResult]:
+        """异步执行搜索，便于与其他搜索源在同一事件循环内并发。
 
-            # 首先尝试精确匹配
-            page = self._client.page(query)
-            if page.exists():
-                results.append(self._create_result_from_page(page))
+        Args:
+            query: 搜索查询
+            time_range: 时间范围（忽略）
+            max_results: 最大结果数
 
-            # 如果需要更多结果，尝试一些变体
-            if len(results) < max_results:
-                # 尝试一些常见的搜索变体
-                # 注意：wikipedia-api 不提供搜索 API，所以这里使用简单策略
-                # 实际使用中可以考虑添加 wikipedia 库作为搜索依赖
-                pass
+        Returns:
+            搜索结果列表
+        """
+        if not self._is_available:
+            return []
 
-            return results[:max_results]
+        cached = self._get_cached(query, max_results)
+        if cached is not None:
+            return cached
 
+        try:
+            response = await http.get_async_client().get(
+                self._api_url,
+                params=self._build_params(query, max_results),
+                headers=self._headers,
+                timeout=REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+            results = self._parse_pages(json_loads(response.content), max_results)
         except Exception as e:
             logger.warning(f"Wikipedia search failed: {e}. Returning empty results.")
             return []
 
-    def _create_result_from_page(self, page: Any) -> SearchResult:
-        """从 Wikipedia 页面对象创建搜索结果。
+        return self._store_results(query, max_results, results)
+
+    def _cache_query(self, query: str) -> str:
+        """缓存使用的查询键：语言版本 + 小写查询。"""
+        return f"{self._lang}:{query.lower()}"
+
+    def _get_cached(self, query: str, max_results: int) -> list[SearchResult] | None:
+        """读取缓存的页面结果（摘要已清理，无需再次请求和处理）。"""
+        if self._cache is None:
+            return None
+        return self._cache.get(self._cache_query(query), max_results=max_results)
+
+    def _store_results(
+        self,
+        query: str,
+        max_results: int,
+        results: list[SearchResult],
+    ) -> list[SearchResult]:
+        """写入缓存并原样返回结果；空结果不缓存，便于新条目创建后尽快可见。"""
+        if self._cache is not None and results:
+            self._cache.set(self._cache_query(query), results, max_results=max_results)
+        return results
+
+    @staticmethod
+    def _build_params(query: str, max_results: int) -> dict[str, Any]:
+        """构建 MediaWiki API 参数：一次请求完成搜索并取回摘要与链接。"""
+        limit = max(1, min(max_results, 20))  # 导言摘要每次最多返回 20 页
+        return {
+            "action": "query",
+            "format": "json",
+            "formatversion": 2,
+            "generator": "search",
+            "gsrsearch": query,
+            "gsrlimit": limit,
+            "prop": "extracts|info",
+            "exintro": 1,
+            "explaintext": 1,
+            "exlimit": limit,
+            "inprop": "url",
+        }
+
+    def _parse_pages(self, data: dict[str, Any], max_results: int) -> list[SearchResult]:
+        """解析 API 响应，按搜索排名输出结果。
+
+        Args:
+            data: API 响应数据
+            max_results: 最大结果数
+
+        Returns:
+            搜索结果列表
+        """
+        pages = data.get("query", {}).get("pages", [])
+        ranked = sorted(pages, key=lambda p: p.get("index", 0))
+
+        return [self._create_result_from_page(page) for page in ranked[:max_results]]
+
+    def _create_result_from_page(self, page: dict[str, Any]) -> SearchResult:
+        """从 API 返回的页面数据创建搜索结果。
 
         Args:
-            page: Wikipedia 页面对象
+            page: 页面数据
 
         Returns:
             搜索结果
         """
         # 获取摘要（前 500 个字符）
-        summary = page.summary[:500] if page.summary else ""
+        summary = (page.get("extract") or "")[:SUMMARY_MAX_CHARS]
 
         # 清理摘要中的维基链接标记
         summary = self._clean_summary(summary)
 
+        title = page.get("title", "")
         return SearchResult(
-            url=page.fullurl,
-            title=page.title,
+            url=page.get("fullurl") or f"https://{self._lang}.wikipedia.org/wiki/{title}",
+            title=title,
             summary=summary,
             site_name="wikipedia.org",
             published_date=None,
@@ -141,29 +248,29 @@ class WikipediaSearchTool(SearchTool):
         Returns:
             清理后的摘要
         """
-        # 移除维基链接 [[...]] 格式
-        import re
-
         # 移除 [[link]] 格式，保留链接文本
-        summary = re.sub(r"\[\[([^\]|]+\|)?([^\]]+)\]\]", r"\2", summary)
+        summary = _WIKI_LINK_RE.sub(r"\2", summary)
 
         # 移除多余的空格
-        summary = re.sub(r"\s+", " ", summary).strip()
+        summary = _WHITESPACE_RE.sub(" ", summary).strip()
 
         return summary
 
     @property
     def metadata(self) -> ProviderMetadata:
-        """获取搜索源元数据。"""
-        return ProviderMetadata(
-            provider_type=SearchProviderType.WIKIPEDIA,
-            is_available=self._is_available,
-            rate_limit=None,
-            daily_quota=0,  # 无限制
-            supports_time_range=False,
-            priority=20,
-            description="Wikipedia - 免费百科全书",
-        )
+        """获取搜索源元数据（复用同一实例，可用性变化时才重建）。"""
+        metadata = self._metadata
+        if metadata is None or metadata.is_available != self._is_available:
+            metadata = self._metadata = ProviderMetadata(
+                provider_type=SearchProviderType.WIKIPEDIA,
+                is_available=self._is_available,
+                rate_limit=None,
+                daily_quota=0,  # 无限制
+                supports_time_range=False,
+                priority=20,
+                description="Wikipedia - 免费百科全书",
+            )
+        return metadata
 
     def check_health(self) -> bool:
         """检查搜索源是否可用。
@@ -175,8 +282,14 @@ class WikipediaSearchTool(SearchTool):
             return False
 
         try:
-            # 简单测试搜索 - 尝试获取一个已知存在的页面
-            page = self._client.page("Python")
-            return page.exists()
+            # 简单测试搜索 - 搜索一个已知存在的页面
+            response = self._client.get(
+                self._api_url,
+                params=self._build_params("Python", 1),
+                headers=self._headers,
+                timeout=REQUEST_TIMEOUT,
+            )
+            response.raise_for_status()
+            return bool(json_loads(response.content).get("query", {}).get("pages"))
         except Exception:
             return False
@@ -1,24 +1,65 @@
 """搜索配额和速率限制管理。
 
 跟踪每日配额使用，实现速率限制检查。
+
+每日配额保存在 SQLite（WAL 模式）中，每次消耗只更新一行；
+检查与消耗合并为一条条件 UPSERT，跨线程、跨进程都是原子的。
+设置 flush_interval 后改为写合并模式：消耗只在内存中计数，由后台线程
+定期批量写入，热路径不再触碰磁盘（代价是多进程共享配额时可能短暂超额）。
+速率限制窗口只在进程内生效，保存在内存中。
 """
 
-import json
+import atexit
 import logging
+import sqlite3
 import threading
 import time
-from collections import defaultdict
-from dataclasses import dataclass, field
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Iterator
 
 logger = logging.getLogger(__name__)
 
 from src.search.base import SearchProviderType
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota (
+    provider TEXT PRIMARY KEY,
+    daily_used INTEGER NOT NULL DEFAULT 0,
+    daily_limit INTEGER,
+    rate_limit INTEGER,
+    last_reset TEXT
+)
+"""
+
+# 当日已用量：last_reset 不是今天时视为 0（跨日自动重置，无需单独写入）
+_USED_TODAY = "CASE WHEN last_reset = :today THEN daily_used ELSE 0 END"
+
+# 累加用量（写合并模式下批量写入，不做限制检查）
+_ADD_SQL = f"""
+INSERT INTO quota (provider, daily_used, last_reset) VALUES (:provider, :cost, :today)
+ON CONFLICT (provider) DO UPDATE SET
+    daily_used = {_USED_TODAY} + :cost,
+    last_reset = :today
+"""
+
+# 检查并消耗：超出每日限制时 WHERE 不成立，rowcount 为 0
+_CONSUME_SQL = _ADD_SQL + f"WHERE daily_limit IS NULL OR {_USED_TODAY} + :cost <= daily_limit\n"
+
+
+# 默认配额数据库位置
+DEFAULT_QUOTA_FILE = Path("data/cache/quota.sqlite")
 
-@dataclass(frozen=True)
+
+def _today() -> str:
+    """当前日期（配额按本地日期重置）。"""
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+@dataclass(frozen=True, slots=True)
 class QuotaStatus:
     """配额状态数据类。"""
 
@@ -31,14 +72,6 @@ class QuotaStatus:
     reset_time: str | None  # 配额重置时间
 
 
-@dataclass
-class RateLimitWindow:
-    """速率限制时间窗口。"""
-
-    count: int = 0
-    window_start: float = field(default_factory=time.time)
-
-
 class QuotaManager:
     """配额管理器。
 
@@ -50,39 +83,86 @@ class QuotaManager:
 
     def __init__(
         self,
-        quota_file: str | Path = "data/cache/quota.json",
+        quota_file: str | Path | None = None,
+        flush_interval: float = 0.0,
     ) -> None:
         """初始化配额管理器。
 
         Args:
-            quota_file: 配额数据存储文件
+            quota_file: 配额数据库文件，默认 DEFAULT_QUOTA_FILE
+            flush_interval: 写合并间隔（秒），0 表示每次消耗立即写入数据库
         """
-        self._quota_file = Path(quota_file)
+        self._quota_file = Path(quota_file) if quota_file is not None else DEFAULT_QUOTA_FILE
+        # 全局锁只保护批量落盘；热路径只持有对应搜索源的锁，
+        # 不同搜索源的配额检查可以并行
         self._lock = threading.RLock()
+        self._provider_locks: dict[SearchProviderType, threading.Lock] = defaultdict(
+            threading.Lock
+        )
 
-        # 每日配额使用记录
-        self._daily_usage: dict[SearchProviderType, int] = defaultdict(int)
+        # 所有线程共用一个连接，由连接锁串行访问（每条语句都很短）；
+        # 调用方常为每批搜索新建线程池，按线程建连接会随线程数无限增长
+        self._db_lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
 
-        # 每日配额限制
-        self._daily_limits: dict[SearchProviderType, int | None] = {}
+        # 配置过或使用过的搜索源，只在配置和首次消耗时更新
+        self._known_providers: set[SearchProviderType] = set()
 
-        # 速率限制
+        # 速率限制（同时持久化，进程内缓存一份供热路径使用）
         self._rate_limits: dict[SearchProviderType, int | None] = {}
 
-        # 速率限制时间窗口
-        self._rate_windows: dict[SearchProviderType, RateLimitWindow] = defaultdict(
-            lambda: RateLimitWindow()
-        )
+        # 速率限制滑动窗口：窗口内每次消耗的时间戳（单调时钟）
+        self._rate_windows: dict[SearchProviderType, deque[float]] = defaultdict(deque)
 
-        # 最后重置日期
-        self._last_reset_date: str | None = None
+        # 写合并模式：未落盘的用量与已知的 (当日用量, 每日限制)
+        self._flush_interval = flush_interval
+        self._pending: dict[SearchProviderType, int] = {}
+        self._pending_date = _today()
+        self._daily_cache: dict[SearchProviderType, tuple[int, int | None]] = {}
+        self._stop_flusher = threading.Event()
+        self._flusher: threading.Thread | None = None
 
         # 创建缓存目录
         self._quota_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # 加载保存的配额数据
+        # 建表并加载保存的速率限制
         self._load()
 
+        if flush_interval > 0:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="quota-flusher", daemon=True
+            )
+            self._flusher.start()
+            # 进程退出前写入剩余用量
+            atexit.register(self.flush)
+
+    @contextmanager
+    def _db(self) -> Iterator[sqlite3.Connection]:
+        """持有连接锁，获取共享的数据库连接（自动提交模式，首次使用时打开）。"""
+        with self._db_lock:
+            conn = self._connection
+            if conn is None:
+                conn = sqlite3.connect(
+                    self._quota_file, isolation_level=None, check_same_thread=False
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                self._connection = conn
+            yield conn
+
+    def close(self) -> None:
+        """写入未落盘的用量并关闭数据库连接。"""
+        if self._flusher is not None:
+            self._stop_flusher.set()
+            self._flusher.join()
+            self._flusher = None
+            atexit.unregister(self.flush)
+        self.flush()
+        with self._db_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
     def configure_provider(
         self,
         provider_type: SearchProviderType,
@@ -96,9 +176,21 @@ class QuotaManager:
             daily_limit: 每日配额限制，None 表示无限制
             rate_limit: 每分钟速率限制，None 表示无限制
         """
-        with self._lock:
-            self._daily_limits[provider_type] = daily_limit
+        self._known_providers.add(provider_type)
+        with self._provider_locks[provider_type]:
             self._rate_limits[provider_type] = rate_limit
+            self._daily_cache.pop(provider_type, None)
+
+        try:
+            with self._db() as conn:
+                conn.execute(
+                    "INSERT INTO quota (provider, daily_limit, rate_limit) VALUES (?, ?, ?) "
+                    "ON CONFLICT (provider) DO UPDATE SET "
+                    "daily_limit = excluded.daily_limit, rate_limit = excluded.rate_limit",
+                    (provider_type.value, daily_limit, rate_limit),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to save quota limits: {e}")
 
     def check_and_consume(
         self,
@@ -114,46 +206,135 @@ class QuotaManager:
         Returns:
             True 表示配额充足，False 表示已达限制
         """
-        with self._lock:
-            # 检查是否需要重置每日配额
-            self._check_daily_reset()
+        # 先在内存中检查并预占速率窗口，数据库写入不持有锁
+        provider_lock = self._provider_locks[provider_type]
+        rate_limit = self._rate_limits.get(provider_type)
+        if rate_limit is not None:
+            with provider_lock:
+                window = self._rate_windows[provider_type]
+                now = time.monotonic()
+                self._trim_window(window, now)
 
-            # 检查每日配额
-            daily_limit = self._daily_limits.get(provider_type)
-            if daily_limit is not None:
-                if self._daily_usage[provider_type] + cost > daily_limit:
+                if len(window) + cost > rate_limit:
                     print(
-                        f"Warning: Daily quota exceeded for {provider_type.value} "
-                        f"({self._daily_usage[provider_type]}/{daily_limit})"
+                        f"Warning: Rate limit exceeded for {provider_type.value} "
+                        f"({len(window)}/{rate_limit} per {self.WINDOW_SIZE}s)"
                     )
                     return False
 
-            # 检查速率限制
-            rate_limit = self._rate_limits.get(provider_type)
+                window.extend([now] * cost)
+
+        if self._flush_interval > 0:
+            consumed = self._consume_pending(provider_type, cost)
+        else:
+            consumed = self._consume_now(provider_type, cost)
+
+        if not consumed:
             if rate_limit is not None:
-                window = self._rate_windows[provider_type]
-                current_time = time.time()
+                with provider_lock:
+                    # 释放预占的时间戳（窗口内最新的 cost 个）
+                    window = self._rate_windows[provider_type]
+                    for _ in range(min(cost, len(window))):
+                        window.pop()
+            status = self.get_status(provider_type)
+            print(
+                f"Warning: Daily quota exceeded for {provider_type.value} "
+                f"({status.daily_used}/{status.daily_limit})"
+            )
+        elif provider_type not in self._known_providers:
+            self._known_providers.add(provider_type)
 
-                # 检查是否需要重置时间窗口
-                if current_time - window.window_start > self.WINDOW_SIZE:
-                    window.count = 0
-                    window.window_start = current_time
+        return consumed
 
-                if window.count + cost > rate_limit:
-                    print(
-                        f"Warning: Rate limit exceeded for {provider_type.value} "
-                        f"({window.count}/{rate_limit} per {self.WINDOW_SIZE}s)"
+    def _consume_now(self, provider_type: SearchProviderType, cost: int) -> bool:
+        """检查并消耗每日配额（单条语句，原子操作）。"""
+        try:
+            with self._db() as conn:
+                consumed = conn.execute(
+                    _CONSUME_SQL,
+                    {"provider": provider_type.value, "cost": cost, "today": _today()},
+                ).rowcount > 0
+        except sqlite3.Error as e:
+            # 配额存储故障不应阻断搜索
+            logger.warning(f"Failed to update quota: {e}")
+            consumed = True
+        return consumed
+
+    def _consume_pending(self, provider_type: SearchProviderType, cost: int) -> bool:
+        """在内存中检查并记录每日配额消耗，由后台线程批量写入。"""
+        today = _today()
+        if today != self._pending_date:
+            # 跨日前的用量先按原日期写入
+            self.flush()
+
+        with self._provider_locks[provider_type]:
+            known = self._daily_cache.get(provider_type)
+            if known is None:
+                known = self._daily_cache[provider_type] = self._read_daily(provider_type, today)
+            used, daily_limit = known
+            pending = self._pending.get(provider_type, 0)
+
+            if daily_limit is not None and used + pending + cost > daily_limit:
+                return False
+
+            self._pending[provider_type] = pending + cost
+            return True
+
+    def flush(self) -> None:
+        """把写合并模式下未落盘的用量写入数据库。"""
+        with self._lock:
+            pending_date, self._pending_date = self._pending_date, _today()
+            if pending_date != self._pending_date:
+                self._daily_cache.clear()
+
+            # 逐个搜索源取出待写用量，同时计入已知用量，取出后到重新读取前不会低估
+            pending: dict[SearchProviderType, int] = {}
+            for provider_type in list(self._pending):
+                with self._provider_locks[provider_type]:
+                    cost = self._pending.pop(provider_type, 0)
+                    known = self._daily_cache.get(provider_type)
+                    if known is not None:
+                        self._daily_cache[provider_type] = (known[0] + cost, known[1])
+                if cost:
+                    pending[provider_type] = cost
+            if not pending:
+                return
+
+            try:
+                with self._db() as conn, conn:
+                    conn.execute("BEGIN")
+                    conn.executemany(
+                        _ADD_SQL,
+                        [
+                            {"provider": p.value, "cost": cost, "today": pending_date}
+                            for p, cost in pending.items()
+                        ],
                     )
-                    return False
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to flush quota usage: {e}")
 
-            # 消耗配额
-            self._daily_usage[provider_type] += cost
-            self._rate_windows[provider_type].count += cost
+            # 重新读取，合并其他进程写入的用量
+            for provider_type in pending:
+                with self._provider_locks[provider_type]:
+                    self._daily_cache.pop(provider_type, None)
 
-            # 保存状态
-            self._save()
+    def _flush_loop(self) -> None:
+        """后台定期写入合并后的用量。"""
+        while not self._stop_flusher.wait(self._flush_interval):
+            self.flush()
 
-            return True
+    def _read_daily(self, provider_type: SearchProviderType, today: str) -> tuple[int, int | None]:
+        """读取数据库中的 (当日用量, 每日限制)。"""
+        try:
+            with self._db() as conn:
+                row = conn.execute(
+                    f"SELECT {_USED_TODAY}, daily_limit FROM quota WHERE provider = :provider",
+                    {"provider": provider_type.value, "today": today},
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read quota: {e}")
+            row = None
+        return row if row is not None else (0, None)
 
     def get_status(self, provider_type: SearchProviderType) -> QuotaStatus:
         """获取搜索源的配额状态。
@@ -164,43 +345,38 @@ class QuotaManager:
         Returns:
             配额状态
         """
-        with self._lock:
-            self._check_daily_reset()
-
-            daily_limit = self._daily_limits.get(provider_type)
-            daily_used = self._daily_usage.get(provider_type, 0)
-
-            # 计算剩余配额
-            if daily_limit is None:
-                daily_remaining = None
-            else:
-                daily_remaining = max(0, daily_limit - daily_used)
-
-            # 计算重置时间
-            reset_time = None
-            if self._last_reset_date:
-                try:
-                    reset_date = datetime.strptime(
-                        self._last_reset_date, "%Y-%m-%d"
-                    ) + timedelta(days=1)
-                    reset_time = reset_date.isoformat()
-                except Exception:
-                    pass
-
-            # 获取当前窗口使用量
+        # 写合并模式下先落盘，状态与数据库一致
+        self.flush()
+
+        today = _today()
+        daily_used, daily_limit = self._read_daily(provider_type, today)
+
+        # 计算剩余配额
+        if daily_limit is None:
+            daily_remaining = None
+        else:
+            daily_remaining = max(0, daily_limit - daily_used)
+
+        # 计算重置时间
+        reset_time = (datetime.strptime(today, "%Y-%m-%d") + timedelta(days=1)).isoformat()
+
+        # 获取当前窗口使用量
+        with self._provider_locks[provider_type]:
             rate_limit = self._rate_limits.get(provider_type)
             window = self._rate_windows.get(provider_type)
-            rate_window_used = window.count if window else 0
-
-            return QuotaStatus(
-                provider_type=provider_type,
-                daily_limit=daily_limit,
-                daily_used=daily_used,
-                daily_remaining=daily_remaining,
-                rate_limit=rate_limit,
-                rate_window_used=rate_window_used,
-                reset_time=reset_time,
-            )
+            if window:
+                self._trim_window(window, time.monotonic())
+            rate_window_used = len(window) if window else 0
+
+        return QuotaStatus(
+            provider_type=provider_type,
+            daily_limit=daily_limit,
+            daily_used=daily_used,
+            daily_remaining=daily_remaining,
+            rate_limit=rate_limit,
+            rate_window_used=rate_window_used,
+            reset_time=reset_time,
+        )
 
     def reset_daily(self, provider_type: SearchProviderType | None = None) -> None:
         """重置每日配额。
@@ -208,13 +384,22 @@ class QuotaManager:
         Args:
             provider_type: 搜索源类型，None 表示重置所有
         """
-        with self._lock:
-            if provider_type is None:
-                self._daily_usage.clear()
-            else:
-                self._daily_usage[provider_type] = 0
+        self.flush()
 
-            self._save()
+        try:
+            with self._db() as conn:
+                if provider_type is None:
+                    conn.execute("UPDATE quota SET daily_used = 0")
+                else:
+                    conn.execute(
+                        "UPDATE quota SET daily_used = 0 WHERE provider = ?",
+                        (provider_type.value,),
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to reset quota: {e}")
+
+        with self._lock:
+            self._daily_cache.clear()
 
     def reset_rate_window(self, provider_type: SearchProviderType | None = None) -> None:
         """重置速率限制窗口。
@@ -222,90 +407,36 @@ class QuotaManager:
         Args:
             provider_type: 搜索源类型，None 表示重置所有
         """
-        with self._lock:
-            if provider_type is None:
-                self._rate_windows.clear()
-            else:
-                self._rate_windows[provider_type] = RateLimitWindow()
-
-            self._save()
-
-    def _check_daily_reset(self) -> None:
-        """检查是否需要重置每日配额。"""
-        current_date = datetime.now().strftime("%Y-%m-%d")
-
-        if self._last_reset_date != current_date:
-            # 新的一天，重置每日配额
-            self._daily_usage.clear()
-            self._last_reset_date = current_date
-
-            # 重置速率窗口
-            for window in self._rate_windows.values():
-                window.count = 0
-                window.window_start = time.time()
-
-            self._save()
-
-    def _save(self) -> None:
-        """保存配额数据到文件。"""
-        try:
-            data = {
-                "last_reset_date": self._last_reset_date,
-                "daily_usage": {
-                    k.value: v for k, v in self._daily_usage.items()
-                },
-                "daily_limits": {
-                    k.value: v for k, v in self._daily_limits.items()
-                    if v is not None
-                },
-                "rate_limits": {
-                    k.value: v for k, v in self._rate_limits.items()
-                    if v is not None
-                },
-            }
-
-            with open(self._quota_file, "w") as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            logger.warning(f"Failed to save quota data: {e}")
+        if provider_type is None:
+            self._rate_windows.clear()
+        else:
+            with self._provider_locks[provider_type]:
+                self._rate_windows.pop(provider_type, None)
+
+    def _trim_window(self, window: deque[float], now: float) -> None:
+        """移除滑动窗口之外的时间戳。"""
+        cutoff = now - self.WINDOW_SIZE
+        while window and window[0] <= cutoff:
+            window.popleft()
 
     def _load(self) -> None:
-        """从文件加载配额数据。"""
-        if not self._quota_file.exists():
-            return
-
+        """创建数据表，加载已知搜索源及保存的速率限制。"""
         try:
-            with open(self._quota_file, "r") as f:
-                data = json.load(f)
-
-            self._last_reset_date = data.get("last_reset_date")
-
-            # 加载每日使用量
-            for provider_str, usage in data.get("daily_usage", {}).items():
-                try:
-                    provider = SearchProviderType(provider_str)
-                    self._daily_usage[provider] = usage
-                except ValueError:
-                    pass
-
-            # 加载每日限制
-            for provider_str, limit in data.get("daily_limits", {}).items():
-                try:
-                    provider = SearchProviderType(provider_str)
-                    self._daily_limits[provider] = limit
-                except ValueError:
-                    pass
-
-            # 加载速率限制
-            for provider_str, limit in data.get("rate_limits", {}).items():
-                try:
-                    provider = SearchProviderType(provider_str)
-                    self._rate_limits[provider] = limit
-                except ValueError:
-                    pass
-
-        except Exception as e:
+            with self._db() as conn:
+                conn.execute(_SCHEMA)
+                rows = conn.execute("SELECT provider, rate_limit FROM quota").fetchall()
+        except sqlite3.Error as e:
             logger.warning(f"Failed to load quota data: {e}")
+            return
+
+        for provider_str, limit in rows:
+            try:
+                provider_type = SearchProviderType(provider_str)
+            except ValueError:
+                continue
+            self._known_providers.add(provider_type)
+            if limit is not None:
+                self._rate_limits[provider_type] = limit
 
     def get_all_status(self) -> dict[SearchProviderType, QuotaStatus]:
         """获取所有搜索源的配额状态。
@@ -313,16 +444,5 @@ class QuotaManager:
         Returns:
             搜索源到配额状态的映射
         """
-        with self._lock:
-            self._check_daily_reset()
-
-            result = {}
-            # 包含所有配置过的搜索源
-            for provider in set(
-                list(self._daily_limits.keys())
-                + list(self._rate_limits.keys())
-                + list(self._daily_usage.keys())
-            ):
-                result[provider] = self.get_status(provider)
-
-            return result
+        # 包含所有配置过或使用过的搜索源（复制一份，避免遍历时被热路径修改）
+        return {provider: self.get_status(provider) for provider in tuple(self._known_providers)}
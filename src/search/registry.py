@@ -5,6 +5,7 @@
 
 import logging
 import threading
+from collections import defaultdict
 from typing import Callable, Type
 
 logger = logging.getLogger(__name__)
@@ -16,6 +17,9 @@ class SearchProviderRegistry:
     """搜索源注册表。
 
     单例模式，管理所有搜索源的注册和获取。
+
+    读多写少：get_provider 的命中路径只做一次字典读取，不加锁；
+    只有首次创建单例时才持有对应搜索源的锁，不同搜索源可并行初始化。
     """
 
     _instance: "SearchProviderRegistry | None" = None
@@ -29,6 +33,9 @@ class SearchProviderRegistry:
                     cls._instance = super().__new__(cls)
                     cls._instance._providers: dict[SearchProviderType, Callable[[], SearchTool]] = {}
                     cls._instance._singletons: dict[SearchProviderType, SearchTool] = {}
+                    cls._instance._factory_locks: dict[SearchProviderType, threading.Lock] = (
+                        defaultdict(threading.Lock)
+                    )
         return cls._instance
 
     def register(
@@ -67,25 +74,39 @@ class SearchProviderRegistry:
         Returns:
             搜索源实例，不存在时返回 None
         """
+        if not force_new:
+            # 快速路径：单次字典读取，无锁
+            instance = self._singletons.get(provider_type)
+            if instance is not None:
+                return instance
+
         factory = self._providers.get(provider_type)
         if factory is None:
             return None
 
-        # 返回单例或创建新实例（加锁避免并发重复初始化）
-        if not force_new and provider_type in self._singletons:
-            return self._singletons[provider_type]
+        if force_new:
+            return self._create(provider_type, factory)
 
-        with self._lock:
-            if not force_new and provider_type in self._singletons:
-                return self._singletons[provider_type]
-            try:
-                instance = factory() if callable(factory) else factory
-                if not force_new:
+        # 首次创建：只锁当前搜索源，双重检查避免并发重复初始化
+        with self._factory_locks[provider_type]:
+            instance = self._singletons.get(provider_type)
+            if instance is None:
+                instance = self._create(provider_type, factory)
+                if instance is not None:
                     self._singletons[provider_type] = instance
-                return instance
-            except Exception as e:
-                logger.warning(f"Failed to create provider {provider_type}: {e}")
-                return None
+            return instance
+
+    @staticmethod
+    def _create(
+        provider_type: SearchProviderType,
+        factory: Callable[[], SearchTool] | SearchTool,
+    ) -> SearchTool | None:
+        """调用工厂创建搜索源实例，失败时返回 None。"""
+        try:
+            return factory() if callable(factory) else factory
+        except Exception as e:
+            logger.warning(f"Failed to create provider {provider_type}: {e}")
+            return None
 
     def list_available(self) -> list[SearchProviderType]:
         """列出所有已注册的搜索源类型。
@@ -102,7 +123,7 @@ class SearchProviderRegistry:
             搜索源类型到健康状态的映射
         """
         result = {}
-        for provider_type in self._providers:
+        for provider_type in tuple(self._providers):
             provider = self.get_provider(provider_type)
             if provider:
                 result[provider_type] = provider.check_health()
@@ -0,0 +1,174 @@
+"""查询近似匹配缓存。
+
+同一轮调研中 Agent 常以措辞略有不同的查询重复搜索（"X pricing"、
+"pricing of X"）。本缓存把查询归一化为关键词集合，默认仅在关键词集合
+完全相同（只差词序、大小写或虚词）时复用已有结果，省去远程调用。
+
+按 Jaccard 相似度的模糊匹配需显式开启；即便开启，一方关键词集合严格
+包含另一方时也不命中——多出的关键词往往是另一个实体（"X AI"、
+"Teams Premium"、年份），复用会把别的产品的结果串给当前查询。
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.search.base import SearchProviderType, SearchResult, SearchTimeRange
+
+# 查询关键词：英文/数字串与连续中文
+_TOKEN_RE = re.compile(r"[a-z0-9\u4e00-\u9fff]+")
+
+# 不影响查询语义的虚词
+_QUERY_STOP_WORDS = frozenset({
+    "a", "an", "and", "for", "in", "of", "on", "or", "the", "to", "vs", "with",
+    "的", "和", "与",
+})
+
+
+def query_keywords(query: str) -> frozenset[str]:
+    """提取查询的关键词集合（小写、去虚词、与词序无关）。"""
+    return frozenset(
+        token for token in _TOKEN_RE.findall(query.lower())
+        if token not in _QUERY_STOP_WORDS
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _SemanticEntry:
+    """缓存条目。"""
+
+    keywords: frozenset[str]
+    time_range: SearchTimeRange
+    max_results: int
+    results: tuple[SearchResult, ...]
+    cached_at: float
+
+
+class SemanticSearchCache:
+    """查询近似匹配缓存。
+
+    按搜索源分命名空间，避免不同来源的结果互相串用；每个命名空间按 LRU 淘汰。
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float | None = None,
+        ttl: int = 3600,
+        max_entries: int = 512,
+    ) -> None:
+        """初始化缓存。
+
+        Args:
+            similarity_threshold: 关键词集合 Jaccard 相似度阈值，达到即视为同一查询；
+                None（默认）表示只接受关键词集合完全相同的查询
+            ttl: 缓存过期时间（秒）
+            max_entries: 每个命名空间最多保留的条目数
+        """
+        self._threshold = similarity_threshold
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: dict[
+            SearchProviderType, OrderedDict[tuple[frozenset[str], SearchTimeRange], _SemanticEntry]
+        ] = {}
+
+    def get(
+        self,
+        provider: SearchProviderType,
+        query: str,
+        time_range: SearchTimeRange,
+        max_results: int,
+    ) -> list[SearchResult] | None:
+        """查找近似查询的缓存结果。
+
+        Args:
+            provider: 搜索源类型
+            query: 搜索查询
+            time_range: 时间范围
+            max_results: 最大结果数
+
+        Returns:
+            缓存结果（截断到 max_results），未命中时返回 None
+        """
+        keywords = query_keywords(query)
+        if not keywords:
+            return None
+
+        now = time.time()
+        with self._lock:
+            namespace = self._entries.get(provider)
+            if not namespace:
+                return None
+
+            # 关键词集合完全相同时直接命中，无需扫描
+            key = (keywords, time_range)
+            entry = namespace.get(key)
+            if entry is not None and not self._usable(entry, max_results, now):
+                entry = None
+            if entry is None and self._threshold is not None:
+                best_score = self._threshold
+                for candidate in namespace.values():
+                    if candidate.time_range is not time_range:
+                        continue
+                    if not self._usable(candidate, max_results, now):
+                        continue
+                    # 一方严格包含另一方：多出的关键词通常是另一个实体，不视为同一查询
+                    if keywords < candidate.keywords or keywords > candidate.keywords:
+                        continue
+                    score = len(keywords & candidate.keywords) / len(keywords | candidate.keywords)
+                    if score >= best_score:
+                        entry, best_score = candidate, score
+
+            if entry is None:
+                return None
+
+            namespace.move_to_end((entry.keywords, entry.time_range))
+            return list(entry.results[:max_results])
+
+    def set(
+        self,
+        provider: SearchProviderType,
+        query: str,
+        time_range: SearchTimeRange,
+        max_results: int,
+        results: list[SearchResult],
+    ) -> None:
+        """写入缓存。
+
+        Args:
+            provider: 搜索源类型
+            query: 搜索查询
+            time_range: 时间范围
+            max_results: 请求的最大结果数
+            results: 搜索结果
+        """
+        keywords = query_keywords(query)
+        if not keywords or not results:
+            return
+
+        entry = _SemanticEntry(
+            keywords=keywords,
+            time_range=time_range,
+            max_results=max_results,
+            results=tuple(results),
+            cached_at=time.time(),
+        )
+        key = (keywords, time_range)
+
+        with self._lock:
+            namespace = self._entries.setdefault(provider, OrderedDict())
+            namespace[key] = entry
+            namespace.move_to_end(key)
+            while len(namespace) > self._max_entries:
+                namespace.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存。"""
+        with self._lock:
+            self._entries.clear()
+
+    def _usable(self, entry: _SemanticEntry, max_results: int, now: float) -> bool:
+        """条目未过期，且当初请求的结果数足以覆盖本次请求。"""
+        return now - entry.cached_at <= self._ttl and entry.max_results >= max_results
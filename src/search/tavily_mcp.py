@@ -3,14 +3,18 @@
 使用 Tavily 的 Remote MCP 服务器进行搜索。
 """
 
+import asyncio
 import logging
+import math
 import os
-from typing import Any
+import time
+from typing import Any, Iterable
 
 import httpx
 
 logger = logging.getLogger(__name__)
 
+from src.search import http
 from src.search.base import (
     ProviderMetadata,
     SearchProviderType,
@@ -18,6 +22,52 @@ from src.search.base import (
     SearchTimeRange,
     SearchTool,
 )
+from src.search.cache import TTLCache
+from src.search.providers._util import dedupe_results, extract_site_name, item_content
+from src.utils.imports import json_dumps_bytes, json_loads
+
+# 时间范围 → Tavily days 参数
+_DAYS_BY_TIME_RANGE: dict[SearchTimeRange, int | None] = {
+    SearchTimeRange.ONE_DAY: 1,
+    SearchTimeRange.ONE_WEEK: 7,
+    SearchTimeRange.ONE_MONTH: 30,
+    SearchTimeRange.ONE_YEAR: 365,
+    SearchTimeRange.NO_LIMIT: None,
+}
+
+# 每次请求都相同的 API 参数
+_BASE_PARAMS: dict[str, Any] = {
+    "search_depth": "advanced",
+    "include_answer": False,
+    "include_raw_content": False,
+    "include_images": False,
+}
+
+# 请求体已预先编码为 JSON 字节串，需显式声明内容类型
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# 可重试的状态码（限流与网关错误）、最大尝试次数与指数退避基数（秒）
+TAVILY_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+TAVILY_MAX_ATTEMPTS = 3
+TAVILY_RETRY_BACKOFF = 0.2
+
+# 请求未发出的连接错误可安全重试
+_RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+# 混合搜索异步路径中等待 Tavily 的超时（秒），超时后降级
+HYBRID_TAVILY_TIMEOUT = 30.0
+
+# 混合搜索的进程内结果缓存：容量与过期时间（秒）
+HYBRID_CACHE_SIZE = 512
+HYBRID_CACHE_TTL = 60.0
+
+# Tavily 失败后使用降级搜索的冷却时间（秒），之后重新尝试 Tavily
+HYBRID_FALLBACK_COOLDOWN = 30.0
+
+
+def _retry_delay(attempt: int) -> float:
+    """第 attempt 次（从 0 开始）失败后的退避时间（秒）。"""
+    return TAVILY_RETRY_BACKOFF * 2 ** attempt
 
 
 class TavilyMCPTool(SearchTool):
@@ -38,13 +88,14 @@ class TavilyMCPTool(SearchTool):
         """
         self._api_key = api_key or os.getenv("TAVILY_API_KEY")
         self._is_available = bool(self._api_key)
+        self._metadata: ProviderMetadata | None = None
 
         if not self._is_available:
             logger.warning("TAVILY_API_KEY not configured. Tavily search will be disabled.")
         else:
             logger.info("Using Tavily API (MCP-compatible)")
 
-        self._client = httpx.Client(timeout=30.0)
+        self._client = http.get_client()
 
     def search(
         self,
@@ -65,37 +116,13 @@ class TavilyMCPTool(SearchTool):
         if not self._is_available:
             return []
 
-        # Tavily 使用 days 参数
-        days_map = {
-            SearchTimeRange.ONE_DAY: 1,
-            SearchTimeRange.ONE_WEEK: 7,
-            SearchTimeRange.ONE_MONTH: 30,
-            SearchTimeRange.ONE_YEAR: 365,
-            SearchTimeRange.NO_LIMIT: None,
-        }
-
-        params: dict[str, Any] = {
-            "api_key": self._api_key,
-            "query": query,
-            "search_depth": "advanced",
-            "max_results": max_results,
-            "include_answer": False,
-            "include_raw_content": False,
-            "include_images": False,
-        }
-
-        if days_map[time_range] is not None:
-            params["days"] = days_map[time_range]
+        params = self._build_params(query, time_range, max_results)
 
         try:
-            # Tavily API 使用 POST 请求，参数在请求体中
-            response = self._client.post(
-                self.API_BASE_URL,
-                json=params
-            )
+            response = self._post(params)
             response.raise_for_status()
 
-            data = response.json()
+            data = json_loads(response.content)
 
             return self._parse_results(data)
 
@@ -106,6 +133,92 @@ class TavilyMCPTool(SearchTool):
             logger.warning(f"Search failed: {e}. Returning empty results.")
             return []
 
+    async def asearch(
+        self,
+        query: str,
+        time_range: SearchTimeRange = SearchTimeRange.ONE_YEAR,
+        max_results: int = 10,
+    ) -> list[SearchResult]:
+        """异步执行搜索（使用共享的异步客户端，可与其他请求并发）。
+
+        Args:
+            query: 搜索查询
+            time_range: 时间范围
+            max_results: 最大结果数
+
+        Returns:
+            搜索结果列表
+        """
+        if not self._is_available:
+            return []
+
+        params = self._build_params(query, time_range, max_results)
+
+        try:
+            response = await self._apost(params)
+            response.raise_for_status()
+            return self._parse_results(json_loads(response.content))
+
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"Tavily API error ({e.response.status_code}). Search returned empty results.")
+            return []
+        except Exception as e:
+            logger.warning(f"Search failed: {e}. Returning empty results.")
+            return []
+
+    def _post(self, params: dict[str, Any]) -> httpx.Response:
+        """发送搜索请求。
+
+        限流、网关错误与连接失败时按指数退避重试，最多 TAVILY_MAX_ATTEMPTS 次；
+        最后一次的响应（或异常）原样交给调用方处理。
+        """
+        # Tavily API 使用 POST 请求，参数在请求体中
+        body = json_dumps_bytes(params)
+        for attempt in range(TAVILY_MAX_ATTEMPTS - 1):
+            try:
+                response = self._client.post(self.API_BASE_URL, content=body, headers=_JSON_HEADERS)
+                if response.status_code not in TAVILY_RETRY_STATUSES:
+                    return response
+            except _RETRYABLE_ERRORS:
+                pass
+            time.sleep(_retry_delay(attempt))
+        return self._client.post(self.API_BASE_URL, content=body, headers=_JSON_HEADERS)
+
+    async def _apost(self, params: dict[str, Any]) -> httpx.Response:
+        """异步发送搜索请求，重试策略与 _post 相同，退避期间不阻塞事件循环。"""
+        body = json_dumps_bytes(params)
+        client = http.get_async_client()
+        for attempt in range(TAVILY_MAX_ATTEMPTS - 1):
+            try:
+                response = await client.post(self.API_BASE_URL, content=body, headers=_JSON_HEADERS)
+                if response.status_code not in TAVILY_RETRY_STATUSES:
+                    return response
+            except _RETRYABLE_ERRORS:
+                pass
+            await asyncio.sleep(_retry_delay(attempt))
+        return await client.post(self.API_BASE_URL, content=body, headers=_JSON_HEADERS)
+
+    def _build_params(
+        self,
+        query: str,
+        time_range: SearchTimeRange,
+        max_results: int,
+    ) -> dict[str, Any]:
+        """构建 API 请求参数（在固定字段模板上只填入每次请求变化的字段）。"""
+        params: dict[str, Any] = {
+            **_BASE_PARAMS,
+            "api_key": self._api_key,
+            "query": query,
+            "max_results": max_results,
+        }
+
+        # Tavily 使用 days 参数
+        days = _DAYS_BY_TIME_RANGE[time_range]
+        if days is not None:
+            params["days"] = days
+
+        return params
+
     def _parse_results(self, data: dict[str, Any]) -> list[SearchResult]:
         """解析 API 响应。
 
@@ -115,67 +228,34 @@ class TavilyMCPTool(SearchTool):
         Returns:
             搜索结果列表
         """
-        results = []
-
-        for item in data.get("results", []):
-            # 提取内容
-            content = item.get("content", "")
-            if not content:
-                # 如果没有 content 字段，尝试使用其他字段
-                content_parts = []
-                for key in ["title", "snippet", "description"]:
-                    if key in item:
-                        content_parts.append(str(item[key]))
-                content = " - ".join(content_parts)
-
-            results.append(SearchResult(
+        return dedupe_results([
+            SearchResult(
                 url=item.get("url", ""),
                 title=item.get("title", ""),
-                summary=content,
-                site_name=self._extract_site_name(item.get("url", "")),
+                summary=item_content(item),
+                site_name=extract_site_name(item.get("url", "")),
                 published_date=item.get("published_date"),
                 score=item.get("score", 0.0),
                 provider=SearchProviderType.TAVILY,
-            ))
-
-        return results
-
-    def _extract_site_name(self, url: str) -> str | None:
-        """从 URL 中提取站点名称。
-
-        Args:
-            url: URL 字符串
-
-        Returns:
-            站点名称
-        """
-        if not url:
-            return None
-
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(url)
-            return parsed.netloc
-        except Exception:
-            return None
-
-    def __del__(self) -> None:
-        """清理资源。"""
-        if hasattr(self, "_client") and self._client is not None:
-            self._client.close()
+            )
+            for item in data.get("results", ())
+        ])
 
     @property
     def metadata(self) -> ProviderMetadata:
-        """获取搜索源元数据。"""
-        return ProviderMetadata(
-            provider_type=SearchProviderType.TAVILY,
-            is_available=self._is_available,
-            rate_limit=None,
-            daily_quota=1000,
-            supports_time_range=True,
-            priority=100,
-            description="Tavily MCP - 高质量 AI 搜索 API",
-        )
+        """获取搜索源元数据（复用同一实例，可用性变化时才重建）。"""
+        metadata = self._metadata
+        if metadata is None or metadata.is_available != self._is_available:
+            metadata = self._metadata = ProviderMetadata(
+                provider_type=SearchProviderType.TAVILY,
+                is_available=self._is_available,
+                rate_limit=None,
+                daily_quota=1000,
+                supports_time_range=True,
+                priority=100,
+                description="Tavily MCP - 高质量 AI 搜索 API",
+            )
+        return metadata
 
     def check_health(self) -> bool:
         """检查搜索源是否可用。
@@ -192,17 +272,27 @@ class MCPHybridSearchTool(SearchTool):
     优先使用 Tavily API，失败时自动降级到 search skill。
     """
 
-    def __init__(self, tavily_api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        tavily_api_key: str | None = None,
+        cache_ttl: float = HYBRID_CACHE_TTL,
+        fallback_cooldown: float = HYBRID_FALLBACK_COOLDOWN,
+    ) -> None:
         """初始化混合搜索工具。
 
         Args:
             tavily_api_key: Tavily API 密钥
+            cache_ttl: 结果缓存过期时间（秒），0 表示不缓存
+            fallback_cooldown: Tavily 失败后改用降级搜索的时长（秒），之后重新尝试 Tavily
         """
         from src.search.skill_fallback import SkillFallbackSearchTool
 
         self._tavily_api = TavilyMCPTool(api_key=tavily_api_key)
         self._fallback = SkillFallbackSearchTool(enable_fallback=True)
-        self._use_fallback = not self._tavily_api._is_available
+        self._fallback_cooldown = fallback_cooldown
+        # 在此时刻（monotonic）之前使用降级搜索；未配置 Tavily 时始终降级
+        self._fallback_until = 0.0 if self._tavily_api._is_available else math.inf
+        self._cache = TTLCache(maxsize=HYBRID_CACHE_SIZE, ttl=cache_ttl) if cache_ttl > 0 else None
 
     def search(
         self,
@@ -220,32 +310,143 @@ class MCPHybridSearchTool(SearchTool):
         Returns:
             搜索结果列表
         """
-        # 优先使用 Tavily API
-        if not self._use_fallback:
+        cached = self._get_cached(query, time_range, max_results)
+        if cached is not None:
+            return cached
+
+        # 优先使用 Tavily API（冷却期内直接降级）
+        if not self.is_using_fallback:
             try:
                 results = self._tavily_api.search(query, time_range, max_results)
                 if results:
-                    return results
-                # Tavily API 返回空结果，切换到降级模式
+                    return self._store(query, time_range, max_results, results)
+                # Tavily API 返回空结果，在冷却期内切换到降级模式
                 logger.info("Tavily API returned empty results, falling back to skill search.")
-                self._use_fallback = True
+                self._start_fallback()
             except Exception as e:
                 logger.info(f"Tavily API search failed ({e}), falling back to skill search.")
-                self._use_fallback = True
+                self._start_fallback()
+
+        # 使用降级搜索
+        results = self._fallback.search(query, time_range, max_results)
+        return self._store(query, time_range, max_results, results)
+
+    async def asearch(
+        self,
+        query: str,
+        time_range: SearchTimeRange = SearchTimeRange.ONE_YEAR,
+        max_results: int = 10,
+        tavily_timeout: float | None = HYBRID_TAVILY_TIMEOUT,
+    ) -> list[SearchResult]:
+        """异步执行搜索，自动降级。
+
+        Tavily 请求不阻塞事件循环；超时、失败或返回空结果时切换到降级搜索，
+        降级搜索（子进程调用）在 skill 专用线程池中执行。
+
+        Args:
+            query: 搜索查询
+            time_range: 时间范围
+            max_results: 最大结果数
+            tavily_timeout: 等待 Tavily 的超时（秒），None 表示不限制
+
+        Returns:
+            搜索结果列表
+        """
+        cached = self._get_cached(query, time_range, max_results)
+        if cached is not None:
+            return cached
+
+        # 优先使用 Tavily API（冷却期内直接降级）
+        if not self.is_using_fallback:
+            try:
+                results = await asyncio.wait_for(
+                    self._tavily_api.asearch(query, time_range, max_results),
+                    timeout=tavily_timeout,
+                )
+                if results:
+                    return self._store(query, time_range, max_results, results)
+                logger.info("Tavily API returned empty results, falling back to skill search.")
+                self._start_fallback()
+            except Exception as e:
+                logger.info(f"Tavily API search failed ({e!r}), falling back to skill search.")
+                self._start_fallback()
 
         # 使用降级搜索
-        return self._fallback.search(query, time_range, max_results)
+        results = await self._fallback.asearch(query, time_range, max_results)
+        return self._store(query, time_range, max_results, results)
+
+    async def search_many(
+        self,
+        queries: Iterable[str],
+        time_range: SearchTimeRange = SearchTimeRange.ONE_YEAR,
+        max_results: int = 10,
+        concurrency: int | None = None,
+    ) -> list[list[SearchResult]]:
+        """在同一事件循环内并发执行多个查询（如多个 Agent 同时检索）。
+
+        Args:
+            queries: 搜索查询
+            time_range: 时间范围
+            max_results: 每个查询的最大结果数
+            concurrency: 同时进行的查询数上限，默认取调度器的 max_concurrent
+
+        Returns:
+            与 queries 顺序一致的结果列表
+        """
+        if concurrency is None:
+            from src.utils.config import get_config
+
+            concurrency = get_config().scheduler.max_concurrent
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def search_one(query: str) -> list[SearchResult]:
+            async with semaphore:
+                return await self.asearch(query, time_range, max_results)
+
+        return list(await asyncio.gather(*(search_one(query) for query in queries)))
+
+    def _get_cached(
+        self,
+        query: str,
+        time_range: SearchTimeRange,
+        max_results: int,
+    ) -> list[SearchResult] | None:
+        """读取结果缓存。"""
+        if self._cache is None:
+            return None
+        return self._cache.get(query, time_range, max_results)
+
+    def _store(
+        self,
+        query: str,
+        time_range: SearchTimeRange,
+        max_results: int,
+        results: list[SearchResult],
+    ) -> list[SearchResult]:
+        """缓存非空结果并原样返回。"""
+        if self._cache is not None and results:
+            self._cache.set(query, results, time_range, max_results)
+        return results
+
+    def invalidate(self) -> None:
+        """清空结果缓存（配置变更后调用）。"""
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _start_fallback(self) -> None:
+        """在冷却期内改用降级搜索，避免一次瞬时故障导致永久降级。"""
+        self._fallback_until = time.monotonic() + self._fallback_cooldown
 
     @property
     def is_using_fallback(self) -> bool:
         """是否正在使用降级搜索。"""
-        return self._use_fallback
+        return time.monotonic() < self._fallback_until
 
     @property
     def metadata(self) -> ProviderMetadata:
         """获取搜索源元数据。"""
-        # 返回当前正在使用的搜索源的元数据
-        if self._use_fallback:
+        # 返回当前正在使用的搜索源的元数据（两者各自复用缓存的实例）
+        if self.is_using_fallback:
             return self._fallback.metadata
         return self._tavily_api.metadata
 
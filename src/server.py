@@ -3,19 +3,68 @@
 提供独立的 Web 服务器启动方式。
 """
 
+import importlib.util
 import sys
 from pathlib import Path
 
 import click
 
+# 优先使用 uvloop 事件循环与 httptools 解析器，
+# 缺失时退回标准 asyncio 循环与纯 Python 的 h11（uvloop 不支持 Windows）
+SERVER_ACCELERATORS = ("httptools",) if sys.platform == "win32" else ("uvloop", "httptools")
 
-def run_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False) -> None:
+# uvicorn 各实现选项：(选项名, 首选实现, 首选实现缺失时的回退)
+_SERVER_IMPLEMENTATIONS = (
+    ("loop", "uvloop", "asyncio"),
+    ("http", "httptools", "h11"),
+    ("ws", "websockets", "auto"),
+)
+
+
+def warn_missing_accelerators() -> None:
+    """提示未安装的 uvicorn 加速依赖。"""
+    missing = [name for name in SERVER_ACCELERATORS if importlib.util.find_spec(name) is None]
+    if missing:
+        click.echo(
+            f"提示: 未安装 {', '.join(missing)}，安装 uvicorn[standard] 可提升事件循环与 HTTP 解析性能",
+            err=True,
+        )
+
+
+def server_implementations() -> dict[str, str]:
+    """显式选择 uvicorn 的事件循环、HTTP 与 WebSocket 实现。
+
+    已安装时固定使用 uvloop / httptools / websockets，避免部署环境悄悄退回默认实现；
+    缺失时使用可用的回退实现，而不是启动失败。
+    """
+    return {
+        option: preferred if importlib.util.find_spec(preferred) is not None else fallback
+        for option, preferred, fallback in _SERVER_IMPLEMENTATIONS
+        if not (preferred == "uvloop" and sys.platform == "win32")
+    }
+
+
+def server_workers(reload: bool, workers: int) -> int:
+    """实际使用的工作进程数：自动重载只支持单进程。"""
+    return 1 if reload else max(1, workers)
+
+
+def run_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    reload: bool = False,
+    workers: int = 1,
+) -> None:
     """运行 Web 服务器。
 
+    多个工作进程各自持有异步任务与 WebSocket 连接状态，
+    使用异步任务接口时需要在负载均衡上保持会话。
+
     Args:
         host: 主机地址
         port: 端口号
         reload: 是否自动重载
+        workers: 工作进程数（自动重载时固定为 1）
     """
     try:
         import uvicorn
@@ -23,6 +72,8 @@ def run_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False)
         click.echo("✗ 需要安装 uvicorn: pip install uvicorn[standard]", err=True)
         sys.exit(1)
 
+    warn_missing_accelerators()
+
     click.echo(f"🚀 启动 CompetitorSwarm Web 服务器", err=True)
     click.echo(f"   地址: http://{host}:{port}", err=True)
     click.echo(f"   文档: http://{host}:{port}/api/docs", err=True)
@@ -34,6 +85,8 @@ def run_server(host: str = "127.0.0.1", port: int = 8000, reload: bool = False)
         host=host,
         port=port,
         reload=reload,
+        workers=server_workers(reload, workers),
+        **server_implementations(),
     )
 
 
@@ -44,7 +97,8 @@ if __name__ == "__main__":
     parser.add_argument("--host", "-h", default="127.0.0.1", help="主机地址")
     parser.add_argument("--port", "-p", type=int, default=8000, help="端口号")
     parser.add_argument("--reload", action="store_true", help="自动重载（开发模式）")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="工作进程数")
 
     args = parser.parse_args()
 
-    run_server(host=args.host, port=args.port, reload=args.reload)
+    run_server(host=args.host, port=args.port, reload=args.reload, workers=args.workers)
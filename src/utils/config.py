@@ -4,6 +4,7 @@
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
 from typing import Any
 from pathlib import Path
@@ -20,10 +21,23 @@ load_dotenv()
 PROMPTS_DIR = Path(__file__).parent.parent.parent / "prompts"
 
 
-@lru_cache(maxsize=None)
+# 需要注入提示词的 Agent 类型
+AGENT_TYPES = ("scout", "experience", "technical", "market", "red_team", "blue_team", "elite")
+
+
+def _mtime_ns(path: Path) -> int:
+    """文件修改时间（纳秒），文件不存在时返回 0。"""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
 def load_agent_prompt(agent_type: str) -> str | None:
     """加载 Agent 系统提示词文件。
 
+    按文件修改时间缓存，提示词文件修改后自动重新读取。
+
     Args:
         agent_type: Agent 类型（如 "scout", "experience" 等）
 
@@ -31,18 +45,23 @@ def load_agent_prompt(agent_type: str) -> str | None:
         提示词内容，文件不存在时返回 None
     """
     prompt_file = PROMPTS_DIR / f"{agent_type}.md"
-    if not prompt_file.exists():
+    return _read_agent_prompt(prompt_file, _mtime_ns(prompt_file))
+
+
+@lru_cache(maxsize=64)
+def _read_agent_prompt(prompt_file: Path, mtime_ns: int) -> str | None:
+    """读取提示词文件内容（mtime_ns 仅作为缓存键）。"""
+    if not mtime_ns:
         return None
 
     content = prompt_file.read_text(encoding="utf-8")
-    # 移除可能的 YAML frontmatter
-    lines = content.split("\n")
-    if len(lines) > 0 and lines[0].startswith("---"):
-        try:
-            idx = lines.index("---", 1)
-            content = "\n".join(lines[idx + 1:])
-        except ValueError:
-            pass
+    # 移除可能的 YAML frontmatter：直接查找结束分隔行并切片，不拆分整个文件
+    if content.startswith("---"):
+        end = content.find("\n---\n")
+        if end != -1:
+            content = content[end + 5:]
+        elif content.endswith("\n---"):
+            content = ""
     return content.strip()
 
 
@@ -284,6 +303,9 @@ def get_env(key: str, default: str | None = None) -> str:
 def load_config(config_path: str | None = None) -> Config:
     """从 YAML 文件加载配置。
 
+    解析结果按 (路径, 配置文件与提示词文件的修改时间) 缓存，文件未变化时
+    直接返回同一个配置对象，不再重复解析 YAML 和读取提示词。
+
     Args:
         config_path: 配置文件路径，默认为项目根目录的 config.yaml
 
@@ -299,11 +321,22 @@ def load_config(config_path: str | None = None) -> Config:
         project_root = Path(__file__).parent.parent.parent
         config_path = str(project_root / "config.yaml")
 
-    config_file = Path(config_path)
-    if not config_file.exists():
+    mtime_ns = _mtime_ns(Path(config_path))
+    if not mtime_ns:
         raise FileNotFoundError(f"Config file not found: {config_path}")
 
-    with open(config_file, "r", encoding="utf-8") as f:
+    prompt_mtimes = tuple(_mtime_ns(PROMPTS_DIR / f"{agent_type}.md") for agent_type in AGENT_TYPES)
+    return _load_config_cached(str(config_path), mtime_ns, prompt_mtimes)
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(
+    config_path: str,
+    mtime_ns: int,
+    prompt_mtimes: tuple[int, ...],
+) -> Config:
+    """解析配置文件并注入提示词（mtime_ns 与 prompt_mtimes 仅作为缓存键）。"""
+    with open(config_path, "r", encoding="utf-8") as f:
         data = yaml.safe_load(f)
 
     if data is None:
@@ -311,12 +344,17 @@ def load_config(config_path: str | None = None) -> Config:
 
     config = Config(**data)
 
-    # 为每个 agent 注入提示词（如果未在配置中指定）
-    agent_types = ["scout", "experience", "technical", "market", "red_team", "blue_team", "elite"]
-    for agent_type in agent_types:
-        agent_config = getattr(config.agents, agent_type)
-        if agent_config.system_prompt is None:
-            agent_config.system_prompt = load_agent_prompt(agent_type) or f"You are a {agent_config.name}."
+    # 为每个 agent 注入提示词（如果未在配置中指定），冷启动时并发读取提示词文件
+    missing = [
+        agent_type for agent_type in AGENT_TYPES
+        if getattr(config.agents, agent_type).system_prompt is None
+    ]
+    if missing:
+        with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+            prompts = dict(zip(missing, executor.map(load_agent_prompt, missing)))
+        for agent_type in missing:
+            agent_config = getattr(config.agents, agent_type)
+            agent_config.system_prompt = prompts[agent_type] or f"You are a {agent_config.name}."
 
     return config
 
@@ -3,6 +3,9 @@
 集中管理可选依赖的导入，提供优雅的降级支持。
 """
 
+import json
+from typing import Any
+
 # Signal 相关导入（所有 Agent 共用）
 try:
     from src.schemas.signals import (
@@ -17,8 +20,47 @@ try:
 except ImportError:
     SIGNALS_AVAILABLE = False
 
+# orjson（可选）：C 实现的 JSON 编解码，未安装时回退到标准库 json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """序列化为 UTF-8 编码的 JSON 字节串。
+
+    Args:
+        obj: 可 JSON 序列化的对象
+
+    Returns:
+        JSON 字节串
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """解析 JSON 字节串或字符串。
+
+    Args:
+        data: JSON 数据
+
+    Returns:
+        解析后的对象
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 __all__ = [
+    "ORJSON_AVAILABLE",
+    "json_dumps_bytes",
+    "json_loads",
     "SIGNALS_AVAILABLE",
     "Signal",
     "SignalType",
@@ -4,25 +4,32 @@
 """
 
 import asyncio
+import gzip
+import hashlib
 import json
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from stat import S_ISREG
 from typing import Any, Callable
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import HTMLResponse, FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
-from src.coordinator import Coordinator, reset_coordinator
+from src.coordinator import Coordinator, get_shared_search_tool, reset_coordinator
 from src.environment import StigmergyEnvironment
 from src.reporting import get_html_generator
 from src.scheduler import get_recurring_scheduler, reset_recurring_scheduler, RecurringJob
 from src.utils.config import get_config
+from src.utils.imports import json_dumps_bytes, json_loads
 from src.web.jobs import (
     AnalysisJobStatus,
+    build_static_url,
     build_timeout_error,
     get_job_manager,
     reset_job_manager,
@@ -32,49 +39,208 @@ from src.web.jobs import (
 logger = logging.getLogger(__name__)
 
 
+class ORJSONResponse(Response):
+    """JSON 响应：安装 orjson 时用 C 实现直接编码为字节，否则回退到标准库 json。
+
+    FastAPI 自带的 ORJSONResponse 要求必须安装 orjson，这里复用统一的可选依赖降级。
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """序列化响应内容。"""
+        return json_dumps_bytes(content)
+
+
+# 报告输出目录（静态文件挂载与 /reports 共用，模块加载时解析一次）
+STATIC_DIR = (Path(__file__).parent.parent.parent / "output").resolve()
+
+# 每个连接待发送消息队列的容量；写满说明对端过慢，直接断开
+WS_SEND_QUEUE_SIZE = 256
+
+# 进度事件合并窗口（秒）与单帧最多合并的事件数
+WS_BATCH_INTERVAL = 0.05
+WS_BATCH_MAX_EVENTS = 32
+
+
+def _encode_ws_message(message: dict[str, Any]) -> str:
+    """序列化 WebSocket 消息为文本帧。
+
+    事件消息只含基本类型，直接编码（跳过 jsonable_encoder）；
+    仅在遇到无法直接编码的值（如 datetime、Path）时才回退到 jsonable_encoder。
+    """
+    try:
+        return json_dumps_bytes(message).decode("utf-8")
+    except TypeError:
+        return json_dumps_bytes(jsonable_encoder(message)).decode("utf-8")
+
+
 # WebSocket 连接管理器
 class ConnectionManager:
-    """WebSocket 连接管理器。"""
+    """WebSocket 连接管理器。
 
-    def __init__(self) -> None:
-        """初始化连接管理器。"""
-        self.active_connections: list[WebSocket] = []
+    每个连接有一个有界发送队列和一个常驻发送任务：生产消息只入队，
+    慢连接不会阻塞处理逻辑或其他连接。高频的进度事件先在短时间窗内缓冲，
+    合并为一个 batch 帧发送。
+    """
+
+    def __init__(
+        self,
+        queue_size: int = WS_SEND_QUEUE_SIZE,
+        batch_interval: float = WS_BATCH_INTERVAL,
+        batch_max_events: int = WS_BATCH_MAX_EVENTS,
+    ) -> None:
+        """初始化连接管理器。
+
+        Args:
+            queue_size: 每个连接的发送队列容量
+            batch_interval: 进度事件合并窗口（秒）
+            batch_max_events: 单帧最多合并的进度事件数
+        """
+        self.active_connections: set[WebSocket] = set()
+        self._queue_size = queue_size
+        self._batch_interval = batch_interval
+        self._batch_max_events = max(1, batch_max_events)
+        self._queues: dict[WebSocket, asyncio.Queue[str | None]] = {}
+        self._drain_tasks: dict[WebSocket, asyncio.Task[None]] = {}
+        self._pending_events: dict[WebSocket, list[dict[str, Any]]] = {}
+        self._flush_handles: dict[WebSocket, asyncio.TimerHandle] = {}
 
     async def connect(self, websocket: WebSocket) -> None:
-        """接受新连接。"""
+        """接受新连接并启动其发送任务。"""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=self._queue_size)
+        self._queues[websocket] = queue
+        self._drain_tasks[websocket] = asyncio.create_task(self._drain(websocket, queue))
 
     def disconnect(self, websocket: WebSocket) -> None:
-        """移除连接。"""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        """移除连接。已入队的消息发送完毕后发送任务自行结束，未合并发送的进度事件被丢弃。"""
+        self.active_connections.discard(websocket)
+        self._pending_events.pop(websocket, None)
+        handle = self._flush_handles.pop(websocket, None)
+        if handle is not None:
+            handle.cancel()
+        queue = self._queues.pop(websocket, None)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(None)
+        except asyncio.QueueFull:
+            task = self._drain_tasks.pop(websocket, None)
+            if task is not None:
+                task.cancel()
+
+    async def flush_and_disconnect(self, websocket: WebSocket) -> None:
+        """移除连接，并等待已入队的消息发送完毕。"""
+        self.flush_events(websocket)
+        task = self._drain_tasks.get(websocket)
+        self.disconnect(websocket)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _drain(self, websocket: WebSocket, queue: "asyncio.Queue[str | None]") -> None:
+        """按顺序发送队列中的消息，直到收到结束标记或发送失败。"""
+        try:
+            while True:
+                payload = await queue.get()
+                if payload is None:
+                    return
+                try:
+                    await websocket.send_text(payload)
+                except Exception:
+                    self.disconnect(websocket)
+                    return
+        finally:
+            if self._drain_tasks.get(websocket) is asyncio.current_task():
+                del self._drain_tasks[websocket]
+
+    def _enqueue(self, websocket: WebSocket, payload: str) -> None:
+        """将已序列化的消息放入连接的发送队列；队列写满时断开该连接。"""
+        queue = self._queues.get(websocket)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning("websocket send queue full, dropping slow connection")
+            self.disconnect(websocket)
 
     async def broadcast(self, message: dict[str, Any]) -> None:
-        """广播消息给所有连接。"""
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                self.disconnect(connection)
+        """广播消息给所有连接（只序列化一次）。"""
+        if not self.active_connections:
+            return
+        payload = _encode_ws_message(message)
+        for connection in list(self.active_connections):
+            self._enqueue(connection, payload)
 
     async def send_personal(self, message: dict[str, Any], websocket: WebSocket) -> None:
-        """发送消息给特定连接。"""
-        try:
-            await websocket.send_json(message)
-        except Exception:
-            self.disconnect(websocket)
+        """发送消息给特定连接（orjson 可用时用其编码，以文本帧发送）。
+
+        先发出已缓冲的进度事件，保证消息顺序。
+        """
+        self.flush_events(websocket)
+        self._enqueue(websocket, _encode_ws_message(message))
+
+    def queue_event(self, websocket: WebSocket, message: dict[str, Any]) -> None:
+        """缓冲进度事件，合并窗口结束或数量达到上限时作为一帧发送。
+
+        须在事件循环线程中调用。
+        """
+        if websocket not in self._queues:
+            return
+        pending = self._pending_events.setdefault(websocket, [])
+        pending.append(message)
+        if len(pending) >= self._batch_max_events:
+            self.flush_events(websocket)
+        elif websocket not in self._flush_handles:
+            self._flush_handles[websocket] = asyncio.get_running_loop().call_later(
+                self._batch_interval, self.flush_events, websocket
+            )
+
+    def flush_events(self, websocket: WebSocket) -> None:
+        """立即发送已缓冲的进度事件：单个事件原样发送，多个事件合并为 batch 帧。"""
+        handle = self._flush_handles.pop(websocket, None)
+        if handle is not None:
+            handle.cancel()
+        events = self._pending_events.pop(websocket, None)
+        if not events:
+            return
+        message = events[0] if len(events) == 1 else {"type": "batch", "events": events}
+        self._enqueue(websocket, _encode_ws_message(message))
+
+    async def emit(self, websocket: WebSocket, event_type: str, **fields: Any) -> None:
+        """发送带类型与时间戳的事件消息给特定连接。
+
+        Args:
+            websocket: 目标连接
+            event_type: 事件类型
+            **fields: 事件字段
+        """
+        await self.send_personal(_ws_event(event_type, **fields), websocket)
+
+
+# 事件时间戳的取时函数（绑定到模块级，避免每个事件重复查找属性）
+_now = datetime.now
+
+
+def _ws_event(event_type: str, **fields: Any) -> dict[str, Any]:
+    """构建 WebSocket 事件消息：type 在前，timestamp 在后。"""
+    return {"type": event_type, **fields, "timestamp": _now().isoformat()}
 
 
 manager = ConnectionManager()
 
 
-def _suppress_future_exception(future: Any) -> None:
-    """吞掉后台发送任务异常，避免噪音日志。"""
-    try:
-        future.result()
-    except Exception:
-        pass
+async def _receive_ws_json(websocket: WebSocket) -> Any:
+    """接收一条 JSON 消息（文本帧或二进制帧均可），orjson 可用时用其解析。"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    data = message.get("text")
+    if data is None:
+        data = message.get("bytes") or b""
+    return json_loads(data)
 
 
 def _schedule_ws_message(
@@ -82,16 +248,9 @@ def _schedule_ws_message(
     websocket: WebSocket,
     payload: dict[str, Any],
 ) -> None:
-    """线程安全地投递 WebSocket 消息。"""
-    message = {
-        **payload,
-        "timestamp": datetime.now().isoformat(),
-    }
-    future = asyncio.run_coroutine_threadsafe(
-        manager.send_personal(message, websocket),
-        loop,
-    )
-    future.add_done_callback(_suppress_future_exception)
+    """线程安全地投递 WebSocket 进度消息（在事件循环中合并后发送）。"""
+    message = {**payload, "timestamp": _now().isoformat()}
+    loop.call_soon_threadsafe(manager.queue_event, websocket, message)
 
 
 def _build_ws_progress_callbacks(
@@ -147,6 +306,17 @@ class AnalyzeRequest(BaseModel):
     focus_areas: list[str] | None = None
 
 
+class AnalyzeResponse(BaseModel):
+    """同步分析成功响应。"""
+
+    success: bool
+    target: str
+    duration: float | None = None
+    total_discoveries: int | None = 0
+    html_report: str
+    json_data: str
+
+
 class AnalyzeErrorResponse(BaseModel):
     """分析错误响应。"""
 
@@ -220,8 +390,9 @@ class ScheduledJobResponse(BaseModel):
 async def lifespan(app: FastAPI):
     """应用生命周期管理。"""
     # 启动时执行
-    static_dir = Path(__file__).parent.parent.parent / "output"
-    static_dir.mkdir(parents=True, exist_ok=True)
+    STATIC_DIR.mkdir(parents=True, exist_ok=True)
+    # 预先创建共享搜索工具，首个分析请求不再承担初始化开销
+    await asyncio.to_thread(get_shared_search_tool)
     job_manager = get_job_manager()
     await job_manager.start()
 
@@ -246,16 +417,40 @@ async def lifespan(app: FastAPI):
 
 
 # 创建 FastAPI 应用
+# 部署时通过 `python -m src.server` 或 `python main.py serve` 启动：已安装时固定使用
+# uvloop + httptools + websockets（见 src.server.server_implementations），不要直接使用默认的 selector 循环
 app = FastAPI(
     title="CompetitorSwarm API",
     description="竞品分析可视化系统 API",
     version="0.2.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# 静态资源与报告的缓存策略（Last-Modified 由 FileResponse 按文件 mtime 生成）
+STATIC_CACHE_CONTROL = "public, max-age=3600, must-revalidate"
+REPORT_CACHE_CONTROL = "public, max-age=300"
+NOT_FOUND_CACHE_CONTROL = "public, max-age=60"
+
+# output 目录中没有 404.html 时使用的默认页面
+_DEFAULT_NOT_FOUND_HTML = (
+    '<!DOCTYPE html><html lang="zh-CN"><head><meta charset="UTF-8"><title>404</title></head>'
+    "<body><h1>404</h1><p>报告不存在</p></body></html>"
+).encode("utf-8")
+
+
+class CachedStaticFiles(StaticFiles):
+    """为静态文件响应附加 Cache-Control 的 StaticFiles。"""
+
+    def file_response(self, *args: Any, **kwargs: Any) -> Response:
+        """构造文件响应并注入缓存头（304 响应同样携带）。"""
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = STATIC_CACHE_CONTROL
+        return response
+
+
 # 挂载静态文件
-static_dir = Path(__file__).parent.parent.parent / "output"
-app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+app.mount("/static", CachedStaticFiles(directory=str(STATIC_DIR), html=True), name="static")
 
 
 def _build_coordinator(
@@ -264,7 +459,7 @@ def _build_coordinator(
     on_phase_complete: "Callable[[str, int], None] | None" = None,
     on_agent_start: "Callable[[str], None] | None" = None,
 ) -> Coordinator:
-    """构建隔离环境的 Coordinator，避免全局状态串扰。"""
+    """构建隔离环境的 Coordinator，避免全局状态串扰；搜索工具在各次分析间共享。"""
     kwargs = {
         "on_phase_start": on_phase_start,
         "on_phase_complete": on_phase_complete,
@@ -273,26 +468,49 @@ def _build_coordinator(
     try:
         return Coordinator(
             environment=StigmergyEnvironment(cache_path=get_config().cache.path),
+            search_tool=get_shared_search_tool(),
             **kwargs,
         )
     except TypeError:
-        # 测试桩或兼容实现可能不接受 environment 参数，降级为旧构造方式。
+        # 测试桩或兼容实现可能不接受 environment / search_tool 参数，降级为旧构造方式。
         return Coordinator(**kwargs)
 
 
-def _result_to_api_payload(result: Any) -> dict[str, Any]:
-    """将 CoordinatorResult 转为 API payload。"""
+async def _result_to_api_payload(result: Any) -> AnalyzeResponse:
+    """将 CoordinatorResult 转为 API payload（报告写盘在线程池中并行执行）。"""
     html_generator = get_html_generator()
-    html_path = html_generator.generate_html(result)
-    json_path = html_generator.generate_json(result)
-    return {
-        "success": result.success,
-        "target": result.target,
-        "duration": result.duration,
-        "total_discoveries": result.metadata.get("total_discoveries", 0),
-        "html_report": f"/static/{Path(html_path).name}",
-        "json_data": f"/static/{Path(json_path).name}",
-    }
+    html_path, json_path = await asyncio.gather(
+        asyncio.to_thread(html_generator.generate_html, result),
+        asyncio.to_thread(html_generator.generate_json, result),
+    )
+    return AnalyzeResponse(
+        success=result.success,
+        target=result.target,
+        duration=result.duration,
+        total_discoveries=result.metadata.get("total_discoveries", 0),
+        html_report=build_static_url(html_path),
+        json_data=build_static_url(json_path),
+    )
+
+
+async def _run_analysis(
+    coordinator: Coordinator,
+    target: str,
+    competitors: list[str] | None,
+    focus_areas: list[str] | None,
+    *,
+    timeout_seconds: int,
+) -> AnalyzeResponse:
+    """在线程池中执行分析并写出报告，REST 与 WebSocket 共用。
+
+    Raises:
+        asyncio.TimeoutError: 分析超过 timeout_seconds
+    """
+    result = await asyncio.wait_for(
+        asyncio.to_thread(coordinator.analyze, target, competitors, focus_areas),
+        timeout=timeout_seconds,
+    )
+    return await _result_to_api_payload(result)
 
 
 def _build_sync_timeout_response(target: str, timeout_seconds: int, run_id: str | None = None) -> dict[str, Any]:
@@ -309,31 +527,120 @@ def _build_sync_timeout_response(target: str, timeout_seconds: int, run_id: str
 
 
 # 根路径 - 重定向到首页
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """判断 If-None-Match 是否命中 ETag（弱比较，支持逗号分隔列表与 *）。"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _not_modified(etag: str, cache_control: str | None = None) -> Response:
+    """构造不带响应体的 304 响应。"""
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=304, headers=headers)
+
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    """判断客户端是否接受 gzip 编码（q=0 表示拒绝）。"""
+    if not accept_encoding:
+        return False
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        name, _, value = params.partition("=")
+        if name.strip().lower() != "q":
+            return True
+        try:
+            return float(value) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def _dashboard_response(request: Request) -> Response:
+    """构造仪表盘响应（复用导入时编码、压缩好的字节与 ETag）。"""
+    use_gzip = _accepts_gzip(request.headers.get("accept-encoding"))
+    etag = _DASHBOARD_GZIP_ETAG if use_gzip else _DASHBOARD_ETAG
+    headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return Response(
+        content=_DASHBOARD_GZIP if use_gzip else _DASHBOARD_BYTES,
+        media_type="text/html; charset=utf-8",
+        headers=headers,
+    )
+
+
 @app.get("/", response_class=HTMLResponse)
-async def root() -> str:
+async def root(request: Request) -> Response:
     """返回首页 HTML。"""
-    return get_dashboard_html()
+    return _dashboard_response(request)
 
 
 @app.get("/dashboard", response_class=HTMLResponse)
-async def dashboard() -> str:
+async def dashboard(request: Request) -> Response:
     """返回仪表盘页面。"""
-    return get_dashboard_html()
+    return _dashboard_response(request)
+
+
+@lru_cache(maxsize=4)
+def _not_found_page(directory: Path) -> bytes:
+    """读取目录中的 404.html（每个目录只读一次），不存在时使用默认页面。"""
+    try:
+        return (directory / "404.html").read_bytes()
+    except OSError:
+        return _DEFAULT_NOT_FOUND_HTML
+
+
+def _not_found_response() -> Response:
+    """构造报告不存在时的 404 响应。"""
+    return Response(
+        content=_not_found_page(STATIC_DIR),
+        status_code=404,
+        media_type="text/html; charset=utf-8",
+        headers={"Cache-Control": NOT_FOUND_CACHE_CONTROL},
+    )
 
 
 @app.get("/report/{filename}")
-async def get_report(filename: str) -> FileResponse:
-    """获取报告文件。"""
-    file_path = static_dir / filename
-    if file_path.exists():
-        return FileResponse(file_path)
-    return FileResponse(static_dir / "404.html")
+async def get_report(filename: str, request: Request) -> Response:
+    """获取报告文件。
 
+    ETag 由修改时间与文件大小生成，浏览器刷新未变化的报告时返回 304。
+    """
+    file_path = STATIC_DIR / filename
+    try:
+        st = file_path.stat()
+    except OSError:
+        return _not_found_response()
+    if not S_ISREG(st.st_mode):
+        return _not_found_response()
+
+    etag = f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return _not_modified(etag, REPORT_CACHE_CONTROL)
+    return FileResponse(
+        file_path,
+        stat_result=st,
+        headers={"ETag": etag, "Cache-Control": REPORT_CACHE_CONTROL},
+    )
 
-@app.post("/api/analyze")
-async def api_analyze(request: AnalyzeRequest) -> dict[str, Any]:
+
+@app.post("/api/analyze", responses={200: {"model": AnalyzeResponse}})
+async def api_analyze(request: AnalyzeRequest) -> Response:
     """执行竞品分析（API 方式）。
 
+    成功响应由 pydantic 直接序列化为 JSON（省略空字段），跳过 jsonable_encoder；
+    未声明 response_model，避免重复校验。
+
     Args:
         request: 分析请求
 
@@ -345,16 +652,17 @@ async def api_analyze(request: AnalyzeRequest) -> dict[str, Any]:
     run_started = datetime.now().isoformat()
 
     try:
-        result = await asyncio.wait_for(
-            asyncio.to_thread(
-                coordinator.analyze,
-                request.target,
-                request.competitors,
-                request.focus_areas,
-            ),
-            timeout=timeout_seconds,
+        payload = await _run_analysis(
+            coordinator,
+            request.target,
+            request.competitors,
+            request.focus_areas,
+            timeout_seconds=timeout_seconds,
+        )
+        return Response(
+            content=payload.model_dump_json(exclude_none=True),
+            media_type="application/json",
         )
-        return _result_to_api_payload(result)
     except asyncio.TimeoutError:
         run_id = getattr(coordinator, "_environment", None)
         run_id = getattr(run_id, "current_run_id", None)
@@ -365,7 +673,7 @@ async def api_analyze(request: AnalyzeRequest) -> dict[str, Any]:
             timeout_seconds,
             run_started,
         )
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=504,
             content=_build_sync_timeout_response(
                 target=request.target,
@@ -375,7 +683,7 @@ async def api_analyze(request: AnalyzeRequest) -> dict[str, Any]:
         )
     except Exception as exc:
         logger.exception("analysis.sync failed target=%s error=%s", request.target, exc)
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "success": False,
@@ -532,96 +840,114 @@ async def websocket_analysis(websocket: WebSocket) -> None:
     """
     await manager.connect(websocket)
     loop = asyncio.get_running_loop()
+    analysis_task: asyncio.Task[None] | None = None
 
     try:
         # 发送连接确认
-        await manager.send_personal({
-            "type": "connected",
-            "message": "WebSocket 连接已建立",
-            "timestamp": datetime.now().isoformat(),
-        }, websocket)
+        await manager.emit(websocket, "connected", message="WebSocket 连接已建立")
 
         while True:
             # 接收消息
-            data = await websocket.receive_json()
+            data = await _receive_ws_json(websocket)
 
             if data.get("action") == "analyze":
-                target = data.get("target")
-                competitors = data.get("competitors")
-                focus_areas = data.get("focus_areas")
-
-                # 发送分析开始通知
-                await manager.send_personal({
-                    "type": "analysis_started",
-                    "target": target,
-                    "timestamp": datetime.now().isoformat(),
-                }, websocket)
-
-                on_phase_start, on_phase_complete, on_agent_start = _build_ws_progress_callbacks(
-                    loop=loop,
-                    websocket=websocket,
-                )
-                coordinator = _build_coordinator(
-                    on_phase_start=on_phase_start,
-                    on_phase_complete=on_phase_complete,
-                    on_agent_start=on_agent_start,
-                )
-                timeout_seconds = resolve_sync_timeout_seconds()
-                try:
-                    result = await asyncio.wait_for(
-                        asyncio.to_thread(
-                            coordinator.analyze,
-                            target,
-                            competitors,
-                            focus_areas,
-                        ),
-                        timeout=timeout_seconds,
+                if analysis_task is not None and not analysis_task.done():
+                    await manager.emit(
+                        websocket,
+                        "error",
+                        error_type="UNKNOWN",
+                        message="Another analysis is already running on this connection",
+                        hint="Wait for analysis_completed before starting a new analysis.",
                     )
-                except asyncio.TimeoutError:
-                    run_id = getattr(coordinator, "_environment", None)
-                    run_id = getattr(run_id, "current_run_id", None)
-                    await manager.send_personal({
-                        "type": "error",
-                        **build_timeout_error(
-                            target=target or "",
-                            timeout_seconds=timeout_seconds,
-                            run_id=run_id,
-                            hint_suffix="Use /api/analyze/jobs for resilient background execution.",
-                        ),
-                        "timestamp": datetime.now().isoformat(),
-                    }, websocket)
                     continue
-
-                # 发送完成通知
-                html_generator = get_html_generator()
-                html_path = html_generator.generate_html(result)
-
-                await manager.send_personal({
-                    "type": "analysis_completed",
-                    "target": result.target,
-                    "duration": result.duration,
-                    "total_discoveries": result.metadata.get("total_discoveries", 0),
-                    "html_report": f"/static/{Path(html_path).name}",
-                    "timestamp": datetime.now().isoformat(),
-                }, websocket)
+                # 分析在独立任务中执行，期间仍可响应 ping
+                analysis_task = asyncio.create_task(_ws_analyze(websocket, loop, data))
 
             elif data.get("action") == "ping":
-                await manager.send_personal({
-                    "type": "pong",
-                    "timestamp": datetime.now().isoformat(),
-                }, websocket)
+                await manager.emit(websocket, "pong")
 
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception as e:
-        await manager.send_personal({
-            "type": "error",
-            "error_type": "UNKNOWN",
-            "message": str(e),
-            "hint": "Inspect server logs for traceback and upstream failures.",
-            "timestamp": datetime.now().isoformat(),
-        }, websocket)
-        manager.disconnect(websocket)
+        await manager.emit(
+            websocket,
+            "error",
+            error_type="UNKNOWN",
+            message=str(e),
+            hint="Inspect server logs for traceback and upstream failures.",
+        )
+        await manager.flush_and_disconnect(websocket)
+    finally:
+        if analysis_task is not None and not analysis_task.done():
+            analysis_task.cancel()
+
+
+async def _ws_analyze(
+    websocket: WebSocket,
+    loop: asyncio.AbstractEventLoop,
+    data: dict[str, Any],
+) -> None:
+    """执行一次 WebSocket 分析请求，推送进度、完成或错误事件。"""
+    target = data.get("target")
+    competitors = data.get("competitors")
+    focus_areas = data.get("focus_areas")
+
+    # 发送分析开始通知
+    await manager.emit(websocket, "analysis_started", target=target)
+
+    on_phase_start, on_phase_complete, on_agent_start = _build_ws_progress_callbacks(
+        loop=loop,
+        websocket=websocket,
+    )
+    coordinator = _build_coordinator(
+        on_phase_start=on_phase_start,
+        on_phase_complete=on_phase_complete,
+        on_agent_start=on_agent_start,
+    )
+    timeout_seconds = resolve_sync_timeout_seconds()
+    try:
+        payload = await _run_analysis(
+            coordinator,
+            target,
+            competitors,
+            focus_areas,
+            timeout_seconds=timeout_seconds,
+        )
+    except asyncio.TimeoutError:
+        run_id = getattr(coordinator, "_environment", None)
+        run_id = getattr(run_id, "current_run_id", None)
+        await manager.emit(
+            websocket,
+            "error",
+            **build_timeout_error(
+                target=target or "",
+                timeout_seconds=timeout_seconds,
+                run_id=run_id,
+                hint_suffix="Use /api/analyze/jobs for resilient background execution.",
+            ),
+        )
+        return
+    except Exception as e:
+        logger.exception("analysis.ws failed target=%s error=%s", target, e)
+        await manager.emit(
+            websocket,
+            "error",
+            error_type="UNKNOWN",
+            message=str(e),
+            hint="Inspect server logs for traceback and upstream failures.",
+        )
+        return
+
+    # 发送完成通知
+    await manager.emit(
+        websocket,
+        "analysis_completed",
+        target=payload.target,
+        duration=payload.duration,
+        total_discoveries=payload.total_discoveries,
+        html_report=payload.html_report,
+        json_data=payload.json_data,
+    )
 
 
 def get_dashboard_html() -> str:
@@ -850,15 +1176,7 @@ def get_dashboard_html() -> str:
                     reject(new Error(`WebSocket closed before completion (code=${code})`));
                 };
 
-                ws.onmessage = (event) => {
-                    if (finished) return;
-                    let message = {};
-                    try {
-                        message = JSON.parse(event.data);
-                    } catch (error) {
-                        return;
-                    }
-
+                const handleMessage = (message) => {
                     if (message.type === 'connected') {
                         ws.send(JSON.stringify({
                             action: 'analyze',
@@ -913,6 +1231,23 @@ def get_dashboard_html() -> str:
                         reject(new Error(message.message || 'WebSocket analysis failed'));
                     }
                 };
+
+                ws.onmessage = (event) => {
+                    if (finished) return;
+                    let message = {};
+                    try {
+                        message = JSON.parse(event.data);
+                    } catch (error) {
+                        return;
+                    }
+
+                    // 服务端会把同一时间窗内的进度事件合并为 batch 帧
+                    const events = message.type === 'batch' ? (message.events || []) : [message];
+                    for (const item of events) {
+                        if (finished) return;
+                        handleMessage(item);
+                    }
+                };
             });
         }
 
@@ -1070,3 +1405,11 @@ def get_dashboard_html() -> str:
     </script>
 </body>
 </html>'''
+
+
+# 仪表盘页面是静态内容：导入时编码并 gzip 压缩一次，并预先计算各编码的 ETag
+_DASHBOARD_BYTES = get_dashboard_html().encode("utf-8")
+_DASHBOARD_GZIP = gzip.compress(_DASHBOARD_BYTES, compresslevel=9, mtime=0)
+_DASHBOARD_DIGEST = hashlib.blake2b(_DASHBOARD_BYTES, digest_size=8).hexdigest()
+_DASHBOARD_ETAG = f'"{_DASHBOARD_DIGEST}"'
+_DASHBOARD_GZIP_ETAG = f'"{_DASHBOARD_DIGEST}-gzip"'
@@ -4,15 +4,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from pathlib import Path
 from typing import Any
 
-from src.coordinator import Coordinator
+from src.coordinator import Coordinator, get_shared_search_tool
 from src.environment import StigmergyEnvironment
 from src.error_types import ErrorType
 from src.reporting import get_html_generator
@@ -91,6 +91,11 @@ def resolve_sync_timeout_seconds() -> int:
         return 300
 
 
+def build_static_url(report_path: str | os.PathLike[str]) -> str:
+    """将报告文件路径转为 /static 下的访问地址（只取文件名，不构造 Path 对象）。"""
+    return f"/static/{os.path.basename(report_path)}"
+
+
 def build_timeout_error(
     *,
     target: str,
@@ -257,6 +262,7 @@ class AnalysisJobManager:
 
         coordinator = Coordinator(
             environment=environment,
+            search_tool=get_shared_search_tool(),
             on_phase_start=on_phase_start,
             on_phase_complete=on_phase_complete,
             on_agent_start=on_agent_start,
@@ -283,8 +289,8 @@ class AnalysisJobManager:
                 "target": result.target,
                 "duration": result.duration,
                 "total_discoveries": result.metadata.get("total_discoveries", 0),
-                "html_report": f"/static/{Path(html_path).name}",
-                "json_data": f"/static/{Path(json_path).name}",
+                "html_report": build_static_url(html_path),
+                "json_data": build_static_url(json_path),
             }
             await self._mark_succeeded(
                 job_id,
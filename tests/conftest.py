@@ -9,6 +9,22 @@ from src.llm import LLMClient, LLMResponse
 from src.agents.base import AgentType
 
 
+@pytest.fixture(autouse=True)
+def _isolated_quota_file(tmp_path, monkeypatch):
+    """配额数据库写到临时目录，测试不在工作区留下 data/cache 文件。"""
+    from src.search import quota
+
+    monkeypatch.setattr(quota, "DEFAULT_QUOTA_FILE", tmp_path / "quota.sqlite")
+
+
+@pytest.fixture(autouse=True)
+def _no_tavily_warmup(monkeypatch):
+    """间接创建的 Tavily 客户端不在后台访问真实网络。"""
+    from src.search.providers.tavily import TavilySearchTool
+
+    monkeypatch.setattr(TavilySearchTool, "_warm_connection", lambda self, client: None)
+
+
 @pytest.fixture
 def mock_llm_response():
     """Mock LLM 响应。"""
@@ -50,9 +66,9 @@ def sample_discovery():
 
 
 @pytest.fixture
-def sample_environment(sample_discovery):
+def sample_environment(sample_discovery, tmp_path):
     """示例环境（包含一些数据）。"""
-    env = StigmergyEnvironment(cache_path="test_cache")
+    env = StigmergyEnvironment(cache_path=str(tmp_path / "cache"))
     env.add_discovery(
         agent_type="scout",
         content="Notion 是一款笔记和协作工具",
@@ -64,14 +80,14 @@ def sample_environment(sample_discovery):
 
 
 @pytest.fixture
-def empty_environment():
-    """空环境。"""
-    return StigmergyEnvironment(cache_path="test_cache")
+def empty_environment(tmp_path):
+    """空环境（缓存目录按测试隔离，可并行运行）。"""
+    return StigmergyEnvironment(cache_path=str(tmp_path / "cache"))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_config():
-    """示例配置数据。"""
+    """示例配置数据（只读，整个会话共享）。"""
     from src.utils.config import Config, ModelConfig, AgentConfig, AgentsConfig, CacheConfig, SchedulerConfig, OutputConfig
     return Config(
         model=ModelConfig(
@@ -369,3 +369,38 @@ def test_convert_report_generates_markdown_and_optionally_deletes_json(tmp_path)
     content = expected_md.read_text(encoding="utf-8")
     assert "# Anker 竞品分析（可读版）" in content
     assert "## 一页结论（先看这里）" in content
+
+
+def test_serve_passes_workers_and_hints_missing_accelerators(monkeypatch):
+    """serve 传递工作进程数，自动重载时固定单进程，并提示缺失的加速依赖。"""
+    import uvicorn
+
+    from src import server
+
+    calls: list[dict[str, Any]] = []
+    monkeypatch.setattr(uvicorn, "run", lambda app, **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(server.importlib.util, "find_spec", lambda name: None)
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["serve", "--workers", "4"])
+    reload_result = runner.invoke(cli, ["serve", "--workers", "4", "--reload"])
+
+    assert result.exit_code == 0
+    assert reload_result.exit_code == 0
+    assert [call["workers"] for call in calls] == [4, 1]
+    assert "httptools" in result.output
+    assert (calls[0]["http"], calls[0]["ws"]) == ("h11", "auto")
+
+
+def test_server_implementations_pin_installed_accelerators(monkeypatch):
+    """已安装加速依赖时固定使用 uvloop / httptools / websockets。"""
+    from src import server
+
+    monkeypatch.setattr(server.sys, "platform", "linux")
+    monkeypatch.setattr(server.importlib.util, "find_spec", lambda name: object())
+
+    assert server.server_implementations() == {
+        "loop": "uvloop",
+        "http": "httptools",
+        "ws": "websockets",
+    }
@@ -0,0 +1,105 @@
+"""测试配置加载。"""
+
+import os
+
+import pytest
+
+from src.utils import config as config_module
+from src.utils.config import load_agent_prompt, load_config
+
+AGENTS_YAML = "agents:\n" + "".join(
+    f"  {agent_type}:\n    name: {agent_type}\n" for agent_type in config_module.AGENT_TYPES
+)
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """隔离的配置文件与提示词目录。"""
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    monkeypatch.setattr(config_module, "PROMPTS_DIR", prompts_dir)
+
+    path = tmp_path / "config.yaml"
+    path.write_text(AGENTS_YAML, encoding="utf-8")
+    return path
+
+
+def _touch(path, mtime_ns):
+    """设置文件修改时间，避免依赖文件系统时间精度。"""
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestLoadConfigCache:
+    """测试按修改时间缓存配置。"""
+
+    def test_unchanged_file_returns_cached_config(self, config_file):
+        """测试文件未变化时返回同一个配置对象。"""
+        assert load_config(str(config_file)) is load_config(str(config_file))
+
+    def test_modified_file_is_reparsed(self, config_file):
+        """测试配置文件修改后重新解析。"""
+        _touch(config_file, 1_000_000_000)
+        first = load_config(str(config_file))
+
+        config_file.write_text(AGENTS_YAML + "scheduler:\n  max_concurrent: 9\n", encoding="utf-8")
+        _touch(config_file, 2_000_000_000)
+        second = load_config(str(config_file))
+
+        assert first.scheduler.max_concurrent == 4
+        assert second.scheduler.max_concurrent == 9
+
+    def test_modified_prompt_is_reinjected(self, config_file):
+        """测试提示词文件修改后配置中的提示词同步更新。"""
+        prompt = config_module.PROMPTS_DIR / "scout.md"
+        prompt.write_text("---\ntitle: x\n---\n旧提示词\n", encoding="utf-8")
+        _touch(prompt, 1_000_000_000)
+        first = load_config(str(config_file))
+
+        prompt.write_text("新提示词", encoding="utf-8")
+        _touch(prompt, 2_000_000_000)
+        second = load_config(str(config_file))
+
+        assert first.agents.scout.system_prompt == "旧提示词"
+        assert second.agents.scout.system_prompt == "新提示词"
+        assert second.agents.elite.system_prompt == "You are a elite."
+        assert load_agent_prompt("missing") is None
+
+    def test_missing_file_raises(self, tmp_path):
+        """测试配置文件不存在时抛出 FileNotFoundError。"""
+        with pytest.raises(FileNotFoundError):
+            load_config(str(tmp_path / "missing.yaml"))
+
+    def test_configured_prompt_is_not_overridden(self, config_file):
+        """测试配置中已指定的提示词不会被文件内容覆盖。"""
+        (config_module.PROMPTS_DIR / "market.md").write_text("文件提示词", encoding="utf-8")
+        (config_module.PROMPTS_DIR / "scout.md").write_text("文件提示词", encoding="utf-8")
+        config_file.write_text(
+            AGENTS_YAML.replace("name: market\n", "name: market\n    system_prompt: 配置提示词\n"),
+            encoding="utf-8",
+        )
+
+        config = load_config(str(config_file))
+
+        assert config.agents.market.system_prompt == "配置提示词"
+        assert config.agents.scout.system_prompt == "文件提示词"
+
+
+class TestAgentPromptFrontmatter:
+    """测试提示词 frontmatter 处理。"""
+
+    @pytest.mark.parametrize(
+        ("content", "expected"),
+        [
+            ("---\ntitle: x\n---\n正文\n---\n尾部", "正文\n---\n尾部"),
+            ("---\ntitle: x\n---", ""),
+            ("---\n未闭合\n", "---\n未闭合"),
+            ("---\ntitle: x\n---  \n正文", "---\ntitle: x\n---  \n正文"),
+            ("正文\n---\n其他", "正文\n---\n其他"),
+        ],
+    )
+    def test_strips_only_leading_frontmatter(self, tmp_path, monkeypatch, content, expected):
+        """测试仅移除以 --- 开头、以单独 --- 行结束的 frontmatter。"""
+        monkeypatch.setattr(config_module, "PROMPTS_DIR", tmp_path)
+        (tmp_path / "scout.md").write_text(content, encoding="utf-8")
+
+        assert load_agent_prompt("scout") == expected
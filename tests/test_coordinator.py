@@ -2,10 +2,16 @@
 
 import logging
 from typing import Any
+from unittest.mock import MagicMock
 
+import httpx
 import pytest
 
 from src.agents.base import AgentResult
+from src import coordinator as coordinator_module
+from src.search import http as search_http
+from src.search.providers.tavily import TavilySearchTool
+from src.search.providers.wikipedia import WikipediaSearchTool
 from src.coordinator import Coordinator
 from src.core.phase_executor import Phase, PhaseProgress
 
@@ -280,3 +286,111 @@ def test_analyze_logs_structured_phase_errors(monkeypatch, caplog, empty_environ
     assert "phase=debate" in log_text
     assert "agent_type=red_team" in log_text
     assert "error_type=UNKNOWN" in log_text
+
+
+def test_shared_search_tool_is_created_once_and_reset(monkeypatch):
+    """共享搜索工具应只创建一次，reset_coordinator 后重新创建。"""
+    created = []
+    monkeypatch.setattr(coordinator_module, "_search_tool", None)
+    monkeypatch.setattr(coordinator_module, "_search_tool_ready", False)
+    monkeypatch.setattr(
+        coordinator_module,
+        "_create_search_tool",
+        lambda: created.append(object()) or created[-1],
+    )
+
+    first = coordinator_module.get_shared_search_tool()
+    assert coordinator_module.get_shared_search_tool() is first
+
+    coordinator_module.reset_coordinator()
+    assert coordinator_module.get_shared_search_tool() is not first
+    assert len(created) == 2
+
+
+def test_shared_search_tool_caches_failure(monkeypatch):
+    """创建失败返回 None 后不再重复尝试，直到 reset_coordinator。"""
+    calls = []
+    monkeypatch.setattr(coordinator_module, "_search_tool", None)
+    monkeypatch.setattr(coordinator_module, "_search_tool_ready", False)
+    monkeypatch.setattr(coordinator_module, "_create_search_tool", lambda: calls.append(1))
+
+    assert coordinator_module.get_shared_search_tool() is None
+    assert coordinator_module.get_shared_search_tool() is None
+    assert len(calls) == 1
+
+    coordinator_module.reset_coordinator()
+    coordinator_module.get_shared_search_tool()
+    assert len(calls) == 2
+
+
+def test_shared_search_tool_created_once_under_concurrency(monkeypatch):
+    """并发首次获取时只创建一个搜索工具。"""
+    import threading
+    import time as time_module
+
+    created = []
+
+    def slow_create():
+        time_module.sleep(0.05)
+        created.append(object())
+        return created[-1]
+
+    monkeypatch.setattr(coordinator_module, "_search_tool", None)
+    monkeypatch.setattr(coordinator_module, "_search_tool_ready", False)
+    monkeypatch.setattr(coordinator_module, "_create_search_tool", slow_create)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(coordinator_module.get_shared_search_tool()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(result is created[0] for result in results)
+
+
+def test_reset_coordinator_closes_shared_search_tool(monkeypatch):
+    """reset_coordinator 关闭搜索工具，但不关闭进程内共享的 HTTP 客户端。"""
+    tool = MagicMock()
+    closed_clients = []
+    monkeypatch.setattr(coordinator_module, "_search_tool", None)
+    monkeypatch.setattr(coordinator_module, "_search_tool_ready", False)
+    monkeypatch.setattr(coordinator_module, "_create_search_tool", lambda: tool)
+    monkeypatch.setattr(search_http, "close_clients", lambda: closed_clients.append(1))
+
+    assert coordinator_module.get_shared_search_tool() is tool
+    coordinator_module.reset_coordinator()
+
+    tool.close.assert_called_once_with()
+    assert closed_clients == []
+
+    # 未创建过搜索工具时重置不做任何关闭
+    coordinator_module.reset_coordinator()
+    assert tool.close.call_count == 1
+
+
+def test_providers_still_send_requests_after_reset(monkeypatch):
+    """reset_coordinator 之后，持有共享客户端的 Wikipedia/Tavily 单例仍能发出请求。"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.host)
+        if request.url.host.endswith("wikipedia.org"):
+            return httpx.Response(200, json={"query": {"pages": [{"index": 1, "title": "Notion", "extract": "笔记"}]}})
+        return httpx.Response(200, json={"results": [{"url": "https://example.com/a", "title": "A"}]})
+
+    monkeypatch.setattr(search_http, "_client", httpx.Client(transport=httpx.MockTransport(handler)))
+    wikipedia = WikipediaSearchTool(cache_enabled=False)
+    tavily = TavilySearchTool(api_key="test-key", semantic_cache_enabled=False, warm_connection=False)
+    monkeypatch.setattr(coordinator_module, "_search_tool", MagicMock())
+    monkeypatch.setattr(coordinator_module, "_search_tool_ready", True)
+
+    coordinator_module.reset_coordinator()
+
+    assert wikipedia.search("Notion")
+    assert tavily.search("Notion")
+    assert requests == ["zh.wikipedia.org", "api.tavily.com"]
@@ -1,8 +1,7 @@
 """测试共享环境模块。"""
 
+import json
 import pytest
-import tempfile
-import shutil
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -19,18 +18,20 @@ if phase_executor_module.SIGNALS_AVAILABLE:
     )
 
 
+@pytest.fixture(scope="module")
+def shared_tmp(tmp_path_factory):
+    """模块内共享的缓存目录，落盘测试各自使用不同的文件名。"""
+    return tmp_path_factory.mktemp("environment")
+
+
 class TestStigmergyEnvironment:
     """测试 StigmergyEnvironment 类。"""
 
-    def setup_method(self):
-        """每个测试方法前的设置。"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.env = StigmergyEnvironment(cache_path=self.temp_dir)
-
-    def teardown_method(self):
-        """每个测试方法后的清理。"""
-        if Path(self.temp_dir).exists():
-            shutil.rmtree(self.temp_dir)
+    @pytest.fixture(autouse=True)
+    def _setup(self, shared_tmp):
+        """每个测试方法前的设置：默认使用不落盘的环境。"""
+        self.temp_dir = str(shared_tmp)
+        self.env = StigmergyEnvironment(persistent=False)
 
     def test_add_discovery(self):
         """测试添加发现。"""
@@ -115,6 +116,16 @@ class TestStigmergyEnvironment:
         assert len(relevant) == 1
         assert "高质量" in relevant[0].content
 
+    def test_get_relevant_discoveries_by_agent_and_quality(self):
+        """按 Agent 类型与最低质量同时筛选。"""
+        keep = self.env.add_discovery("scout", "高分", DiscoverySource.WEBSITE, quality_score=0.8)
+        self.env.add_discovery("scout", "低分", DiscoverySource.WEBSITE, quality_score=0.2)
+        self.env.add_discovery("market", "其他 Agent", DiscoverySource.ANALYSIS, quality_score=0.9)
+
+        relevant = self.env.get_relevant_discoveries(agent_type="scout", min_quality=0.5)
+
+        assert relevant == [keep]
+
     def test_virtual_pheromone(self):
         """测试虚拟信息素机制。"""
         # 添加第一个发现
@@ -142,6 +153,18 @@ class TestStigmergyEnvironment:
         hot_ids = [d.id for d in hot]
         assert discovery1.id in hot_ids
 
+    def test_hot_discoveries_top_k_order(self):
+        """热门发现按引用数降序，同引用数时按插入顺序，只返回前 limit 个。"""
+        a = self.env.add_discovery("scout", "a", DiscoverySource.WEBSITE)
+        b = self.env.add_discovery("scout", "b", DiscoverySource.WEBSITE)
+        c = self.env.add_discovery("scout", "c", DiscoverySource.WEBSITE)
+        self.env.add_discovery("market", "引用 c", DiscoverySource.ANALYSIS, references=[c.id])
+        self.env.add_discovery("market", "再引用 c", DiscoverySource.ANALYSIS, references=[c.id])
+        self.env.add_discovery("market", "引用 a 与 b", DiscoverySource.ANALYSIS, references=[a.id, b.id])
+
+        assert self.env.get_hot_discoveries(limit=2) == [c, a]
+        assert self.env.get_hot_discoveries(limit=3) == [c, a, b]
+
     def test_cross_agent_insights(self):
         """测试跨 Agent 洞察。"""
         # 添加被引用的发现
@@ -173,10 +196,33 @@ class TestStigmergyEnvironment:
         assert len(insights) >= 1
         assert discovery1.id in [i["discovery_id"] for i in insights]
 
-    def test_save_and_load(self):
-        """测试保存和加载。"""
+    def test_cross_agent_insights_referrer_agents(self):
+        """引用方 Agent 类型应去重、排除自身，并随引用方移除同步更新。"""
+        env = StigmergyEnvironment(persistent=False, max_discoveries=4)
+        target = env.add_discovery("scout", "被引用", DiscoverySource.WEBSITE)
+        env.add_discovery("scout", "自引用", DiscoverySource.WEBSITE, references=[target.id])
+        env.add_discovery("market", "市场 1", DiscoverySource.ANALYSIS, references=[target.id])
+        env.add_discovery("market", "市场 2", DiscoverySource.ANALYSIS, references=[target.id])
+
+        [insight] = env.get_cross_agent_insights()
+        assert insight["referenced_by"] == ["market"]
+        assert insight["reference_count"] == 3
+
+        # 删除引用方后，其 Agent 类型计数同步减少
+        for discovery in env.get_discoveries_by_agent("market"):
+            env._remove_discovery(discovery.id)
+        assert env.get_cross_agent_insights() == []
+        assert env._discovery_referrer_agents[target.id] == {"scout": 1}
+
+    @pytest.mark.parametrize("filename", ["test_env.json", "test_env.msgpack"])
+    def test_save_and_load(self, filename):
+        """测试保存和加载（JSON 与 msgpack 两种格式）。"""
+        self.env = StigmergyEnvironment(cache_path=self.temp_dir)
+        if filename.endswith(".msgpack"):
+            pytest.importorskip("msgpack")
+
         # 添加数据
-        self.env.add_discovery(
+        discovery = self.env.add_discovery(
             agent_type="scout",
             content="测试发现",
             source=DiscoverySource.WEBSITE,
@@ -184,14 +230,71 @@ class TestStigmergyEnvironment:
         )
 
         # 保存
-        self.env.save("test_env.json")
+        self.env.save(filename)
 
         # 创建新环境并加载
         new_env = StigmergyEnvironment(cache_path=self.temp_dir)
-        success = new_env.load("test_env.json")
+        success = new_env.load(filename)
 
         assert success is True
         assert new_env.discovery_count == 1
+        assert new_env.get_discovery(discovery.id) == discovery
+
+    def test_save_writes_valid_json_incrementally(self):
+        """测试逐条写出的文件是合法 JSON，字段与引用关系完整。"""
+        self.env = StigmergyEnvironment(cache_path=self.temp_dir)
+        first = self.env.add_discovery("scout", "第一条", DiscoverySource.WEBSITE, quality_score=0.6)
+        second = self.env.add_discovery(
+            "analyst", "第二条", DiscoverySource.ANALYSIS, quality_score=0.8, references=[first.id]
+        )
+
+        self.env.save("streamed.json")
+        data = json.loads((Path(self.temp_dir) / "streamed.json").read_text(encoding="utf-8"))
+
+        assert [d["id"] for d in data["discoveries"]] == [first.id, second.id]
+        assert data["discoveries"][1]["references"] == [first.id]
+        assert {p["item_id"]: p["reference_count"] for p in data["pheromones"]} == {first.id: 1, second.id: 0}
+
+    def test_large_file_is_loaded_incrementally(self, monkeypatch):
+        """测试超过阈值的文件用 ijson 逐条加载，结果与整体解析一致。"""
+        self.env = StigmergyEnvironment(cache_path=self.temp_dir)
+        pytest.importorskip("ijson")
+        import src.environment as environment_module
+
+        first = self.env.add_discovery(
+            "scout", "第一条", DiscoverySource.WEBSITE, quality_score=0.6, metadata={"nested": {"k": [1, 2]}}
+        )
+        second = self.env.add_discovery(
+            "analyst", "第二条", DiscoverySource.ANALYSIS, quality_score=0.8, references=[first.id]
+        )
+        self.env.save("large.json")
+
+        monkeypatch.setattr(environment_module, "STREAM_LOAD_THRESHOLD", 0)
+        loaded = StigmergyEnvironment(cache_path=self.temp_dir)
+
+        assert loaded.load("large.json") is True
+        assert loaded.all_discoveries == [first, second]
+        assert loaded.current_run_id == self.env.current_run_id
+        assert [i["discovery_id"] for i in loaded.get_cross_agent_insights()] == [first.id]
+
+    def test_load_rejects_corrupt_file(self):
+        """测试损坏的文件加载失败而不抛出异常。"""
+        self.env = StigmergyEnvironment(cache_path=self.temp_dir)
+        (Path(self.temp_dir) / "broken.json").write_bytes(b"{not json")
+
+        assert self.env.load("broken.json") is False
+
+    def test_non_persistent_environment_skips_disk(self, tmp_path):
+        """测试不落盘的环境不创建目录，save / load 不读写文件。"""
+        cache_dir = tmp_path / "never-created"
+        env = StigmergyEnvironment(cache_path=str(cache_dir), persistent=False)
+        env.add_discovery("scout", "内存中", DiscoverySource.WEBSITE)
+
+        env.save("memory.json")
+
+        assert not cache_dir.exists()
+        assert env.load("memory.json") is False
+        assert env.discovery_count == 1
 
     def test_clear(self):
         """测试清空环境。"""
@@ -227,6 +330,34 @@ class TestStigmergyEnvironment:
 
         assert self.env.discovery_count == 2
 
+    def test_discovery_indexes_follow_capacity_eviction_and_load(self):
+        """反向索引应随容量淘汰与加载同步，查询结果保持插入顺序。"""
+        env = StigmergyEnvironment(cache_path=self.temp_dir, max_discoveries=3)
+        first = env.add_discovery("scout", "a", DiscoverySource.WEBSITE, quality_score=0.9)
+        second = env.add_discovery("scout", "b", DiscoverySource.WEBSITE, quality_score=0.4)
+        third = env.add_discovery(
+            "analyst", "c", DiscoverySource.ANALYSIS, quality_score=0.9, references=[first.id, second.id]
+        )
+        fourth = env.add_discovery("analyst", "d", DiscoverySource.ANALYSIS, quality_score=0.6)
+
+        # 超出容量后最旧的 first 被淘汰，其引用关系不再出现在洞察中
+        assert env.get_discovery(first.id) is None
+        assert env.get_discoveries_by_agent("scout") == [second]
+        assert [d.id for d in env.get_relevant_discoveries(min_quality=0.5)] == [third.id, fourth.id]
+        assert [d.id for d in env.get_hot_discoveries(limit=2)] == [second.id, third.id]
+        assert [i["discovery_id"] for i in env.get_cross_agent_insights()] == [second.id]
+
+        env.save("indexed.json")
+        loaded = StigmergyEnvironment(cache_path=self.temp_dir, max_discoveries=3)
+        assert loaded.load("indexed.json") is True
+        assert loaded.get_discoveries_by_agent("analyst") == [third, fourth]
+        assert [d.id for d in loaded.get_relevant_discoveries(min_quality=0.5)] == [third.id, fourth.id]
+        assert [i["discovery_id"] for i in loaded.get_cross_agent_insights()] == [second.id]
+
+        loaded.clear()
+        assert loaded.get_discoveries_by_agent("analyst") == []
+        assert loaded.get_relevant_discoveries() == []
+
     def test_discovery_compat_metadata_contains_migration_deadline(self):
         """Discovery 兼容层应带迁移截止日期元数据。"""
         discovery = self.env.add_discovery(
@@ -241,7 +372,7 @@ class TestStigmergyEnvironment:
 
     def test_run_isolation_filters_discoveries(self):
         """启用 run 隔离时，应只暴露当前 run 的数据。"""
-        env = StigmergyEnvironment(cache_path=self.temp_dir, run_isolation=True)
+        env = StigmergyEnvironment(persistent=False, run_isolation=True)
 
         env.begin_run("run-a", clear=True)
         env.add_discovery(
@@ -271,7 +402,7 @@ class TestStigmergyEnvironment:
     @pytest.mark.skipif(not phase_executor_module.SIGNALS_AVAILABLE, reason="Signal schema not available")
     def test_signal_ttl_eviction(self):
         """Signal TTL 到期后应被自动清理。"""
-        env = StigmergyEnvironment(cache_path=self.temp_dir, signal_ttl_hours=1, max_signals=10)
+        env = StigmergyEnvironment(persistent=False, signal_ttl_hours=1, max_signals=10)
 
         old_signal = Signal(
             id="old-signal",
@@ -308,7 +439,7 @@ class TestStigmergyEnvironment:
     @pytest.mark.skipif(not phase_executor_module.SIGNALS_AVAILABLE, reason="Signal schema not available")
     def test_signal_capacity_eviction(self):
         """Signal 超过最大容量时应淘汰最旧数据。"""
-        env = StigmergyEnvironment(cache_path=self.temp_dir, signal_ttl_hours=24, max_signals=2)
+        env = StigmergyEnvironment(persistent=False, signal_ttl_hours=24, max_signals=2)
 
         for idx in range(3):
             signal = Signal(
@@ -333,7 +464,7 @@ class TestStigmergyEnvironment:
     @pytest.mark.skipif(not phase_executor_module.SIGNALS_AVAILABLE, reason="Signal schema not available")
     def test_signal_graph_edge_queries_include_reference_and_debate_edges(self):
         """图边查询应返回引用边和辩论关系边。"""
-        env = StigmergyEnvironment(cache_path=self.temp_dir, signal_ttl_hours=24, max_signals=20)
+        env = StigmergyEnvironment(persistent=False, signal_ttl_hours=24, max_signals=20)
 
         base = Signal(
             id="sig-base",
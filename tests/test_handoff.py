@@ -35,7 +35,10 @@ class TestHandoffContext:
         assert context.source_discovery_id is None
         assert context.reasoning == ""
         assert context.relevant_data == {}
-        assert context.suggested_actions == []
+        assert context.suggested_actions == ()
+        # 空默认值为共用的只读对象，不为每个实例分配
+        assert HandoffContext().relevant_data is context.relevant_data
+        assert HandoffContext().suggested_actions is context.suggested_actions
 
 
 class TestHandoff:
@@ -111,6 +114,28 @@ class TestHandoff:
         assert handoff.status == HandoffStatus.PENDING
 
 
+    def test_handoff_dict_round_trip(self):
+        """测试 to_dict / from_dict 往返一致，未知枚举值仍抛出 ValueError。"""
+        handoff = Handoff(
+            id="handoff-rt",
+            from_agent="scout",
+            to_agent="market",
+            context=HandoffContext(reasoning="往返", suggested_actions=["a"]),
+            priority=HandoffPriority.CRITICAL,
+            status=HandoffStatus.IN_PROGRESS,
+            created_at="2024-01-01T00:00:00",
+            updated_at="2024-01-01T00:00:01",
+            result="ok",
+        )
+
+        data = handoff.to_dict()
+        assert Handoff.from_dict(data) == handoff
+
+        data["priority"] = "urgent"
+        with pytest.raises(ValueError):
+            Handoff.from_dict(data)
+
+
 class TestHandoffManager:
     """测试 HandoffManager 类。"""
 
@@ -178,6 +203,44 @@ class TestHandoffManager:
         # 高优先级应该排在前面
         assert pending[0].priority == HandoffPriority.HIGH
 
+    def test_pending_handoffs_keep_priority_then_creation_order(self):
+        """测试待处理交接按优先级、同优先级按创建顺序返回，并随状态变化更新。"""
+        context = HandoffContext(reasoning="排序")
+        low = self.manager.create_handoff("scout", "market", context, HandoffPriority.LOW)
+        first = self.manager.create_handoff("scout", "technical", context, HandoffPriority.HIGH)
+        critical = self.manager.create_handoff("scout", "market", context, HandoffPriority.CRITICAL)
+        second = self.manager.create_handoff("scout", "technical", context, HandoffPriority.HIGH)
+
+        assert self.manager.get_pending_handoffs() == [critical, first, second, low]
+        assert self.manager.get_pending_handoffs(to_agent="market") == [critical, low]
+
+        self.manager.update_status(first.id, HandoffStatus.IN_PROGRESS)
+        self.manager.cancel_handoff(low.id)
+        assert self.manager.get_pending_handoffs() == [critical, second]
+        assert self.manager.get_pending_handoffs(to_agent="market") == [critical]
+        assert self.manager.pending_count == 2
+
+        # 重新回到待处理状态时恢复原来的创建顺序
+        self.manager.update_status(first.id, HandoffStatus.PENDING)
+        assert self.manager.get_pending_handoffs(to_agent="technical") == [first, second]
+        assert self.manager.get_pending_handoffs(to_agent="unknown") == []
+
+    def test_handoffs_by_target_agent_include_finished(self):
+        """测试按目标 Agent 查询返回全部状态的交接，上下文只取待处理的。"""
+        done_context = HandoffContext(reasoning="已完成")
+        open_context = HandoffContext(reasoning="待处理")
+        done = self.manager.create_handoff("scout", "technical", done_context, HandoffPriority.HIGH)
+        other = self.manager.create_handoff("market", "technical", open_context, HandoffPriority.LOW)
+        self.manager.create_handoff("scout", "market", open_context)
+        self.manager.update_status(done.id, HandoffStatus.COMPLETED)
+
+        assert self.manager.get_handoffs_by_agents(to_agent="technical") == [done, other]
+        assert self.manager.get_handoffs_by_agents(from_agent="market", to_agent="technical") == [other]
+        assert self.manager.get_context_for_agent("technical") == [open_context]
+
+        self.manager.clear()
+        assert self.manager.get_handoffs_by_agents(to_agent="technical") == []
+
     def test_get_pending_handoffs_by_agent(self):
         """测试按目标 Agent 获取待处理交接。"""
         context1 = HandoffContext()
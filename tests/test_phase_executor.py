@@ -531,7 +531,7 @@ def test_create_phase_executor_reads_quantitative_validation_switch(monkeypatch)
 
 
 @pytest.mark.skipif(not phase_executor_module.SIGNALS_AVAILABLE, reason="Signal schema not available")
-def test_validation_threshold_sensitivity_changes_verified_count(empty_environment):
+def test_validation_threshold_sensitivity_changes_verified_count(empty_environment, tmp_path):
     """更严格的验证阈值应减少通过数量。"""
     signals = [
         Signal(
@@ -570,7 +570,7 @@ def test_validation_threshold_sensitivity_changes_verified_count(empty_environme
     ]
 
     lenient_env = empty_environment
-    strict_env = type(lenient_env)(cache_path="test_cache_strict")
+    strict_env = type(lenient_env)(cache_path=str(tmp_path / "strict"))
     for signal in signals:
         lenient_env.add_signal(signal)
         strict_env.add_signal(signal)
@@ -678,7 +678,7 @@ def test_validation_phase_continues_on_single_signal_error(empty_environment, mo
 
 
 @pytest.mark.skipif(not phase_executor_module.SIGNALS_AVAILABLE, reason="Signal schema not available")
-def test_debate_step_sensitivity_changes_adjustment_strength():
+def test_debate_step_sensitivity_changes_adjustment_strength(tmp_path):
     """更高辩论步长应产生更明显的强度调整。"""
     base_signal = Signal(
         id="signal-step-sensitivity",
@@ -695,8 +695,8 @@ def test_debate_step_sensitivity_changes_adjustment_strength():
 
     from src.environment import StigmergyEnvironment
 
-    zero_step_env = StigmergyEnvironment(cache_path="test_cache_step_zero")
-    high_step_env = StigmergyEnvironment(cache_path="test_cache_step_high")
+    zero_step_env = StigmergyEnvironment(cache_path=str(tmp_path / "step_zero"))
+    high_step_env = StigmergyEnvironment(cache_path=str(tmp_path / "step_high"))
     zero_step_env.add_signal(base_signal)
     high_step_env.add_signal(base_signal)
 
@@ -2,12 +2,20 @@
 
 import pytest
 import asyncio
-from unittest.mock import MagicMock, AsyncMock
+import sys
+import time
+from types import MappingProxyType, SimpleNamespace
 
-from src.scheduler import SimpleScheduler, AgentTask, TaskStatus
+from src.handoff import HandoffContext
+from src.scheduler import EMPTY_CONTEXT, SimpleScheduler, AgentTask, TaskStatus
 from src.agents.base import AgentType, AgentResult
 
 
+def _fake_agent(agent_type: str = "scout") -> SimpleNamespace:
+    """只带 agent_type.value 的轻量 Agent 替身（get_errors 只读取该字段）。"""
+    return SimpleNamespace(agent_type=SimpleNamespace(value=agent_type))
+
+
 class MockAgent:
     """Mock Agent。"""
 
@@ -25,6 +33,24 @@ class MockAgent:
         )
 
 
+class SleepyMockAgent(MockAgent):
+    """每次执行前异步等待的 Mock Agent，用于验证并发调度。"""
+
+    delay = 0.1
+
+    async def execute_async(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        return self.execute(**kwargs)
+
+
+def _mk_tasks(n: int, context=EMPTY_CONTEXT) -> list[AgentTask]:
+    """批量构建共用同一只读上下文的任务。"""
+    return [
+        AgentTask(id=f"task-{i}", agent=MockAgent(AgentType.SCOUT, f"Agent-{i}"), context=context)
+        for i in range(n)
+    ]
+
+
 class TestSimpleScheduler:
     """测试 SimpleScheduler 类。"""
 
@@ -57,22 +83,86 @@ class TestSimpleScheduler:
     @pytest.mark.asyncio
     async def test_run_multiple_tasks(self):
         """测试并发运行多个任务。"""
-        tasks = []
-        for i in range(3):
-            agent = MockAgent(AgentType.SCOUT, f"Agent-{i}")
-            task = AgentTask(
-                id=f"task-{i}",
-                agent=agent,
-                context={"target": f"Product-{i}"},
-            )
-            tasks.append(task)
+        context = MappingProxyType({"target": "Notion"})
+        tasks = [
+            AgentTask(id=f"task-{i}", agent=SleepyMockAgent(AgentType.SCOUT, f"Agent-{i}"), context=context)
+            for i in range(3)
+        ]
 
+        start = time.perf_counter()
         result = await self.scheduler.run_tasks(tasks)
+        elapsed = time.perf_counter() - start
 
         assert result.total_tasks == 3
         assert result.completed_tasks == 3
         assert result.failed_tasks == 0
+        # max_concurrent=2：两批共约 0.2s，顺序执行则需 0.3s
+        assert elapsed < 2.5 * SleepyMockAgent.delay
+
+    @pytest.mark.asyncio
+    async def test_run_tasks_overlap_up_to_max_concurrent(self):
+        """测试任务真正并发执行，且同时运行数不超过 max_concurrent。"""
+        duration = 0.2
+        running = 0
+        peak = 0
+        spans = []
+
+        class TimedAgent:
+            agent_type = AgentType.SCOUT
+            name = "计时 Agent"
+
+            async def execute_async(self, **kwargs):
+                nonlocal running, peak
+                loop = asyncio.get_running_loop()
+                started = loop.time()
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(duration)
+                running -= 1
+                spans.append((started, loop.time()))
+                return AgentResult(agent_type="scout", agent_name=self.name, discoveries=[], handoffs_created=0)
+
+        tasks = [AgentTask(id=f"timed-{i}", agent=TimedAgent(), context={}) for i in range(4)]
+
+        result = await self.scheduler.run_tasks(tasks)
+
+        assert result.completed_tasks == 4
+        assert peak == 2
+        wall_clock = max(end for _, end in spans) - min(start for start, _ in spans)
+        assert wall_clock < duration * len(tasks)
+
+    @pytest.mark.asyncio
+    async def test_shared_context_is_passed_without_mutation(self):
+        """测试共用的只读上下文原样展开传给 Agent，附加 handoff 时不修改共用上下文。"""
+        received = []
+
+        class RecordingAgent:
+            agent_type = AgentType.SCOUT
+            name = "记录 Agent"
 
+            def execute(self, **kwargs):
+                received.append(kwargs)
+                return AgentResult(agent_type="scout", agent_name=self.name, discoveries=[], handoffs_created=0)
+
+        shared = MappingProxyType({"target": "Notion"})
+        plain = AgentTask(id="plain", agent=RecordingAgent(), context=shared)
+        handoff = AgentTask(
+            id="handoff",
+            agent=RecordingAgent(),
+            context=shared,
+            handoff_context=HandoffContext(reasoning="深入分析"),
+        )
+
+        await self.scheduler.run_tasks([plain, handoff])
+
+        assert {"target": "Notion"} in received
+        with_handoff = next(kwargs for kwargs in received if "_handoff" in kwargs)
+        assert with_handoff["target"] == "Notion"
+        assert with_handoff["_handoff"]["reasoning"] == "深入分析"
+        assert dict(shared) == {"target": "Notion"}
+        assert plain.to_dict()["context"] == {"target": "Notion"}
+
+    @pytest.mark.slow
     @pytest.mark.asyncio
     async def test_task_timeout(self):
         """测试任务超时。"""
@@ -81,9 +171,9 @@ class TestSimpleScheduler:
             agent_type = AgentType.SCOUT
             name = "慢速 Agent"
 
-            def execute(self, **kwargs):
-                import time
-                time.sleep(5)  # 超过超时时间
+            async def execute_async(self, **kwargs):
+                # 可取消的等待：超时后立即结束，不留下仍在睡眠的工作线程
+                await asyncio.sleep(5)  # 超过超时时间
                 return AgentResult(
                     agent_type="scout",
                     agent_name="慢速",
@@ -92,7 +182,7 @@ class TestSimpleScheduler:
                 )
 
         # 使用短超时
-        scheduler = SimpleScheduler(max_concurrent=1, timeout=1)
+        scheduler = SimpleScheduler(max_concurrent=1, timeout=1, retry_backoff=0)
         agent = SlowAgent()
         task = AgentTask(
             id="slow-task",
@@ -152,18 +242,22 @@ class TestSimpleScheduler:
         assert agent.calls == 2
         assert task.status == TaskStatus.FAILED
 
+    @pytest.mark.asyncio
+    async def test_unexpected_error_does_not_cancel_batch(self):
+        """单个任务的意外异常不应取消同批次的其他任务。"""
+        broken = AgentTask(id="broken", agent=SimpleNamespace(name="坏 Agent"), context={})
+        tasks = [broken, *_mk_tasks(2)]
+
+        result = await self.scheduler.run_tasks(tasks)
+
+        assert broken.status == TaskStatus.FAILED
+        assert result.completed_tasks == 2
+        assert result.failed_tasks == 1
+
     @pytest.mark.asyncio
     async def test_collect_results(self):
         """测试收集结果。"""
-        tasks = []
-        for i in range(2):
-            agent = MockAgent(AgentType.SCOUT, f"Agent-{i}")
-            task = AgentTask(
-                id=f"task-{i}",
-                agent=agent,
-                context={},
-            )
-            tasks.append(task)
+        tasks = _mk_tasks(2)
 
         await self.scheduler.run_tasks(tasks)
 
@@ -172,6 +266,15 @@ class TestSimpleScheduler:
         assert "scout" in results
         assert len(results["scout"]) == 2
 
+    def test_agent_task_uses_slots(self):
+        """AgentTask 使用 __slots__，实例不带 __dict__。"""
+        task = AgentTask(id="slim", agent=_fake_agent(), context=EMPTY_CONTEXT)
+
+        assert not hasattr(task, "__dict__")
+        assert sys.getsizeof(task) < 200
+        with pytest.raises(AttributeError):
+            task.extra = 1
+
     def test_get_errors(self):
         """测试获取错误。"""
         tasks = []
@@ -179,28 +282,38 @@ class TestSimpleScheduler:
         # 添加失败的任务
         task1 = AgentTask(
             id="failed-task",
-            agent=MagicMock(),
+            agent=_fake_agent(),
             context={},
         )
         task1.status = TaskStatus.FAILED
         task1.error = "测试错误"
-        task1.agent.agent_type = MagicMock()
-        task1.agent.agent_type.value = "scout"
         tasks.append(task1)
 
         # 添加成功的任务
         task2 = AgentTask(
             id="success-task",
-            agent=MagicMock(),
+            agent=_fake_agent(),
             context={},
         )
         task2.status = TaskStatus.COMPLETED
-        task2.agent.agent_type = MagicMock()
-        task2.agent.agent_type.value = "scout"
         tasks.append(task2)
 
         errors = self.scheduler.get_errors(tasks)
 
-        assert len(errors) == 1
-        assert errors[0]["task_id"] == "failed-task"
-        assert errors[0]["error"] == "测试错误"
+        assert errors == [{"task_id": "failed-task", "agent_type": "scout", "error": "测试错误"}]
+
+    def test_collect_results_groups_in_first_seen_order(self):
+        """结果按 Agent 类型分组，保持首次出现顺序；无 agent_type 的 Agent 归入 unknown。"""
+        specs = [("market", "m1"), ("scout", "s1"), ("market", "m2"), (None, "u1")]
+        tasks = []
+        for i, (agent_type, result) in enumerate(specs):
+            agent = _fake_agent(agent_type) if agent_type else SimpleNamespace()
+            task = AgentTask(id=f"t{i}", agent=agent, context=EMPTY_CONTEXT)
+            task.status = TaskStatus.COMPLETED
+            task.result = result
+            tasks.append(task)
+
+        results = self.scheduler.collect_results(tasks)
+
+        assert list(results) == ["market", "scout", "unknown"]
+        assert results["market"] == ["m1", "m2"]
@@ -0,0 +1,125 @@
+"""测试多源结果聚合器。"""
+
+from src.search.aggregator import ResultAggregator, SortStrategy
+from src.search.base import SearchProviderType, SearchResult
+
+
+def _result(url: str, score: float = 0.5, **kwargs) -> SearchResult:
+    return SearchResult(url=url, title=url, summary="", score=score, **kwargs)
+
+
+class TestResultAggregator:
+    """测试 ResultAggregator 类。"""
+
+    def test_aggregate_tags_and_deduplicates(self):
+        """测试聚合时标记来源并按 URL 去重保留高分结果。"""
+        aggregator = ResultAggregator()
+        provider_results = {
+            SearchProviderType.TAVILY: [
+                _result("https://example.com/a?utm_source=x", score=0.4),
+                _result("https://example.com/b", score=0.9),
+            ],
+            SearchProviderType.DUCKDUCKGO: [
+                _result("http://EXAMPLE.com/a", score=0.8),
+            ],
+        }
+
+        aggregated = aggregator.aggregate(provider_results, max_results=10)
+
+        assert aggregated.total_count == 3
+        assert aggregated.deduped_count == 2
+        assert aggregated.provider_counts == {
+            SearchProviderType.TAVILY: 2,
+            SearchProviderType.DUCKDUCKGO: 1,
+        }
+        assert [r.score for r in aggregated.results] == [0.9, 0.8]
+        assert aggregated.results[1].provider is SearchProviderType.DUCKDUCKGO
+
+    def test_aggregate_keeps_already_tagged_results(self):
+        """测试来源已正确标记的结果不会被重建。"""
+        aggregator = ResultAggregator()
+        tagged = _result("https://example.com/a", provider=SearchProviderType.GITHUB)
+
+        aggregated = aggregator.aggregate({SearchProviderType.GITHUB: [tagged]})
+
+        assert aggregated.results[0] is tagged
+
+    def test_aggregate_preserves_provider_tags(self):
+        """测试聚合保留搜索源自身标记的来源。"""
+        aggregator = ResultAggregator()
+        fallback = _result(
+            "https://example.com/a",
+            provider=SearchProviderType.SKILL_FALLBACK,
+        )
+
+        aggregated = aggregator.aggregate({SearchProviderType.TAVILY: [fallback]})
+
+        assert aggregated.results[0] is fallback
+        assert aggregated.provider_counts == {SearchProviderType.TAVILY: 1}
+
+    def test_aggregate_without_deduplication(self):
+        """测试关闭去重时保留全部结果并限制数量。"""
+        aggregator = ResultAggregator(
+            deduplication_enabled=False,
+            sort_strategy=SortStrategy.LATEST,
+        )
+        provider_results = {
+            SearchProviderType.WIKIPEDIA: [
+                _result("https://example.com/a", published_date="2024-01-01"),
+                _result("https://example.com/a", published_date="2025-01-01"),
+                _result("https://example.com/c"),
+            ],
+        }
+
+        aggregated = aggregator.aggregate(provider_results, max_results=2)
+
+        assert aggregated.deduped_count == 3
+        assert [r.published_date for r in aggregated.results] == ["2025-01-01", "2024-01-01"]
+
+    def test_normalize_url(self):
+        """测试 URL 标准化的快速路径与回退路径。"""
+        normalize = ResultAggregator._normalize_url
+
+        assert normalize("HTTP://Example.com/A?utm_source=x&b=1#top") == "https://example.com/a?b=1"
+        assert normalize("https://example.com") == "https://example.com"
+        assert normalize("https://example.com/p;v=1?gclid=2") == "https://example.com/p;v=1"
+        assert normalize("ftp://example.com/f?fbclid=1") == "https://example.com/f"
+
+    def test_top_k_selection_matches_full_sort(self):
+        """测试前 K 条选取与完整排序后截断结果一致（含并列评分）。"""
+        aggregator = ResultAggregator()
+        results = [
+            _result(f"https://example.com/{i}", score=(i * 7 % 5) / 5)
+            for i in range(30)
+        ]
+        expected = sorted(results, key=lambda r: r.score, reverse=True)[:4]
+
+        aggregated = aggregator.aggregate({SearchProviderType.TAVILY: results}, max_results=4)
+
+        assert [r.url for r in aggregated.results] == [r.url for r in expected]
+
+    def test_rrf_fuses_ranks_across_providers(self):
+        """测试 RRF 按名次融合，忽略各搜索源的原始评分尺度。"""
+        aggregator = ResultAggregator(sort_strategy=SortStrategy.RRF, rrf_k=60)
+        provider_results = {
+            SearchProviderType.TAVILY: [
+                _result("https://example.com/a", score=0.99),
+                _result("https://example.com/b", score=0.98),
+            ],
+            SearchProviderType.DUCKDUCKGO: [
+                _result("https://example.com/b", score=0.7),
+                _result("https://example.com/c", score=0.7),
+                _result("https://example.com/b", score=0.7),
+            ],
+        }
+
+        aggregated = aggregator.aggregate(provider_results, max_results=10)
+
+        assert [r.url for r in aggregated.results] == [
+            "https://example.com/b",
+            "https://example.com/a",
+            "https://example.com/c",
+        ]
+        assert aggregated.results[0].score == 1 / 62 + 1 / 61
+        assert aggregated.results[0].provider is SearchProviderType.TAVILY
+        assert aggregated.results[2].score == 1 / 62
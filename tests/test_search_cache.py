@@ -0,0 +1,112 @@
+"""测试搜索缓存模块。"""
+
+import time
+
+from src.search.base import SearchProviderType, SearchResult, SearchTimeRange
+from src.search.cache import CACHE_SUFFIX, SearchCache, TTLCache
+
+
+def _results() -> list[SearchResult]:
+    return [
+        SearchResult(
+            url="https://example.com/a",
+            title="标题",
+            summary="摘要",
+            score=0.7,
+            provider=SearchProviderType.TAVILY,
+        ),
+        SearchResult(url="https://example.com/b", title="B", summary=""),
+    ]
+
+
+class TestSearchCache:
+    """测试 SearchCache 类。"""
+
+    def test_set_and_get_round_trip(self, tmp_path):
+        """测试写入后读取结果一致。"""
+        cache = SearchCache(cache_dir=tmp_path)
+
+        cache.set("notion", _results(), SearchTimeRange.ONE_WEEK, 5)
+
+        assert cache.get("notion", SearchTimeRange.ONE_WEEK, 5) == _results()
+        assert cache.get("notion", SearchTimeRange.ONE_YEAR, 5) is None
+
+    def test_expired_entries_are_cleaned(self, tmp_path, monkeypatch):
+        """测试过期条目被统计并清理。"""
+        cache = SearchCache(cache_dir=tmp_path)
+        cache.set("old", _results(), ttl=1)
+        cache.set("new", _results(), ttl=3600)
+
+        later = time.time() + 10
+        monkeypatch.setattr("src.search.cache.time.time", lambda: later)
+
+        stats = cache.get_stats()
+        removed = cache.cleanup_expired()
+
+        assert stats["total_files"] == 2
+        assert stats["expired_files"] == 1
+        assert removed == 1
+        assert cache.get("new") == _results()
+        assert cache.get("old") is None
+
+    def test_corrupted_file_is_removed(self, tmp_path):
+        """测试损坏的缓存文件被清理。"""
+        cache = SearchCache(cache_dir=tmp_path)
+        (tmp_path / f"broken{CACHE_SUFFIX}").write_bytes(b"x")
+
+        assert cache.cleanup_expired() == 1
+        assert not list(tmp_path.glob(f"*{CACHE_SUFFIX}"))
+
+    def test_memory_tier_serves_hits_and_evicts(self, tmp_path):
+        """测试内存层命中无需读盘，并按 LRU 淘汰。"""
+        cache = SearchCache(cache_dir=tmp_path, memory_max_entries=1)
+        cache.set("a", _results())
+
+        for cache_file in tmp_path.glob(f"*{CACHE_SUFFIX}"):
+            cache_file.write_bytes(b"corrupted")
+        assert cache.get("a") == _results()
+
+        cache.set("b", _results())
+        assert cache.get("a") is None
+        assert cache.get("b") == _results()
+
+    def test_invalidate_drops_memory_entry(self, tmp_path):
+        """测试失效操作同时清除内存层。"""
+        cache = SearchCache(cache_dir=tmp_path)
+        cache.set("a", _results())
+
+        cache.invalidate("a")
+
+        assert cache.get("a") is None
+
+    def test_set_leaves_no_temp_files(self, tmp_path):
+        """测试写入通过临时文件原子替换，不残留临时文件。"""
+        cache = SearchCache(cache_dir=tmp_path)
+
+        cache.set("a", _results())
+        cache.set("a", _results()[:1])
+
+        assert [f.suffix for f in tmp_path.iterdir()] == [CACHE_SUFFIX]
+        assert SearchCache(cache_dir=tmp_path).get("a") == _results()[:1]
+
+
+class TestTTLCache:
+    """测试进程内 TTLCache。"""
+
+    def test_expiry_and_lru_eviction(self, monkeypatch):
+        """测试条目按 TTL 过期，超出容量时淘汰最久未使用的条目。"""
+        clock = {"now": 100.0}
+        monkeypatch.setattr(time, "monotonic", lambda: clock["now"])
+        cache = TTLCache(maxsize=2, ttl=10)
+
+        cache.set("a", _results())
+        cache.set("b", _results())
+        assert cache.get("a") == _results()
+        cache.set("c", _results())
+
+        assert cache.get("b") is None
+        assert cache.get("a", SearchTimeRange.ONE_WEEK) is None
+
+        clock["now"] = 111.0
+        assert cache.get("a") is None
+        assert len(cache) == 1
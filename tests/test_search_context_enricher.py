@@ -0,0 +1,179 @@
+"""测试上下文增强器。"""
+
+import threading
+import time
+
+from src.search.base import SearchResult, SearchTimeRange
+from src.search.context_enricher import ContextEnricher, ExternalInsight
+
+
+class FakeSearchTool:
+    """按查询返回固定结果的搜索工具。"""
+
+    def __init__(self, delay: float = 0.0, failing_keyword: str | None = None) -> None:
+        self.delay = delay
+        self.failing_keyword = failing_keyword
+        self.queries: list[str] = []
+        self._lock = threading.Lock()
+
+    def search(self, query, time_range=SearchTimeRange.ONE_YEAR, max_results=10):
+        with self._lock:
+            self.queries.append(query)
+        time.sleep(self.delay)
+        if self.failing_keyword and self.failing_keyword in query:
+            raise RuntimeError("boom")
+        return [
+            SearchResult(url="https://shared.example.com", title=query, summary="", score=0.5),
+            SearchResult(url=f"https://example.com/{len(query)}/{hash(query)}", title=query, summary="", score=0.9),
+        ]
+
+
+class TestEnrichForElite:
+    """测试 enrich_for_elite。"""
+
+    def test_queries_run_concurrently(self):
+        """测试各查询并发执行，耗时接近单个查询。"""
+        tool = FakeSearchTool(delay=0.2)
+        enricher = ContextEnricher(tool, cache_enabled=False)
+
+        start = time.monotonic()
+        insights = enricher.enrich_for_elite("Foo", category="SaaS")
+        elapsed = time.monotonic() - start
+
+        assert len(tool.queries) == 6
+        assert elapsed < 0.6
+        assert insights[0].relevance_score == 0.9
+
+    def test_failed_query_is_skipped_and_dedup_is_stable(self):
+        """测试单个查询失败被跳过，重复 URL 保留首个查询的结果。"""
+        enricher = ContextEnricher(FakeSearchTool(failing_keyword="技术架构"), cache_enabled=False)
+
+        insights = enricher.enrich_for_elite("Foo")
+
+        shared = [i for i in insights if i.url == "https://shared.example.com"]
+        assert len(shared) == 1
+        assert shared[0].title == '"Foo" 专家分析 深度评测'
+        assert len(insights) == 5
+
+    def test_duplicate_url_keeps_higher_score(self):
+        """测试重复 URL 保留评分更高的结果，且总数受上限约束。"""
+
+        class ScoredSearchTool:
+            def search(self, query, time_range=SearchTimeRange.ONE_YEAR, max_results=10):
+                score = 0.8 if "用户评价" in query else 0.1
+                return [SearchResult(url="https://dup.example.com", title=query, summary="", score=score)]
+
+        insights = ContextEnricher(ScoredSearchTool(), cache_enabled=False).enrich_for_elite("Foo")
+
+        assert len(insights) == 1
+        assert insights[0].relevance_score == 0.8
+        assert insights[0].source_type == "review"
+
+
+class TestClassifySource:
+    """测试来源类型分类。"""
+
+    def test_classifies_by_host_with_priority(self):
+        """测试按主机名分类，多类同时命中时按优先级取第一类。"""
+        enricher = ContextEnricher(FakeSearchTool(), cache_enabled=False)
+
+        def classify(url: str, query_type: str = "expert") -> str:
+            return enricher._classify_source(SearchResult(url=url, title="", summary=""), query_type)
+
+        assert classify("https://news.medium.com/post") == "expert_blog"
+        assert classify("https://arxiv.org/abs/1") == "tech_paper"
+        assert classify("https://www.YouTube.com/watch") == "video"
+        assert classify("https://example.com", "review") == "review"
+        assert classify("https://example.com", "unknown") == "article"
+        assert classify("https://blog.example.com/post") == "expert_blog"
+        assert classify("https://user@sub.TechCrunch.com:443/x") == "news"
+
+    def test_path_and_lookalike_hosts_do_not_match(self):
+        """测试路径中的关键词和仿冒域名不再误判。"""
+        enricher = ContextEnricher(FakeSearchTool(), cache_enabled=False)
+
+        def classify(url: str) -> str:
+            return enricher._classify_source(SearchResult(url=url, title="", summary=""), "review")
+
+        assert classify("https://example.com/news/blog") == "review"
+        assert classify("https://notmedium.com/a") == "review"
+
+
+class TestEnrichTimeout:
+    """测试增强的整体超时。"""
+
+    def test_slow_queries_are_dropped_after_timeout(self):
+        """测试超时后立即返回已完成查询的结果。"""
+
+        class MixedSearchTool:
+            def search(self, query, time_range=SearchTimeRange.ONE_YEAR, max_results=10):
+                if "专家分析" not in query:
+                    time.sleep(1.0)
+                return [SearchResult(url=f"https://example.com/{hash(query)}", title=query, summary="")]
+
+        start = time.monotonic()
+        enricher = ContextEnricher(MixedSearchTool(), cache_enabled=False)
+        insights = enricher.enrich_for_elite("Foo", overall_timeout=0.3)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.8
+        assert [i.title for i in insights] == ['"Foo" 专家分析 深度评测']
+
+
+class TestEnrichmentCache:
+    """测试增强结果缓存。"""
+
+    def test_repeat_enrichment_is_served_from_disk(self, tmp_path):
+        """测试相同目标的重复增强直接读取磁盘缓存，跨实例生效。"""
+        tool = FakeSearchTool()
+
+        first = ContextEnricher(tool, cache_dir=tmp_path).enrich_for_elite("Foo")
+        calls = len(tool.queries)
+        second = ContextEnricher(tool, cache_dir=tmp_path).enrich_for_elite("Foo")
+        other = ContextEnricher(tool, cache_dir=tmp_path).enrich_for_elite("Foo", category="SaaS")
+
+        assert second == first
+        assert len(tool.queries) == calls + 6
+        assert len(other) > 0
+
+    def test_partial_results_are_not_cached(self, tmp_path):
+        """测试有查询失败时不写入缓存。"""
+        enricher = ContextEnricher(FakeSearchTool(failing_keyword="技术架构"), cache_dir=tmp_path)
+
+        enricher.enrich_for_elite("Foo")
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_empty_results_are_not_cached(self, tmp_path):
+        """测试所有查询都返回空结果（如离线）时不写入缓存，恢复后重新搜索。"""
+
+        class OfflineSearchTool:
+            def search(self, query, time_range=SearchTimeRange.ONE_YEAR, max_results=10):
+                return []
+
+        offline = ContextEnricher(OfflineSearchTool(), cache_dir=tmp_path).enrich_for_elite("Foo")
+        online = ContextEnricher(FakeSearchTool(), cache_dir=tmp_path).enrich_for_elite("Foo")
+
+        assert offline == []
+        assert len(online) > 0
+
+
+class TestExternalInsight:
+    """测试 ExternalInsight 数据类。"""
+
+    def test_round_trip_and_immutability(self):
+        """测试字典往返一致，且实例不可变、可哈希。"""
+        insight = ExternalInsight(
+            url="https://example.com",
+            title="t",
+            summary="s",
+            source_type="news",
+            quoted_content=("引用",),
+        )
+
+        data = insight.to_dict()
+
+        assert data["quoted_content"] == ["引用"]
+        assert ExternalInsight.from_dict(data) == insight
+        assert not hasattr(insight, "__dict__")
+        assert len({insight, ExternalInsight.from_dict(data)}) == 1
@@ -0,0 +1,89 @@
+"""测试 DuckDuckGo 搜索源。"""
+
+from src.search.providers import duckduckgo
+from src.search.providers.duckduckgo import DuckDuckGoSearchTool
+
+
+class FlakyClient:
+    """前若干次调用失败的 DDGS 客户端。"""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def text(self, query, **kwargs):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("rate limited")
+        return [{"link": "https://example.com/a", "title": "A", "body": "b"}]
+
+
+def _make_tool(client: FlakyClient, retry_budget: float = 5.0) -> DuckDuckGoSearchTool:
+    tool = DuckDuckGoSearchTool(retry_budget=retry_budget)
+    tool._client = client
+    tool._is_available = True
+    return tool
+
+
+class TestDuckDuckGoRetry:
+    """测试重试退避与时间预算。"""
+
+    def test_retries_with_exponential_backoff(self, monkeypatch):
+        """测试失败后按指数退避重试直至成功。"""
+        sleeps = []
+        monkeypatch.setattr(duckduckgo.time, "sleep", sleeps.append)
+        client = FlakyClient(failures=2)
+
+        results = _make_tool(client).search("q")
+
+        assert [r.url for r in results] == ["https://example.com/a"]
+        assert client.calls == 3
+        assert sleeps == [0.25, 0.5]
+
+    def test_exhausted_budget_skips_remaining_attempts(self, monkeypatch):
+        """测试时间预算不足时不再发起新的尝试。"""
+        sleeps = []
+        monkeypatch.setattr(duckduckgo.time, "sleep", sleeps.append)
+        client = FlakyClient(failures=3)
+
+        assert _make_tool(client, retry_budget=0.1).search("q") == []
+        assert client.calls == 1
+        assert sleeps == []
+
+
+class TestSharedClient:
+    """测试共享 DDGS 客户端。"""
+
+    def test_instances_share_one_client(self, monkeypatch):
+        """测试多个实例复用同一个客户端，且只创建一次。"""
+        created = []
+
+        def fake_create():
+            created.append(object())
+            return created[-1]
+
+        monkeypatch.setattr(DuckDuckGoSearchTool, "_shared_client", None)
+        monkeypatch.setattr(DuckDuckGoSearchTool, "_create_client", staticmethod(fake_create))
+
+        first, second = DuckDuckGoSearchTool(), DuckDuckGoSearchTool()
+
+        assert first._client is second._client is created[0]
+        assert len(created) == 1
+
+
+class TestDuckDuckGoMetadata:
+    """测试元数据缓存。"""
+
+    def test_metadata_is_reused_until_availability_changes(self):
+        """测试元数据复用同一实例，可用性变化后重建。"""
+        tool = _make_tool(FlakyClient(failures=0))
+
+        first = tool.metadata
+
+        assert tool.metadata is first
+        assert not hasattr(first, "__dict__")
+
+        tool._is_available = False
+
+        assert tool.metadata is not first
+        assert tool.metadata.is_available is False
@@ -0,0 +1,234 @@
+"""测试多源搜索工具。"""
+
+import threading
+import time
+
+import pytest
+
+from src.search.base import (
+    ProviderMetadata,
+    SearchProviderType,
+    SearchResult,
+    SearchTimeRange,
+)
+from src.search.cache import SearchCache
+from src.search.multi_source import MultiSourceSearchTool
+from src.search.quota import QuotaManager
+
+
+class FakeProvider:
+    """可控延迟与结果的搜索源。"""
+
+    def __init__(
+        self,
+        provider_type: SearchProviderType,
+        delay: float = 0.0,
+        fail: bool = False,
+        healthy: bool = True,
+    ) -> None:
+        self.provider_type = provider_type
+        self.delay = delay
+        self.fail = fail
+        self.healthy = healthy
+        self.calls = 0
+        self.health_calls = 0
+        self._lock = threading.Lock()
+
+    def search(self, query, time_range=SearchTimeRange.ONE_YEAR, max_results=10):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return [
+            SearchResult(
+                url=f"https://{self.provider_type.value}.example.com/{i}",
+                title=query,
+                summary="",
+                score=0.5,
+                provider=self.provider_type,
+            )
+            for i in range(2)
+        ]
+
+    @property
+    def metadata(self) -> ProviderMetadata:
+        return ProviderMetadata(
+            provider_type=self.provider_type,
+            is_available=self.healthy,
+            rate_limit=None,
+            daily_quota=None,
+            supports_time_range=True,
+        )
+
+    def check_health(self) -> bool:
+        self.health_calls += 1
+        return self.healthy
+
+
+@pytest.fixture
+def make_tool():
+    def _make(**kwargs) -> MultiSourceSearchTool:
+        kwargs.setdefault("cache_enabled", False)
+        kwargs.setdefault("quota_enabled", False)
+        return MultiSourceSearchTool(**kwargs)
+
+    return _make
+
+
+class TestSearchWithFallback:
+    """测试多源搜索的调度策略。"""
+
+    def test_all_mode_runs_providers_concurrently(self, make_tool):
+        """测试 all 模式并发请求，耗时接近最慢的搜索源。"""
+        tool = make_tool(aggregation_mode="all")
+        providers = {
+            SearchProviderType.TAVILY: FakeProvider(SearchProviderType.TAVILY, delay=0.3),
+            SearchProviderType.DUCKDUCKGO: FakeProvider(SearchProviderType.DUCKDUCKGO, delay=0.3),
+            SearchProviderType.WIKIPEDIA: FakeProvider(SearchProviderType.WIKIPEDIA, fail=True),
+        }
+
+        start = time.monotonic()
+        results = tool._search_with_fallback("q", SearchTimeRange.ONE_YEAR, 5, providers)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.55
+        assert list(results) == [SearchProviderType.TAVILY, SearchProviderType.DUCKDUCKGO]
+
+    def test_parallel_mode_respects_max_parallel_providers(self, make_tool):
+        """测试 parallel 模式只请求前 max_parallel_providers 个搜索源。"""
+        tool = make_tool(aggregation_mode="parallel", max_parallel_providers=1)
+        first = FakeProvider(SearchProviderType.TAVILY)
+        second = FakeProvider(SearchProviderType.DUCKDUCKGO)
+
+        results = tool._search_with_fallback(
+            "q",
+            SearchTimeRange.ONE_YEAR,
+            5,
+            {SearchProviderType.TAVILY: first, SearchProviderType.DUCKDUCKGO: second},
+        )
+
+        assert list(results) == [SearchProviderType.TAVILY]
+        assert second.calls == 0
+
+    def test_priority_mode_stops_at_first_success(self, make_tool):
+        """测试 priority 模式在首个成功的搜索源处停止。"""
+        tool = make_tool(aggregation_mode="priority")
+        failing = FakeProvider(SearchProviderType.TAVILY, fail=True)
+        working = FakeProvider(SearchProviderType.DUCKDUCKGO)
+        unused = FakeProvider(SearchProviderType.WIKIPEDIA)
+
+        results = tool._search_with_fallback(
+            "q",
+            SearchTimeRange.ONE_YEAR,
+            5,
+            {
+                SearchProviderType.TAVILY: failing,
+                SearchProviderType.DUCKDUCKGO: working,
+                SearchProviderType.WIKIPEDIA: unused,
+            },
+        )
+
+        assert list(results) == [SearchProviderType.DUCKDUCKGO]
+        assert unused.calls == 0
+
+
+class TestProviderHealthCache:
+    """测试搜索源健康状态缓存。"""
+
+    def test_health_is_checked_once_within_ttl(self, make_tool, monkeypatch):
+        """测试 TTL 内不重复检查健康状态，搜索失败后重新检查。"""
+        provider = FakeProvider(SearchProviderType.TAVILY, fail=True)
+        monkeypatch.setattr(
+            "src.search.multi_source.registry.get_provider",
+            lambda provider_type: provider,
+        )
+        tool = make_tool(preferred_providers=[SearchProviderType.TAVILY])
+
+        tool._select_providers()
+        selected = tool._select_providers()
+        assert provider.health_calls == 1
+
+        tool._search_with_fallback("q", SearchTimeRange.ONE_YEAR, 5, selected)
+        tool._select_providers()
+        assert provider.health_calls == 2
+
+    def test_expired_health_is_rechecked(self, make_tool, monkeypatch):
+        """测试健康状态过期后重新检查。"""
+        provider = FakeProvider(SearchProviderType.TAVILY, healthy=False)
+        monkeypatch.setattr(
+            "src.search.multi_source.registry.get_provider",
+            lambda provider_type: provider,
+        )
+        tool = make_tool(preferred_providers=[SearchProviderType.TAVILY])
+        tool._health_ttl = 0
+
+        assert tool._select_providers() == {}
+        assert tool._select_providers() == {}
+        assert provider.health_calls == 2
+
+
+class TestSearchCacheTtl:
+    """测试按次覆盖缓存过期时间。"""
+
+    def test_search_uses_cache_ttl_override(self, make_tool, tmp_path, monkeypatch):
+        """测试 cache_ttl 覆盖默认过期时间，命中缓存时不再请求搜索源。"""
+        provider = FakeProvider(SearchProviderType.TAVILY)
+        tool = make_tool(aggregation_mode="all")
+        tool._cache = SearchCache(cache_dir=tmp_path, default_ttl=60)
+        monkeypatch.setattr(tool, "_select_providers", lambda: {SearchProviderType.TAVILY: provider})
+
+        first = tool.search("q", max_results=5, cache_ttl=7 * 24 * 3600)
+        second = tool.search("q", max_results=5)
+
+        assert second == first
+        assert provider.calls == 1
+        (cache_file,) = tmp_path.glob("*.bin")
+        assert cache_file.stat().st_mtime > time.time() + 6 * 24 * 3600
+
+    def test_check_health_uses_metadata_only(self, make_tool, monkeypatch):
+        """测试 check_health 只读元数据，check_health_live 才发起探测。"""
+        down = FakeProvider(SearchProviderType.TAVILY, healthy=False)
+        up = FakeProvider(SearchProviderType.DUCKDUCKGO)
+        providers = {SearchProviderType.TAVILY: down, SearchProviderType.DUCKDUCKGO: up}
+        monkeypatch.setattr(
+            "src.search.multi_source.registry.get_provider",
+            lambda provider_type: providers[provider_type],
+        )
+        tool = make_tool(preferred_providers=list(providers))
+
+        assert tool.check_health()
+        assert down.health_calls == up.health_calls == 0
+
+        assert tool.check_health_live()
+        assert down.health_calls == up.health_calls == 1
+
+
+class TestQuotaStatus:
+    """测试配额状态输出。"""
+
+    def test_quota_status_serializes_slotted_status(self, make_tool, tmp_path):
+        """测试配额状态（无实例 __dict__）按字段输出。"""
+        tool = make_tool()
+        tool._quota_manager = QuotaManager(tmp_path / "quota.sqlite")
+        tool._quota_manager.configure_provider(SearchProviderType.TAVILY, daily_limit=5, rate_limit=None)
+        tool._quota_manager.check_and_consume(SearchProviderType.TAVILY)
+
+        status = tool.get_quota_status()["providers"]["tavily"]
+        tool._quota_manager.close()
+
+        assert status["daily_used"] == 1
+        assert status["daily_remaining"] == 4
+
+    def test_close_releases_quota_connection(self, make_tool, tmp_path):
+        """测试 close 写入用量并关闭配额数据库连接。"""
+        tool = make_tool()
+        tool._quota_manager = QuotaManager(tmp_path / "quota.sqlite")
+        tool._quota_manager.check_and_consume(SearchProviderType.TAVILY)
+
+        tool.close()
+
+        assert tool._quota_manager._connection is None
+        reopened = QuotaManager(tmp_path / "quota.sqlite")
+        assert reopened.get_status(SearchProviderType.TAVILY).daily_used == 1
+        reopened.close()
@@ -0,0 +1,212 @@
+"""测试搜索配额管理。"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.search import quota
+from src.search.base import SearchProviderType
+from src.search.quota import QuotaManager
+
+
+class TestDailyQuota:
+    """测试每日配额。"""
+
+    def test_limit_is_enforced_and_persisted(self, tmp_path):
+        """测试超出每日限制后拒绝，用量与限制跨实例保留。"""
+        db = tmp_path / "quota.sqlite"
+        manager = QuotaManager(db)
+        manager.configure_provider(SearchProviderType.TAVILY, daily_limit=2, rate_limit=10)
+
+        assert manager.check_and_consume(SearchProviderType.TAVILY)
+        assert manager.check_and_consume(SearchProviderType.TAVILY)
+        assert not manager.check_and_consume(SearchProviderType.TAVILY)
+        manager.close()
+
+        reopened = QuotaManager(db)
+        status = reopened.get_status(SearchProviderType.TAVILY)
+
+        assert status.daily_used == 2
+        assert status.daily_remaining == 0
+        assert status.rate_limit == 10
+        assert set(reopened.get_all_status()) == {SearchProviderType.TAVILY}
+        assert not reopened.check_and_consume(SearchProviderType.TAVILY)
+
+    def test_unconfigured_provider_is_unlimited(self, tmp_path):
+        """测试未配置的搜索源不受限制，但仍记录用量。"""
+        manager = QuotaManager(tmp_path / "quota.sqlite")
+
+        for _ in range(5):
+            assert manager.check_and_consume(SearchProviderType.DUCKDUCKGO)
+
+        assert manager.get_status(SearchProviderType.DUCKDUCKGO).daily_used == 5
+        assert set(manager.get_all_status()) == {SearchProviderType.DUCKDUCKGO}
+
+    def test_usage_resets_on_new_day(self, tmp_path, monkeypatch):
+        """测试跨日后用量自动归零。"""
+        manager = QuotaManager(tmp_path / "quota.sqlite")
+        manager.configure_provider(SearchProviderType.TAVILY, daily_limit=1)
+        monkeypatch.setattr(quota, "_today", lambda: "2026-01-01")
+        assert manager.check_and_consume(SearchProviderType.TAVILY)
+        assert not manager.check_and_consume(SearchProviderType.TAVILY)
+
+        monkeypatch.setattr(quota, "_today", lambda: "2026-01-02")
+
+        assert manager.get_status(SearchProviderType.TAVILY).daily_used == 0
+        assert manager.check_and_consume(SearchProviderType.TAVILY)
+
+    def test_concurrent_managers_never_overspend(self, tmp_path):
+        """测试共享同一数据库的多个实例并发消耗时不会超出限制。"""
+        db = tmp_path / "quota.sqlite"
+        QuotaManager(db).configure_provider(SearchProviderType.TAVILY, daily_limit=50)
+        managers = [QuotaManager(db) for _ in range(4)]
+        granted = []
+        lock = threading.Lock()
+
+        def worker(manager: QuotaManager) -> None:
+            for _ in range(30):
+                if manager.check_and_consume(SearchProviderType.TAVILY):
+                    with lock:
+                        granted.append(1)
+
+        threads = [threading.Thread(target=worker, args=(m,)) for m in managers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(granted) == 50
+        assert managers[0].get_status(SearchProviderType.TAVILY).daily_used == 50
+
+
+class TestRateLimit:
+    """测试速率限制。"""
+
+    def test_rate_limit_rejection_does_not_consume_daily_quota(self, tmp_path):
+        """测试速率受限的请求不消耗每日配额，每日配额拒绝时释放速率窗口。"""
+        manager = QuotaManager(tmp_path / "quota.sqlite")
+        manager.configure_provider(SearchProviderType.TAVILY, daily_limit=3, rate_limit=2)
+
+        assert manager.check_and_consume(SearchProviderType.TAVILY)
+        assert manager.check_and_consume(SearchProviderType.TAVILY)
+        assert not manager.check_and_consume(SearchProviderType.TAVILY)
+        assert manager.get_status(SearchProviderType.TAVILY).daily_used == 2
+
+        manager.reset_rate_window(SearchProviderType.TAVILY)
+        assert manager.check_and_consume(SearchProviderType.TAVILY)
+        assert not manager.check_and_consume(SearchProviderType.TAVILY)
+        assert manager.get_status(SearchProviderType.TAVILY).rate_window_used == 1
+
+
+    def test_sliding_window_blocks_boundary_bursts(self, tmp_path, monkeypatch):
+        """测试滑动窗口：窗口边界两侧的突发请求不会放行两倍速率。"""
+        manager = QuotaManager(tmp_path / "quota.sqlite")
+        manager.configure_provider(SearchProviderType.TAVILY, rate_limit=2)
+        clock = {"now": 1000.0}
+        monkeypatch.setattr(quota.time, "monotonic", lambda: clock["now"])
+
+        assert manager.check_and_consume(SearchProviderType.TAVILY)
+        clock["now"] = 1059.0
+        assert manager.check_and_consume(SearchProviderType.TAVILY)
+
+        # 固定窗口在此处会整体清零，滑动窗口仍包含 2 秒前的请求
+        clock["now"] = 1061.0
+        assert manager.check_and_consume(SearchProviderType.TAVILY)
+        assert not manager.check_and_consume(SearchProviderType.TAVILY)
+
+        clock["now"] = 1121.5
+        assert manager.get_status(SearchProviderType.TAVILY).rate_window_used == 0
+        assert manager.check_and_consume(SearchProviderType.TAVILY)
+
+    def test_providers_do_not_contend(self, tmp_path):
+        """测试某个搜索源的锁被占用时，其他搜索源的检查不受阻塞。"""
+        manager = QuotaManager(tmp_path / "quota.sqlite", flush_interval=60)
+        manager.configure_provider(SearchProviderType.TAVILY, daily_limit=5, rate_limit=5)
+        manager.configure_provider(SearchProviderType.WIKIPEDIA, daily_limit=5, rate_limit=5)
+        done = threading.Event()
+
+        def consume_other() -> None:
+            manager.check_and_consume(SearchProviderType.WIKIPEDIA)
+            done.set()
+
+        with manager._provider_locks[SearchProviderType.TAVILY]:
+            threading.Thread(target=consume_other).start()
+            assert done.wait(timeout=2)
+
+        manager.close()
+
+class TestCoalescedWrites:
+    """测试写合并模式。"""
+
+    @staticmethod
+    def _stored_usage(db) -> int:
+        with sqlite3.connect(db) as conn:
+            row = conn.execute("SELECT daily_used FROM quota WHERE provider = 'tavily'").fetchone()
+        return row[0] if row else 0
+
+    def test_consumption_is_buffered_until_flush(self, tmp_path):
+        """测试消耗只在内存中计数，限制照常生效，关闭时写入数据库。"""
+        db = tmp_path / "quota.sqlite"
+        manager = QuotaManager(db, flush_interval=60)
+        manager.configure_provider(SearchProviderType.TAVILY, daily_limit=3)
+
+        results = [manager.check_and_consume(SearchProviderType.TAVILY) for _ in range(4)]
+
+        assert results == [True, True, True, False]
+        assert self._stored_usage(db) == 3  # 拒绝时查询状态会触发落盘
+        assert manager.check_and_consume(SearchProviderType.TAVILY) is False
+        manager.close()
+
+        assert QuotaManager(db).get_status(SearchProviderType.TAVILY).daily_used == 3
+
+    def test_background_thread_flushes_periodically(self, tmp_path):
+        """测试后台线程按间隔批量写入。"""
+        db = tmp_path / "quota.sqlite"
+        manager = QuotaManager(db, flush_interval=0.05)
+
+        for _ in range(5):
+            manager.check_and_consume(SearchProviderType.TAVILY)
+        assert self._stored_usage(db) == 0
+
+        deadline = time.monotonic() + 2
+        while self._stored_usage(db) != 5 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert self._stored_usage(db) == 5
+        manager.close()
+
+
+class TestConnections:
+    """测试数据库连接复用。"""
+
+    def test_connections_stay_bounded_across_thread_pools(self, tmp_path, monkeypatch):
+        """测试反复新建线程池调用时只打开一个连接。"""
+        opened = []
+        real_connect = sqlite3.connect
+
+        def counting_connect(*args, **kwargs):
+            conn = real_connect(*args, **kwargs)
+            opened.append(conn)
+            return conn
+
+        monkeypatch.setattr(quota.sqlite3, "connect", counting_connect)
+        manager = QuotaManager(tmp_path / "quota.sqlite")
+
+        for _ in range(20):
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                list(pool.map(lambda _: manager.check_and_consume(SearchProviderType.TAVILY), range(6)))
+
+        assert len(opened) == 1
+        assert manager.get_status(SearchProviderType.TAVILY).daily_used == 120
+        manager.close()
+
+    def test_close_releases_connection_and_reopens_on_demand(self, tmp_path):
+        """测试关闭后再次使用会重新打开连接。"""
+        manager = QuotaManager(tmp_path / "quota.sqlite")
+        manager.check_and_consume(SearchProviderType.TAVILY)
+        manager.close()
+
+        assert manager._connection is None
+        assert manager.get_status(SearchProviderType.TAVILY).daily_used == 1
+        manager.close()
@@ -0,0 +1,88 @@
+"""测试搜索源注册表。"""
+
+import threading
+import time
+
+import pytest
+
+from src.search.base import SearchProviderType
+from src.search.registry import registry
+
+
+@pytest.fixture
+def clean_registry():
+    """暂存全局注册表内容，测试结束后恢复。"""
+    providers = dict(registry._providers)
+    singletons = dict(registry._singletons)
+    registry.clear()
+    yield registry
+    registry.clear()
+    registry._providers.update(providers)
+    registry._singletons.update(singletons)
+
+
+class TestGetProvider:
+    """测试 get_provider。"""
+
+    def test_singleton_is_created_once_under_contention(self, clean_registry):
+        """测试并发首次获取只调用一次工厂。"""
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return object()
+
+        clean_registry.register(SearchProviderType.TAVILY, factory)
+        results = []
+
+        def fetch():
+            results.append(clean_registry.get_provider(SearchProviderType.TAVILY))
+
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert len({id(r) for r in results}) == 1
+        assert clean_registry.get_provider(SearchProviderType.TAVILY, force_new=True) is not results[0]
+
+    def test_different_providers_initialize_in_parallel(self, clean_registry):
+        """测试不同搜索源的初始化互不阻塞。"""
+
+        def slow_factory():
+            time.sleep(0.3)
+            return object()
+
+        clean_registry.register(SearchProviderType.TAVILY, slow_factory)
+        clean_registry.register(SearchProviderType.WIKIPEDIA, slow_factory)
+        threads = [
+            threading.Thread(target=clean_registry.get_provider, args=(provider_type,))
+            for provider_type in (SearchProviderType.TAVILY, SearchProviderType.WIKIPEDIA)
+        ]
+
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert time.monotonic() - start < 0.55
+
+    def test_failed_factory_returns_none_and_retries(self, clean_registry):
+        """测试工厂失败时返回 None，且不缓存失败结果。"""
+        attempts = []
+
+        def flaky_factory():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("boom")
+            return object()
+
+        clean_registry.register(SearchProviderType.GITHUB, flaky_factory)
+
+        assert clean_registry.get_provider(SearchProviderType.GITHUB) is None
+        assert clean_registry.get_provider(SearchProviderType.GITHUB) is not None
+        assert clean_registry.get_provider(SearchProviderType.DUCKDUCKGO) is None
@@ -0,0 +1,92 @@
+"""测试查询近似匹配缓存。"""
+
+import httpx
+
+from src.search import semantic_cache
+from src.search.base import SearchProviderType, SearchResult, SearchTimeRange
+from src.search.providers.tavily import TavilySearchTool
+from src.search.semantic_cache import SemanticSearchCache, query_keywords
+
+TAVILY = SearchProviderType.TAVILY
+YEAR = SearchTimeRange.ONE_YEAR
+
+
+def _results(n: int = 3) -> list[SearchResult]:
+    return [SearchResult(url=f"https://example.com/{i}", title=str(i), summary="") for i in range(n)]
+
+
+class TestSemanticSearchCache:
+    """测试 SemanticSearchCache 类。"""
+
+    def test_query_keywords_ignore_order_and_stop_words(self):
+        """测试关键词集合与词序、大小写和虚词无关。"""
+        assert query_keywords("Notion Pricing") == query_keywords("pricing of notion")
+
+    def test_reordered_query_hits_and_is_truncated(self):
+        """测试只差词序或虚词的查询命中缓存，并按本次 max_results 截断。"""
+        cache = SemanticSearchCache()
+        cache.set(TAVILY, "notion pricing plans", YEAR, 3, _results())
+
+        hit = cache.get(TAVILY, "pricing plans of Notion", YEAR, 2)
+
+        assert [r.title for r in hit] == ["0", "1"]
+
+    def test_extra_entity_queries_miss(self):
+        """测试多出或缺少关键词（另一个实体、年份）的查询不会复用缓存。"""
+        cache = SemanticSearchCache()
+        cache.set(TAVILY, "Notion 技术栈 架构 API 文档", YEAR, 3, _results())
+        cache.set(TAVILY, "Slack 对比 Microsoft Teams 竞品分析", YEAR, 3, _results())
+        cache.set(TAVILY, "notion pricing plans 2024", YEAR, 3, _results())
+
+        assert cache.get(TAVILY, "Notion AI 技术栈 架构 API 文档", YEAR, 3) is None
+        assert cache.get(TAVILY, "Slack 对比 Microsoft Teams Premium 竞品分析", YEAR, 3) is None
+        assert cache.get(TAVILY, "Slack vs Microsoft Teams 竞品分析", YEAR, 3) is None
+        assert cache.get(TAVILY, "notion pricing plans", YEAR, 3) is None
+
+    def test_opt_in_fuzzy_match_never_matches_subsets(self):
+        """测试显式开启模糊匹配后，改写的查询可命中，但子集/超集查询仍不命中。"""
+        cache = SemanticSearchCache(similarity_threshold=0.6)
+        cache.set(TAVILY, "notion pricing plans tiers", YEAR, 3, _results())
+
+        assert cache.get(TAVILY, "notion pricing plans comparison", YEAR, 3) is not None
+        assert cache.get(TAVILY, "notion pricing plans", YEAR, 3) is None
+        assert cache.get(TAVILY, "notion ai pricing plans tiers", YEAR, 3) is None
+
+    def test_namespace_time_range_and_size_are_respected(self):
+        """测试不同搜索源、时间范围或更大结果数不会串用缓存。"""
+        cache = SemanticSearchCache()
+        cache.set(TAVILY, "notion pricing", YEAR, 3, _results())
+
+        assert cache.get(SearchProviderType.DUCKDUCKGO, "notion pricing", YEAR, 3) is None
+        assert cache.get(TAVILY, "notion pricing", SearchTimeRange.ONE_WEEK, 3) is None
+        assert cache.get(TAVILY, "notion pricing", YEAR, 5) is None
+
+    def test_expired_entries_are_ignored(self, monkeypatch):
+        """测试过期条目不再命中。"""
+        cache = SemanticSearchCache(ttl=10)
+        monkeypatch.setattr(semantic_cache.time, "time", lambda: 1000.0)
+        cache.set(TAVILY, "notion pricing", YEAR, 3, _results())
+
+        monkeypatch.setattr(semantic_cache.time, "time", lambda: 1011.0)
+        assert cache.get(TAVILY, "notion pricing", YEAR, 3) is None
+
+    def test_tavily_skips_request_on_hit(self):
+        """测试 Tavily 命中缓存时不再发起请求。"""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json={"results": [{"url": "https://example.com/a", "title": "A"}]})
+
+        tool = TavilySearchTool(api_key="test-key", warm_connection=False)
+        tool._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        first = tool.search("Notion pricing", max_results=5)
+        second = tool.search("pricing of notion", max_results=5)
+
+        assert second == first
+        assert len(calls) == 1
+
+        # 多出实体关键词的查询必须重新请求
+        tool.search("Notion AI pricing", max_results=5)
+        assert len(calls) == 2
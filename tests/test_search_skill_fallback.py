@@ -0,0 +1,277 @@
+"""测试 Skill 降级搜索源。"""
+
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from src.search import skill_fallback as legacy
+from src.search.providers import skill_fallback
+
+
+@pytest.fixture
+def probe_env(tmp_path, monkeypatch):
+    """隔离可用性缓存文件并伪造 claude CLI。"""
+    cache_file = tmp_path / "skill_available.json"
+    monkeypatch.setattr(skill_fallback, "SKILL_AVAILABILITY_CACHE", cache_file)
+    monkeypatch.setattr(skill_fallback.shutil, "which", lambda name: "/usr/bin/claude")
+    monkeypatch.delenv(skill_fallback.SKILL_CACHE_TTL_ENV, raising=False)
+
+    calls = []
+
+    def fake_run(args, **kwargs):
+        calls.append(args)
+        return subprocess.CompletedProcess(args, 0, stdout=b"search\n", stderr=b"")
+
+    monkeypatch.setattr(skill_fallback.subprocess, "run", fake_run)
+    skill_fallback._probe_skill_available.cache_clear()
+    yield cache_file, calls
+    skill_fallback._probe_skill_available.cache_clear()
+
+
+_REAL_POPEN = subprocess.Popen
+
+
+def _fake_skill_process(monkeypatch, script: str):
+    """用运行 script 的 Python 子进程替代 claude CLI（查询作为第一个参数传入）。"""
+
+    def fake_popen(args, **kwargs):
+        return _REAL_POPEN([sys.executable, "-c", script, args[4]], **kwargs)
+
+    monkeypatch.setattr(skill_fallback.subprocess, "Popen", fake_popen)
+
+
+class TestSkillAvailabilityProbe:
+    """测试 search skill 可用性探测。"""
+
+    def test_probe_result_is_cached_on_disk(self, probe_env):
+        """测试首次探测写入磁盘缓存，之后冷启动不再调用 CLI。"""
+        cache_file, calls = probe_env
+
+        assert skill_fallback._probe_skill_available()
+        assert json.loads(cache_file.read_text())["available"] is True
+
+        skill_fallback._probe_skill_available.cache_clear()
+        assert skill_fallback._probe_skill_available()
+        assert len(calls) == 1
+
+    def test_expired_cache_is_ignored(self, probe_env):
+        """测试过期缓存会触发重新探测。"""
+        cache_file, calls = probe_env
+        cache_file.write_text(json.dumps({"available": False, "checked_at": 0}))
+
+        assert skill_fallback._probe_skill_available()
+        assert len(calls) == 1
+
+    def test_zero_ttl_disables_disk_cache(self, probe_env, monkeypatch):
+        """测试 TTL 为 0 时不读写磁盘缓存。"""
+        cache_file, calls = probe_env
+        monkeypatch.setenv(skill_fallback.SKILL_CACHE_TTL_ENV, "0")
+
+        assert skill_fallback._probe_skill_available()
+        assert not cache_file.exists()
+
+    def test_missing_cli_skips_subprocess(self, probe_env, monkeypatch):
+        """测试 CLI 不存在时不派生子进程。"""
+        _, calls = probe_env
+        monkeypatch.setattr(skill_fallback.shutil, "which", lambda name: None)
+
+        assert not skill_fallback._probe_skill_available()
+        assert calls == []
+
+    def test_probe_is_deferred_until_first_use(self, probe_env):
+        """测试构造时不探测，首次使用时才探测一次；未启用降级时从不探测。"""
+        _, calls = probe_env
+
+        tool = skill_fallback.SkillFallbackSearchTool()
+        disabled = skill_fallback.SkillFallbackSearchTool(enable_fallback=False)
+        assert calls == []
+
+        assert not disabled.check_health()
+        assert not disabled.metadata.is_available
+        assert calls == []
+
+        assert tool.check_health()
+        assert tool.metadata.is_available
+        assert calls == [["claude", "skill", "list"]]
+
+    def test_concurrent_first_use_probes_once(self, probe_env):
+        """测试多个线程同时首次使用时只派生一次探测子进程。"""
+        _, calls = probe_env
+        tools = [legacy.SkillFallbackSearchTool() for _ in range(8)]
+        barrier = threading.Barrier(len(tools))
+
+        def check(tool):
+            barrier.wait()
+            tool.check_health()
+
+        threads = [threading.Thread(target=check, args=(tool,)) for tool in tools]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert calls == [["claude", "skill", "list"]]
+        assert all(tool.check_health() for tool in tools)
+
+
+class TestParseSkillOutput:
+    """测试 search skill 输出解析。"""
+
+    def test_parses_json_bytes_and_text_bytes(self):
+        """测试 JSON 与结构化文本的原始字节输出均可解析。"""
+        tool = skill_fallback.SkillFallbackSearchTool.__new__(skill_fallback.SkillFallbackSearchTool)
+        json_output = json.dumps(
+            {"results": [{"url": "https://example.com/a", "title": "标题", "score": 0.9}]},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        text_output = "Title: 文本\nURL: https://example.com/b\n\n".encode("utf-8")
+
+        from_json = tool._parse_skill_output(json_output)
+        from_text = tool._parse_skill_output(text_output)
+
+        assert [(r.title, r.score, r.site_name) for r in from_json] == [("标题", 0.9, "example.com")]
+        assert [(r.title, r.url) for r in from_text] == [("文本", "https://example.com/b")]
+
+    @pytest.mark.parametrize("module", [skill_fallback, legacy])
+    def test_text_output_blocks_and_list_items(self, module):
+        """测试结构化文本按空行与列表项分块，忽略无关行并兼容 CRLF。"""
+        tool = module.SkillFallbackSearchTool.__new__(module.SkillFallbackSearchTool)
+        output = (
+            "Results for query\r\n"
+            "  Title: 第一条 \r\n"
+            "URL: https://example.com/1\r\n"
+            "Summary: 摘要\r\n"
+            "\r\n"
+            "- 第二条\n"
+            "URL: https://example.com/2\n"
+            "- \n"
+        )
+
+        results = tool._parse_skill_output(output)
+
+        assert [(r.title, r.url, r.summary) for r in results] == [
+            ("第一条", "https://example.com/1", "摘要"),
+            ("第二条", "https://example.com/2", ""),
+        ]
+
+
+    @pytest.mark.parametrize("module", [skill_fallback, legacy])
+    def test_json_parse_only_attempted_for_objects(self, module, monkeypatch):
+        """测试只有以 { 开头（允许前导空白）的输出才尝试 JSON 解析。"""
+        tool = module.SkillFallbackSearchTool.__new__(module.SkillFallbackSearchTool)
+        real_loads = skill_fallback.json_loads
+        parsed = []
+
+        def counting_loads(data):
+            parsed.append(data)
+            return real_loads(data)
+
+        monkeypatch.setattr(skill_fallback, "json_loads", counting_loads)
+
+        from_text = tool._parse_skill_output(b"Title: A\nURL: https://example.com/a\n")
+        from_json = tool._parse_skill_output(b' \r\n {"results": [{"url": "https://example.com/b"}]}')
+
+        assert [r.url for r in from_text + from_json] == ["https://example.com/a", "https://example.com/b"]
+        assert len(parsed) == 1
+
+
+    def test_duplicate_urls_are_merged_but_url_less_items_kept(self):
+        """测试结构化文本中重复的 URL 只保留首条，没有 URL 的条目不参与去重。"""
+        tool = skill_fallback.SkillFallbackSearchTool.__new__(skill_fallback.SkillFallbackSearchTool)
+        output = (
+            "Title: A\nURL: https://example.com/a\n\n"
+            "Title: A again\nURL: https://example.com/a/\n\n"
+            "- 无链接一\n- 无链接二\n"
+        )
+
+        results = tool._parse_skill_output(output)
+
+        assert [r.title for r in results] == ["A", "无链接一", "无链接二"]
+
+
+class TestStreamingSkillSearch:
+    """测试 search skill 输出的流式读取。"""
+
+    def test_stops_reading_once_enough_results(self, monkeypatch):
+        """测试凑够不重复结果后立即结束持续输出的子进程。"""
+        _fake_skill_process(
+            monkeypatch,
+            "import itertools, time\n"
+            "print('Title: dup\\nURL: https://example.com/0/\\n', flush=True)\n"
+            "for i in itertools.count():\n"
+            "    print(f'Title: t{i}\\nURL: https://example.com/{i}\\n', flush=True)\n"
+            "    time.sleep(0.01)",
+        )
+
+        start = time.monotonic()
+        results = skill_fallback.run_skill_search("q", max_results=3)
+
+        assert [r.title for r in results] == ["dup", "t1", "t2"]
+        assert time.monotonic() - start < 5
+
+    def test_json_output_and_failures(self, monkeypatch):
+        """测试 JSON 输出可解析；非零退出码与超时返回空列表。"""
+        _fake_skill_process(
+            monkeypatch,
+            "import json, sys\n"
+            "print(json.dumps({'results': [{'url': 'https://example.com/a', 'title': sys.argv[1]}]}))",
+        )
+        assert [r.title for r in skill_fallback.run_skill_search("q", max_results=5)] == ["q"]
+
+        _fake_skill_process(monkeypatch, "import sys\nsys.stderr.write('boom')\nsys.exit(1)")
+        assert skill_fallback.run_skill_search("q", max_results=5) == []
+
+        _fake_skill_process(monkeypatch, "import time\nprint('Title: slow', flush=True)\ntime.sleep(10)")
+        start = time.monotonic()
+        assert skill_fallback.run_skill_search("q", max_results=5, timeout=0.3) == []
+        assert time.monotonic() - start < 5
+
+
+class TestLegacySkillAsync:
+    """测试旧版 Skill 降级工具的异步路径。"""
+
+    def test_legacy_tool_reuses_provider_implementation(self):
+        """测试旧版工具继承搜索源实现，只补充异步路径。"""
+        provider_cls = skill_fallback.SkillFallbackSearchTool
+
+        assert issubclass(legacy.SkillFallbackSearchTool, provider_cls)
+        for name in ("search", "_check_skill_availability", "_parse_skill_output", "check_health"):
+            assert getattr(legacy.SkillFallbackSearchTool, name) is getattr(provider_cls, name)
+        assert legacy.SkillFallbackSearchTool.metadata is provider_cls.metadata
+
+    def test_asearch_does_not_block_event_loop(self, monkeypatch):
+        """测试子进程调用在线程池中执行，事件循环期间仍可调度其他任务。"""
+        monkeypatch.setattr(skill_fallback, "_check_skill_available", lambda: True)
+        _fake_skill_process(
+            monkeypatch,
+            "import json, sys, time\n"
+            "time.sleep(0.3)\n"
+            "print(json.dumps({'results': [{'url': 'https://example.com', 'title': sys.argv[1]}]}))",
+        )
+        tool = legacy.SkillFallbackSearchTool()
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.02)
+                    ticks += 1
+
+            ticker_task = asyncio.create_task(ticker())
+            results = await asyncio.gather(tool.asearch("a"), tool.asearch("b"))
+            ticker_task.cancel()
+            return results, ticks
+
+        start = time.monotonic()
+        results, ticks = asyncio.run(run())
+
+        assert [[r.title for r in group] for group in results] == [["a"], ["b"]]
+        assert ticks >= 5
+        assert time.monotonic() - start < 0.55
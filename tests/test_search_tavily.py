@@ -0,0 +1,273 @@
+"""测试 Tavily 搜索源。"""
+
+import asyncio
+import json
+import threading
+
+import httpx
+
+from src.search import http
+from src.search.base import SearchTimeRange
+from src.search.providers import tavily
+from src.search.providers.tavily import TavilySearchTool, search_many
+from src.search.providers.tavily_batcher import TavilyBatcher
+from src.search.providers.wikipedia import WikipediaSearchTool
+from src.search.tavily_mcp import TavilyMCPTool
+
+# conftest 默认把预热替换为空操作，预热相关测试需要恢复真实实现
+_REAL_WARM_CONNECTION = TavilySearchTool._warm_connection
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    assert request.headers["content-type"] == "application/json"
+    payload = json.loads(request.content)
+    return httpx.Response(
+        200,
+        json={"results": [{"url": f"https://example.com/{payload['query']}", "title": payload["query"], "score": 0.9}]},
+    )
+
+
+class TestTavilyAsync:
+    """测试 Tavily 异步搜索。"""
+
+    def test_search_many_preserves_query_order(self, monkeypatch):
+        """测试并发查询按输入顺序返回结果并复用同一异步客户端。"""
+        tool = TavilySearchTool(api_key="test-key", warm_connection=False)
+        seen_days = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_days.append(json.loads(request.content).get("days"))
+            return _handler(request)
+
+        real_async_client = httpx.AsyncClient
+        created = []
+
+        def fake_async_client(**kwargs):
+            created.append(kwargs)
+            return real_async_client(transport=httpx.MockTransport(handler))
+
+        monkeypatch.setattr(httpx, "AsyncClient", fake_async_client)
+        monkeypatch.setattr(tavily, "AIOHTTP_AVAILABLE", False)
+
+        async def run():
+            results = await search_many(tool, ["a", "b", "c"], SearchTimeRange.ONE_WEEK)
+            await http.aclose_async_client()
+            return results
+
+        results = asyncio.run(run())
+
+        assert [[r.title for r in group] for group in results] == [["a"], ["b"], ["c"]]
+        assert seen_days == [7, 7, 7]
+        assert len(created) == 1
+
+    def test_async_api_error_returns_empty(self, monkeypatch):
+        """测试异步路径遇到 API 错误时返回空结果。"""
+        tool = TavilySearchTool(api_key="test-key", warm_connection=False)
+        real_async_client = httpx.AsyncClient
+        monkeypatch.setattr(tavily, "AIOHTTP_AVAILABLE", False)
+        monkeypatch.setattr(
+            httpx,
+            "AsyncClient",
+            lambda **kwargs: real_async_client(
+                transport=httpx.MockTransport(lambda request: httpx.Response(429))
+            ),
+        )
+
+        assert asyncio.run(tool.asearch("q")) == []
+
+    def test_sync_search_uses_same_params(self):
+        """测试同步搜索路径不受影响。"""
+        tool = TavilySearchTool(api_key="test-key", warm_connection=False)
+        tool._client = httpx.Client(transport=httpx.MockTransport(_handler))
+
+        results = tool.search("q", SearchTimeRange.NO_LIMIT, max_results=3)
+
+        assert [r.url for r in results] == ["https://example.com/q"]
+
+
+class TestTavilyBatcher:
+    """测试 Tavily 请求合并器。"""
+
+    def test_concurrent_queries_are_coalesced(self):
+        """测试窗口内的并发查询被合并为一批，结果按调用方各自返回。"""
+
+        class RecordingTool:
+            def __init__(self) -> None:
+                self.active = 0
+                self.peak = 0
+
+            async def asearch(self, query, time_range=SearchTimeRange.ONE_YEAR, max_results=10):
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                await asyncio.sleep(0.01)
+                self.active -= 1
+                if query == "bad":
+                    raise RuntimeError("boom")
+                return [query]
+
+        tool = RecordingTool()
+
+        async def run():
+            batcher = TavilyBatcher(tool, max_batch_size=3, max_queue_time=0.05)
+            outcomes = await asyncio.gather(
+                *(batcher.search(q) for q in ["a", "b", "bad", "c"]),
+                return_exceptions=True,
+            )
+            await batcher.aclose()
+            return outcomes
+
+        outcomes = asyncio.run(run())
+
+        assert outcomes[:2] == [["a"], ["b"]]
+        assert isinstance(outcomes[2], RuntimeError)
+        assert outcomes[3] == ["c"]
+        assert tool.peak == 3
+
+    def test_aclose_during_collection_window_cancels_pending_queries(self):
+        """测试收集窗口内关闭时，已收集但未发出的查询被取消而不是永久等待。"""
+
+        class IdleTool:
+            async def asearch(self, query, time_range=SearchTimeRange.ONE_YEAR, max_results=10):
+                return [query]
+
+        async def run():
+            batcher = TavilyBatcher(IdleTool(), max_batch_size=10, max_queue_time=1.0)
+            pending = asyncio.ensure_future(batcher.search("a"))
+            await asyncio.sleep(0.05)
+            await batcher.aclose()
+            return await asyncio.wait_for(asyncio.gather(pending, return_exceptions=True), 1)
+
+        (outcome,) = asyncio.run(run())
+
+        assert isinstance(outcome, asyncio.CancelledError)
+
+
+class TestTavilyParsing:
+    """测试 Tavily 响应解析。"""
+
+    def test_parse_stops_at_max_results(self):
+        """测试只解析前 max_results 条结果。"""
+        tool = TavilySearchTool(api_key="test-key", warm_connection=False)
+        data = {"results": [{"url": f"https://example.com/{i}", "title": str(i)} for i in range(5)]}
+
+        assert [r.title for r in tool._parse_results(data, 2)] == ["0", "1"]
+        assert len(tool._parse_results(data)) == 5
+
+
+class TestTavilyWarmup:
+    """测试连接预热。"""
+
+    def test_warmup_request_is_sent_in_background(self, monkeypatch):
+        """测试初始化时在后台请求一次 API 主机，失败不影响使用。"""
+        monkeypatch.setattr(TavilySearchTool, "_warm_connection", _REAL_WARM_CONNECTION)
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append((request.method, str(request.url)))
+            raise httpx.ConnectError("offline")
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        tool = TavilySearchTool(api_key="test-key", client=client)
+        tool._warmup_thread.join(timeout=2)
+
+        assert seen == [("GET", "https://api.tavily.com/")]
+        assert TavilySearchTool(api_key=None)._warmup_thread is None
+        assert TavilySearchTool(api_key="k", warm_connection=False)._warmup_thread is None
+
+    def test_warmup_skipped_when_disabled(self, monkeypatch):
+        """测试关闭预热时不发出任何请求。"""
+        monkeypatch.setattr(TavilySearchTool, "_warm_connection", _REAL_WARM_CONNECTION)
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return httpx.Response(200)
+
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        tool = TavilySearchTool(api_key="test-key", client=client, warm_connection=False)
+
+        assert tool._warmup_thread is None
+        assert seen == []
+
+
+class TestSharedClient:
+    """测试共享 HTTP 客户端。"""
+
+    def test_providers_share_one_pool(self, monkeypatch):
+        """测试各搜索源默认共用同一个同步客户端，退出上下文不关闭共享客户端。"""
+        monkeypatch.setattr(tavily, "AIOHTTP_AVAILABLE", False)
+        tavily_tool = TavilySearchTool(api_key="k", warm_connection=False)
+        wiki_tool = WikipediaSearchTool(cache_enabled=False)
+
+        assert tavily_tool._client is wiki_tool._client is http.get_client()
+
+        async def run():
+            async with TavilySearchTool(api_key="k", warm_connection=False) as tool:
+                client = tool._get_async_client()
+                assert client is http.get_async_client()
+            await http.aclose_async_client()
+            return client
+
+        assert asyncio.run(run()).is_closed
+        assert not http.get_client().is_closed
+
+    def test_async_client_per_loop_closed_on_loop_shutdown(self):
+        """测试每个事件循环各有一个异步客户端，asyncio.run 结束前在循环内关闭它。"""
+        async def grab():
+            client = http.get_async_client()
+            assert client is http.get_async_client()
+            return client
+
+        first = asyncio.run(grab())
+        second = asyncio.run(grab())
+
+        assert first is not second
+        assert first.is_closed and second.is_closed
+        assert len(http._async_clients) == 0
+
+    def test_async_clients_on_concurrent_loops_are_independent(self):
+        """测试不同线程中的事件循环各自持有客户端，互不替换。"""
+        clients = {}
+        still_current = {}
+        barrier = threading.Barrier(2)
+
+        async def grab(name):
+            clients[name] = http.get_async_client()
+            barrier.wait(timeout=5)
+            # 另一个循环取得客户端后，本循环的客户端仍然可用且未被替换
+            current = http.get_async_client()
+            still_current[name] = current is clients[name] and not current.is_closed
+
+        threads = [threading.Thread(target=asyncio.run, args=(grab(name),)) for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert still_current == {"a": True, "b": True}
+        assert clients["a"] is not clients["b"]
+        assert clients["a"].is_closed and clients["b"].is_closed
+
+    def test_mcp_tool_reuses_shared_client(self):
+        """测试 TavilyMCPTool 不再为每个实例新建客户端，共享客户端带默认 User-Agent。"""
+        first, second = TavilyMCPTool(api_key="k"), TavilyMCPTool(api_key="k")
+
+        assert first._client is second._client is http.get_client()
+        assert first._client.headers["User-Agent"] == http.USER_AGENT
+
+
+class TestTavilyParams:
+    """测试请求参数模板。"""
+
+    def test_params_are_fresh_copies_of_templates(self):
+        """测试参数按时间范围带上 days，且修改返回值不影响模板。"""
+        tool = TavilySearchTool(api_key="k", warm_connection=False)
+
+        week = tool._build_params("a", SearchTimeRange.ONE_WEEK, 3)
+        unlimited = tool._build_params("b", SearchTimeRange.NO_LIMIT, 5)
+        week["query"] = "mutated"
+
+        assert week["days"] == 7 and week["max_results"] == 3
+        assert "days" not in unlimited
+        assert unlimited["query"] == "b" and unlimited["api_key"] == "k"
+        assert "query" not in tool._params_by_range[SearchTimeRange.ONE_WEEK]
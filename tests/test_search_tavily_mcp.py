@@ -0,0 +1,324 @@
+"""测试 Tavily MCP 兼容工具与混合搜索。"""
+
+import asyncio
+import json
+
+import httpx
+
+from src.search import http, skill_fallback, tavily_mcp
+from src.search.providers import skill_fallback as skill_provider
+from src.search.base import SearchResult, SearchTimeRange
+from src.search.tavily_mcp import MCPHybridSearchTool, TavilyMCPTool
+
+
+class FakeFallback:
+    """记录调用的降级搜索工具。"""
+
+    def __init__(self, enable_fallback: bool = True) -> None:
+        self.queries: list[str] = []
+
+    def search(self, query, time_range=SearchTimeRange.ONE_YEAR, max_results=10):
+        self.queries.append(query)
+        return [SearchResult(url="https://fallback.example.com", title=query, summary="")]
+
+    async def asearch(self, query, time_range=SearchTimeRange.ONE_YEAR, max_results=10):
+        return self.search(query, time_range, max_results)
+
+    def check_health(self) -> bool:
+        return True
+
+
+def _mock_async_client(monkeypatch, handler) -> None:
+    real_async_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        httpx,
+        "AsyncClient",
+        lambda **kwargs: real_async_client(transport=httpx.MockTransport(handler)),
+    )
+
+
+async def _run_and_close(coro):
+    try:
+        return await coro
+    finally:
+        await http.aclose_async_client()
+
+
+class TestTavilyMCPAsync:
+    """测试异步搜索。"""
+
+    def test_concurrent_queries_share_client(self, monkeypatch):
+        """测试多个异步查询并发执行并正确解析。"""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            payload = json.loads(request.content)
+            assert payload["days"] == 30
+            item = {"url": "https://a.example.com", "title": payload["query"]}
+            return httpx.Response(200, json={"results": [item]})
+
+        _mock_async_client(monkeypatch, handler)
+        tool = TavilyMCPTool(api_key="k")
+
+        async def run():
+            return await asyncio.gather(
+                *(tool.asearch(q, SearchTimeRange.ONE_MONTH) for q in ("x", "y"))
+            )
+
+        results = asyncio.run(_run_and_close(run()))
+
+        assert [[r.title for r in group] for group in results] == [["x"], ["y"]]
+
+
+class TestHybridAsync:
+    """测试混合搜索的异步降级。"""
+
+    def test_error_falls_back_and_sticks(self, monkeypatch):
+        """测试 Tavily 出错时降级，之后直接使用降级搜索。"""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(1)
+            return httpx.Response(500)
+
+        _mock_async_client(monkeypatch, handler)
+        monkeypatch.setattr(skill_fallback, "SkillFallbackSearchTool", FakeFallback)
+        tool = MCPHybridSearchTool(tavily_api_key="k")
+
+        first = asyncio.run(_run_and_close(tool.asearch("q1")))
+        second = asyncio.run(_run_and_close(tool.asearch("q2")))
+
+        assert [r.title for r in first + second] == ["q1", "q2"]
+        assert tool.is_using_fallback
+        assert len(calls) == 1
+
+    def test_slow_tavily_times_out(self, monkeypatch):
+        """测试 Tavily 超时后降级。"""
+        monkeypatch.setattr(skill_fallback, "SkillFallbackSearchTool", FakeFallback)
+        tool = MCPHybridSearchTool(tavily_api_key="k")
+
+        async def slow_search(*args, **kwargs):
+            await asyncio.sleep(1)
+            return []
+
+        monkeypatch.setattr(tool._tavily_api, "asearch", slow_search)
+
+        results = asyncio.run(tool.asearch("q", tavily_timeout=0.05))
+
+        assert [r.url for r in results] == ["https://fallback.example.com"]
+
+
+class TestTavilyMCPRetry:
+    """测试瞬时错误重试。"""
+
+    def test_rate_limit_is_retried_with_backoff(self, monkeypatch):
+        """测试 429 与连接失败按指数退避重试，成功后返回结果。"""
+        responses = iter([
+            httpx.Response(429),
+            httpx.ConnectError("refused"),
+            httpx.Response(200, json={"results": [{"url": "https://a.example.com", "content": "ok"}]}),
+        ])
+        delays = []
+        monkeypatch.setattr(tavily_mcp.time, "sleep", delays.append)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            outcome = next(responses)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        tool = TavilyMCPTool(api_key="k")
+        tool._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        results = tool.search("q")
+
+        assert [r.summary for r in results] == ["ok"]
+        assert delays == [tavily_mcp.TAVILY_RETRY_BACKOFF, tavily_mcp.TAVILY_RETRY_BACKOFF * 2]
+
+    def test_gives_up_after_max_attempts(self, monkeypatch):
+        """测试重试次数用尽后返回空结果；不可重试的状态码不重试。"""
+        monkeypatch.setattr(tavily_mcp, "TAVILY_RETRY_BACKOFF", 0.0)
+        statuses = {"busy": 503, "bad": 400}
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            query = json.loads(request.content)["query"]
+            calls.append(query)
+            return httpx.Response(statuses[query])
+
+        _mock_async_client(monkeypatch, handler)
+        tool = TavilyMCPTool(api_key="k")
+
+        async def run():
+            return [await tool.asearch("busy"), await tool.asearch("bad")]
+
+        assert asyncio.run(_run_and_close(run())) == [[], []]
+        assert calls == ["busy"] * tavily_mcp.TAVILY_MAX_ATTEMPTS + ["bad"]
+
+
+class TestHybridFallbackCooldown:
+    """测试降级冷却期。"""
+
+    def test_tavily_is_retried_after_cooldown(self, monkeypatch):
+        """测试一次失败只在冷却期内降级，冷却结束后重新使用 Tavily。"""
+        monkeypatch.setattr(skill_fallback, "SkillFallbackSearchTool", FakeFallback)
+        now = [1000.0]
+        monkeypatch.setattr(tavily_mcp.time, "monotonic", lambda: now[0])
+        tool = MCPHybridSearchTool(tavily_api_key="k", cache_ttl=0, fallback_cooldown=30)
+        tavily_results = [[], [SearchResult(url="https://tavily.example.com", title="t", summary="")]]
+        monkeypatch.setattr(tool._tavily_api, "search", lambda *args: tavily_results.pop(0))
+
+        first = tool.search("q1")
+        assert tool.is_using_fallback
+        now[0] += 10
+        second = tool.search("q2")
+        now[0] += 25
+        third = tool.search("q3")
+
+        assert [r.url for r in first + second + third] == [
+            "https://fallback.example.com",
+            "https://fallback.example.com",
+            "https://tavily.example.com",
+        ]
+        assert not tool.is_using_fallback
+
+    def test_missing_api_key_always_falls_back(self, monkeypatch):
+        """测试未配置 Tavily 时始终使用降级搜索。"""
+        monkeypatch.setattr(skill_fallback, "SkillFallbackSearchTool", FakeFallback)
+        monkeypatch.delenv("TAVILY_API_KEY", raising=False)
+
+        assert MCPHybridSearchTool().is_using_fallback
+
+
+class TestHybridSearchMany:
+    """测试混合搜索的批量并发查询。"""
+
+    def test_queries_run_concurrently_within_limit(self, monkeypatch):
+        """测试查询并发执行且不超过并发上限，结果按输入顺序返回。"""
+        monkeypatch.setattr(skill_fallback, "SkillFallbackSearchTool", FakeFallback)
+        tool = MCPHybridSearchTool(tavily_api_key="k", cache_ttl=0)
+        active = peak = 0
+
+        async def fake_asearch(query, time_range=SearchTimeRange.ONE_YEAR, max_results=10):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return [SearchResult(url=f"https://{query}.example.com", title=query, summary="")]
+
+        monkeypatch.setattr(tool, "asearch", fake_asearch)
+        queries = [f"q{i}" for i in range(7)]
+
+        results = asyncio.run(tool.search_many(queries, concurrency=3))
+
+        assert [group[0].title for group in results] == queries
+        assert peak == 3
+
+
+class TestMetadata:
+    """测试元数据缓存。"""
+
+    def test_hybrid_metadata_reuses_leaf_instances(self, monkeypatch):
+        """测试混合搜索按当前模式返回底层工具缓存的元数据，可用性变化后重建。"""
+        monkeypatch.setattr(skill_provider, "_check_skill_available", lambda: True)
+        tool = MCPHybridSearchTool(tavily_api_key="k", cache_ttl=0)
+        tavily_metadata = tool.metadata
+
+        assert tool.metadata is tavily_metadata
+        tool._start_fallback()
+        fallback_metadata = tool.metadata
+        assert fallback_metadata is tool.metadata is not tavily_metadata
+        assert fallback_metadata.is_available
+
+        tool._tavily_api._is_available = False
+        assert tool._tavily_api.metadata is not tavily_metadata
+        assert not tool._tavily_api.metadata.is_available
+
+
+class TestHybridCache:
+    """测试混合搜索的结果缓存。"""
+
+    def test_repeat_query_is_served_from_cache(self, monkeypatch):
+        """测试相同查询命中缓存不再调用降级搜索，invalidate 后重新搜索。"""
+        monkeypatch.setattr(skill_fallback, "SkillFallbackSearchTool", FakeFallback)
+        tool = MCPHybridSearchTool(tavily_api_key=None)
+
+        first = tool.search("q")
+        first.clear()
+        second = tool.search("q")
+        third = asyncio.run(tool.asearch("q"))
+        tool.search("q", max_results=5)
+
+        assert [r.title for r in second] == [r.title for r in third] == ["q"]
+        assert tool._fallback.queries == ["q", "q"]
+
+        tool.invalidate()
+        tool.search("q")
+
+        assert tool._fallback.queries == ["q", "q", "q"]
+
+
+class TestTavilyMCPSync:
+    """测试同步搜索。"""
+
+    def test_sync_search_sends_and_parses_bytes(self):
+        """测试同步路径以 JSON 字节串收发。"""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.headers["content-type"] == "application/json"
+            payload = json.loads(request.content)
+            assert "days" not in payload
+            body = json.dumps({"results": [{"url": "https://b.example.com/x", "content": "正文"}]})
+            return httpx.Response(200, content=body.encode())
+
+        tool = TavilyMCPTool(api_key="k")
+        tool._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        results = tool.search("q", SearchTimeRange.NO_LIMIT)
+
+        assert [(r.site_name, r.summary) for r in results] == [("b.example.com", "正文")]
+
+    def test_params_do_not_share_state_with_template(self):
+        """测试请求参数按时间范围带上 days，且修改返回值不影响固定字段模板。"""
+        tool = TavilyMCPTool(api_key="k")
+
+        week = tool._build_params("q", SearchTimeRange.ONE_WEEK, 5)
+        week["search_depth"] = "basic"
+        unlimited = tool._build_params("q2", SearchTimeRange.NO_LIMIT, 3)
+
+        assert week["days"] == 7
+        assert "days" not in unlimited
+        assert unlimited == {
+            "search_depth": "advanced",
+            "include_answer": False,
+            "include_raw_content": False,
+            "include_images": False,
+            "api_key": "k",
+            "query": "q2",
+            "max_results": 3,
+        }
+
+    def test_parse_results_falls_back_to_other_fields(self):
+        """测试 content 缺失时拼接标题、片段与描述，缺少 results 时返回空列表。"""
+        tool = TavilyMCPTool(api_key="k")
+
+        results = tool._parse_results({"results": [
+            {"url": "https://a.example.com", "title": "标题", "description": "描述"},
+            {"url": "https://b.example.com", "content": "正文", "snippet": "忽略"},
+        ]})
+
+        assert [r.summary for r in results] == ["标题 - 描述", "正文"]
+        assert tool._parse_results({}) == []
+
+    def test_parse_results_drops_duplicate_urls(self):
+        """测试同一页面的不同写法（末尾斜杠、跟踪参数、片段）只保留排名最高的一条。"""
+        tool = TavilyMCPTool(api_key="k")
+
+        results = tool._parse_results({"results": [
+            {"url": "https://a.example.com/page/", "content": "first"},
+            {"url": "https://A.example.com/page?utm_source=x", "content": "dup"},
+            {"url": "https://a.example.com/page#top", "content": "dup"},
+            {"url": "https://a.example.com/page?id=2", "content": "other"},
+        ]})
+
+        assert [r.summary for r in results] == ["first", "other"]
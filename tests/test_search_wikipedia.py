@@ -0,0 +1,119 @@
+"""测试 Wikipedia 搜索源。"""
+
+import asyncio
+
+import httpx
+
+from src.search import http
+from src.search.providers.wikipedia import WikipediaSearchTool
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    params = request.url.params
+    assert params["generator"] == "search"
+    assert params["prop"] == "extracts|info"
+    query = params["gsrsearch"]
+    return httpx.Response(
+        200,
+        json={
+            "query": {
+                "pages": [
+                    {"title": f"{query} B", "index": 2, "extract": "第二  条", "fullurl": "https://zh.wikipedia.org/wiki/B"},
+                    {"title": f"{query} A", "index": 1, "extract": "见 [[目标|链接]]。" + "x" * 600},
+                ]
+            }
+        },
+    )
+
+
+class TestWikipediaSearch:
+    """测试 MediaWiki API 搜索。"""
+
+    def test_single_request_returns_ranked_pages(self):
+        """测试一次请求返回按搜索排名排序、清理过的摘要。"""
+        tool = WikipediaSearchTool(cache_enabled=False)
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return _handler(request)
+
+        tool._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+        results = tool.search("Foo", max_results=5)
+
+        assert len(requests) == 1
+        assert [r.title for r in results] == ["Foo A", "Foo B"]
+        assert results[0].summary.startswith("见 链接。")
+        assert len(results[0].summary) <= 500
+        assert results[0].url == "https://zh.wikipedia.org/wiki/Foo A"
+        assert results[1].summary == "第二 条"
+
+    def test_max_results_truncates(self):
+        """测试结果数受 max_results 约束。"""
+        tool = WikipediaSearchTool(cache_enabled=False)
+        tool._client = httpx.Client(transport=httpx.MockTransport(_handler))
+
+        assert [r.title for r in tool.search("Foo", max_results=1)] == ["Foo A"]
+
+    def test_async_search_and_error(self, monkeypatch):
+        """测试异步路径正常返回，API 错误时返回空结果。"""
+        tool = WikipediaSearchTool(cache_enabled=False)
+        real_async_client = httpx.AsyncClient
+        status = {"code": 200}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if status["code"] != 200:
+                return httpx.Response(status["code"])
+            return _handler(request)
+
+        monkeypatch.setattr(
+            httpx,
+            "AsyncClient",
+            lambda **kwargs: real_async_client(transport=httpx.MockTransport(handler)),
+        )
+
+        async def run():
+            ok = await asyncio.gather(tool.asearch("a"), tool.asearch("b"))
+            status["code"] = 503
+            failed = await tool.asearch("c")
+            await http.aclose_async_client()
+            return ok, failed
+
+        ok, failed = asyncio.run(run())
+
+        assert [[r.title for r in group] for group in ok] == [["a A", "a B"], ["b A", "b B"]]
+        assert failed == []
+
+
+class TestWikipediaCache:
+    """测试页面查询磁盘缓存。"""
+
+    def test_repeat_query_is_served_from_disk(self, tmp_path):
+        """测试相同 (语言, 查询) 跨实例命中缓存，大小写不敏感，语言隔离。"""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.host)
+            return _handler(request)
+
+        def make_tool(lang: str = "zh") -> WikipediaSearchTool:
+            tool = WikipediaSearchTool(lang=lang, cache_dir=tmp_path)
+            tool._client = httpx.Client(transport=httpx.MockTransport(handler))
+            return tool
+
+        first = make_tool().search("Python")
+        second = make_tool().search("python")
+        make_tool("en").search("Python")
+
+        assert second == first
+        assert second[0].summary.startswith("见 链接。")
+        assert calls == ["zh.wikipedia.org", "en.wikipedia.org"]
+
+    def test_failed_request_is_not_cached(self, tmp_path):
+        """测试请求失败时不写入缓存。"""
+        tool = WikipediaSearchTool(cache_dir=tmp_path)
+        tool._client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+
+        assert tool.search("Python") == []
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,242 @@
+"""测试 Signal 数据模式模块。"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.schemas.signals import (
+    Dimension,
+    Sentiment,
+    Signal,
+    SignalFilter,
+    SignalType,
+)
+
+
+def _make_signal(**overrides) -> Signal:
+    data = {
+        "id": "",
+        "signal_type": SignalType.INSIGHT,
+        "dimension": Dimension.PRODUCT,
+        "evidence": "证据",
+        "confidence": 0.8,
+        "strength": 0.6,
+        "sentiment": Sentiment.NEUTRAL,
+    }
+    data.update(overrides)
+    return Signal(**data)
+
+
+class TestSignalFreshness:
+    """测试信号新鲜度计算。"""
+
+    def test_recent_signal_is_fresh(self):
+        """测试新信号判定为新鲜。"""
+        signal = _make_signal()
+
+        assert signal.is_fresh(1)
+        assert 0.0 <= signal.age_hours() < 0.1
+
+    def test_old_signal_is_not_fresh(self):
+        """测试过期信号判定为不新鲜。"""
+        old = (datetime.now() - timedelta(hours=30)).isoformat()
+        signal = _make_signal(timestamp=old)
+
+        assert not signal.is_fresh(24)
+        assert 29.9 < signal.age_hours() < 30.1
+
+    def test_invalid_timestamp(self):
+        """测试无法解析的时间戳。"""
+        signal = _make_signal(timestamp="not-a-time")
+
+        assert not signal.is_fresh(24)
+        assert signal.age_hours() == float("inf")
+
+    def test_is_fresh_at_uses_given_time(self):
+        """测试以调用方给定的时间判断新鲜度。"""
+        signal = _make_signal(timestamp="2024-01-01T00:00:00")
+        epoch = datetime.fromisoformat("2024-01-01T00:00:00").timestamp()
+
+        assert signal.is_fresh_at(epoch + 3600, max_age_hours=2)
+        assert not signal.is_fresh_at(epoch + 3 * 3600, max_age_hours=2)
+        assert SignalFilter(max_age_hours=2).matches(signal, now_epoch=epoch + 3600)
+
+
+class TestSignalFilter:
+    """测试 SignalFilter 类。"""
+
+    def test_matches_many_applies_age_and_fields(self):
+        """测试批量过滤同时应用年龄与字段条件。"""
+        old = (datetime.now() - timedelta(hours=48)).isoformat()
+        fresh = _make_signal(confidence=0.9)
+        stale = _make_signal(confidence=0.9, timestamp=old)
+        weak = _make_signal(confidence=0.2)
+
+        signal_filter = SignalFilter(min_confidence=0.5, max_age_hours=24)
+
+        assert signal_filter.matches_many([fresh, stale, weak]) == [fresh]
+        assert signal_filter.matches(fresh)
+        assert not signal_filter.matches(stale)
+
+    def test_only_active_checks_are_built(self):
+        """测试只为已设置的条件构建谓词。"""
+        assert SignalFilter()._checks == []
+        assert len(SignalFilter(min_confidence=0.5, verified_only=True)._checks) == 2
+
+    def test_tag_and_set_filters(self):
+        """测试标签与集合条件。"""
+        tagged = _make_signal(tags=["pricing", "ai"], dimension=Dimension.MARKET)
+        untagged = _make_signal(tags=["ux"], dimension=Dimension.MARKET)
+
+        signal_filter = SignalFilter(
+            dimensions={Dimension.MARKET},
+            tags={"ai", "cloud"},
+        )
+
+        assert signal_filter.matches(tagged)
+        assert not signal_filter.matches(untagged)
+        assert not SignalFilter(dimensions={Dimension.UX}).matches(tagged)
+
+    def test_checks_ordered_by_cost_and_selectivity(self):
+        """测试谓词按代价与选择性排序：阈值在前，窄集合先于宽集合。"""
+        signal_filter = SignalFilter(
+            tags={"ai"},
+            sentiments={Sentiment.POSITIVE, Sentiment.NEUTRAL},
+            dimensions={Dimension.UX},
+            min_confidence=0.9,
+        )
+        low_confidence = _make_signal(confidence=0.1, tags=["ai"])
+        wrong_dimension = _make_signal(confidence=0.95, dimension=Dimension.MARKET)
+
+        first, second, third, fourth = signal_filter._checks
+        assert not first(low_confidence, 0.0)
+        assert first(wrong_dimension, 0.0) and not second(wrong_dimension, 0.0)
+        assert third(wrong_dimension, 0.0)
+        assert not fourth(wrong_dimension, 0.0)
+
+
+class TestSignalSerialization:
+    """测试 Signal 序列化。"""
+
+    def test_to_dict_round_trip(self):
+        """测试 to_dict 与 from_dict 往返一致。"""
+        signal = _make_signal(
+            signal_type=SignalType.THREAT,
+            sentiment=Sentiment.NEGATIVE,
+            tags=["pricing"],
+            author_agent="scout",
+        )
+
+        data = signal.to_dict()
+
+        assert data["signal_type"] == "threat"
+        assert data["sentiment"] == "negative"
+        assert data["actionability"] == "informational"
+        assert data["content"] == data["evidence"]
+        assert Signal.from_dict(data) == signal
+
+    def test_signal_uses_slots(self):
+        """测试 Signal 不再携带实例 __dict__。"""
+        assert not hasattr(_make_signal(), "__dict__")
+
+    def test_to_json_matches_to_dict(self):
+        """测试 to_json 输出与 to_dict 一致。"""
+        signal = _make_signal(evidence="中文证据", tags=["ai"], metadata={"n": 1})
+
+        assert json.loads(signal.to_json()) == signal.to_dict()
+
+    def test_from_dict_accepts_values_and_members(self):
+        """测试 from_dict 同时接受字符串取值与枚举成员。"""
+        from_value = Signal.from_dict({"signal_type": "risk", "dimension": "ux"})
+        from_member = Signal.from_dict({"signal_type": SignalType.RISK})
+
+        assert from_value.signal_type is SignalType.RISK
+        assert from_value.dimension is Dimension.UX
+        assert from_member.signal_type is SignalType.RISK
+
+    def test_from_dict_rejects_unknown_values(self):
+        """测试未知枚举值仍然报错。"""
+        with pytest.raises(ValueError):
+            Signal.from_dict({"signal_type": "unknown"})
+
+
+class TestSignalFilterBatch:
+    """测试 SignalFilter 批量过滤路径。"""
+
+    def test_matches_many_agrees_with_matches(self):
+        """测试各批量路径与逐条匹配结果一致。"""
+        signals = [
+            _make_signal(confidence=c / 10, strength=(10 - c) / 10, verified=c % 2 == 0)
+            for c in range(11)
+        ]
+        filters = [
+            SignalFilter(),
+            SignalFilter(min_confidence=0.5),
+            SignalFilter(min_confidence=0.3, min_strength=0.3, verified_only=True),
+        ]
+
+        for signal_filter in filters:
+            expected = [s for s in signals if signal_filter.matches(s)]
+            assert signal_filter.matches_many(signals) == expected
+
+
+class TestSignalUpdate:
+    """测试 Signal 强度更新。"""
+
+    def test_with_updated_strength(self):
+        """测试更新强度、验证状态与辩论观点。"""
+        signal = _make_signal(tags=["ai"], metadata={"k": "v"})
+
+        updated = signal.with_updated_strength(1.5, verifier="red_team", debate_point="反驳")
+
+        assert updated.id == signal.id
+        assert updated.strength == 1.0
+        assert updated.verified
+        assert updated.debate_points == ["反驳"]
+        assert updated.metadata == {"k": "v", "verified_by": "red_team"}
+        assert signal.debate_points == []
+        assert signal.metadata == {"k": "v"}
+
+    def test_with_updated_strength_reuses_unchanged_fields(self):
+        """测试未变化的字段复用原对象。"""
+        signal = _make_signal(tags=["ai"], metadata={"k": "v"})
+
+        updated = signal.with_updated_strength(0.2)
+
+        assert updated.strength == 0.2
+        assert not updated.verified
+        assert updated.tags is signal.tags
+        assert updated.metadata is signal.metadata
+
+
+class TestSignalInterning:
+    """测试 Signal 字符串驻留。"""
+
+    def test_repeated_strings_are_shared(self):
+        """测试重复的来源、作者与标签共享同一字符串对象。"""
+        # 运行时拼接，避免字面量常量本身已被驻留
+        def build() -> Signal:
+            return _make_signal(
+                source="".join(["web", "site"]),
+                author_agent="".join(["sc", "out"]),
+                tags=["".join(["a", "i"])],
+            )
+
+        first, second = build(), build()
+
+        assert first.source is second.source
+        assert first.author_agent is second.author_agent
+        assert first.tags[0] is second.tags[0]
+
+
+class TestSignalSortKey:
+    """测试 Signal 排序键。"""
+
+    def test_sort_key_follows_enum_order(self):
+        """测试排序键按枚举定义顺序编码。"""
+        threat = _make_signal(signal_type=SignalType.THREAT, dimension=Dimension.MARKET)
+        insight = _make_signal(signal_type=SignalType.INSIGHT, dimension=Dimension.UX)
+
+        assert threat.sort_key() == (1, 2, 3)
+        assert sorted([threat, insight], key=Signal.sort_key) == [insight, threat]
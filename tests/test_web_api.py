@@ -1,8 +1,12 @@
 """Web API 行为测试。"""
 
+import json
+import threading
 import time
 from types import SimpleNamespace
 
+import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from src.coordinator import CoordinatorResult
@@ -10,6 +14,7 @@ from src.web import app as web_app
 from src.web.jobs import AnalysisJobStatus
 
 
+@pytest.mark.slow
 def test_api_analyze_returns_structured_504_on_timeout(monkeypatch):
     """同步分析超时应返回结构化 504，而不是 500。"""
 
@@ -57,11 +62,15 @@ def test_api_analyze_success_response_keeps_legacy_shape(monkeypatch):
                 metadata={"total_discoveries": 7},
             )
 
+    report_threads = set()
+
     class _FakeHTMLGenerator:
         def generate_html(self, result):
+            report_threads.add(threading.get_ident())
             return "/tmp/report.html"
 
         def generate_json(self, result):
+            report_threads.add(threading.get_ident())
             return "/tmp/report.json"
 
     monkeypatch.setattr(web_app, "_build_coordinator", lambda **kwargs: _FastCoordinator())
@@ -78,6 +87,191 @@ def test_api_analyze_success_response_keeps_legacy_shape(monkeypatch):
     assert payload["total_discoveries"] == 7
     assert payload["html_report"] == "/static/report.html"
     assert payload["json_data"] == "/static/report.json"
+    assert response.headers["content-type"] == "application/json"
+    assert threading.get_ident() not in report_threads
+
+
+def test_api_analyze_omits_null_fields(monkeypatch):
+    """同步分析成功响应应省略值为 None 的字段。"""
+
+    class _Coordinator:
+        def analyze(self, target, competitors=None, focus_areas=None):
+            return CoordinatorResult(
+                target=target,
+                success=True,
+                duration=0.5,
+                agent_results={},
+                metadata={"total_discoveries": None},
+            )
+
+    class _FakeHTMLGenerator:
+        def generate_html(self, result):
+            return "/tmp/report.html"
+
+        def generate_json(self, result):
+            return "/tmp/report.json"
+
+    monkeypatch.setattr(web_app, "_build_coordinator", lambda **kwargs: _Coordinator())
+    monkeypatch.setattr(web_app, "get_html_generator", lambda: _FakeHTMLGenerator())
+
+    with TestClient(web_app.app) as client:
+        response = client.post("/api/analyze", json={"target": "Notion"})
+
+    assert response.status_code == 200
+    assert "total_discoveries" not in response.json()
+    assert response.json()["duration"] == 0.5
+
+
+def test_orjson_response_renders_compact_utf8():
+    """ORJSONResponse 应输出紧凑的 UTF-8 JSON，且为应用默认响应类。"""
+    response = web_app.ORJSONResponse({"target": "飞书", "ok": True})
+
+    assert response.body == '{"target":"飞书","ok":true}'.encode("utf-8")
+    assert web_app.app.router.default_response_class is web_app.ORJSONResponse
+
+
+def test_dashboard_serves_cached_bytes_with_etag():
+    """首页与仪表盘应返回预编码的同一份 HTML，并附带 ETag。"""
+    identity = {"Accept-Encoding": "identity"}
+    with TestClient(web_app.app) as client:
+        root = client.get("/", headers=identity)
+        dashboard = client.get("/dashboard", headers=identity)
+
+    assert root.status_code == 200
+    assert root.content == dashboard.content == web_app.get_dashboard_html().encode("utf-8")
+    assert root.headers["content-type"] == "text/html; charset=utf-8"
+    assert "content-encoding" not in root.headers
+    assert root.headers["etag"] == dashboard.headers["etag"] == web_app._DASHBOARD_ETAG
+
+
+def test_dashboard_serves_precompressed_gzip():
+    """客户端接受 gzip 时应返回预压缩的页面，并以独立 ETag 区分编码。"""
+    with TestClient(web_app.app) as client:
+        response = client.get("/dashboard", headers={"Accept-Encoding": "gzip"})
+        refused = client.get("/dashboard", headers={"Accept-Encoding": "gzip;q=0, identity"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == web_app._DASHBOARD_GZIP_ETAG
+    assert int(response.headers["content-length"]) == len(web_app._DASHBOARD_GZIP)
+    assert response.content == web_app._DASHBOARD_BYTES
+    assert "content-encoding" not in refused.headers
+
+
+def test_dashboard_returns_304_when_etag_matches():
+    """If-None-Match 命中仪表盘 ETag 时应返回空响应体的 304。"""
+    with TestClient(web_app.app) as client:
+        response = client.get(
+            "/dashboard",
+            headers={"If-None-Match": web_app._DASHBOARD_ETAG, "Accept-Encoding": "identity"},
+        )
+        gzip_response = client.get(
+            "/dashboard",
+            headers={"If-None-Match": web_app._DASHBOARD_GZIP_ETAG, "Accept-Encoding": "gzip"},
+        )
+        stale = client.get("/dashboard", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == gzip_response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == web_app._DASHBOARD_ETAG
+    assert stale.status_code == 200
+
+
+def test_report_supports_conditional_get(tmp_path, monkeypatch):
+    """报告文件应带 mtime+size ETag，命中时返回 304，文件变化后重新下发。"""
+    report = tmp_path / "report.html"
+    report.write_text("<html>v1</html>", encoding="utf-8")
+    monkeypatch.setattr(web_app, "STATIC_DIR", tmp_path)
+
+    with TestClient(web_app.app) as client:
+        first = client.get("/report/report.html")
+        etag = first.headers["etag"]
+        cached = client.get("/report/report.html", headers={"If-None-Match": etag})
+
+        report.write_text("<html>version 2</html>", encoding="utf-8")
+        changed = client.get("/report/report.html", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert first.content == b"<html>v1</html>"
+    assert etag.startswith('W/"')
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert first.headers["cache-control"] == web_app.REPORT_CACHE_CONTROL
+    assert cached.headers["cache-control"] == web_app.REPORT_CACHE_CONTROL
+    assert "last-modified" in first.headers
+
+
+def test_missing_report_returns_cached_404_page(tmp_path, monkeypatch):
+    """报告不存在时应返回 404 与缓存的 404 页面，而不是每次重新读取文件。"""
+    (tmp_path / "404.html").write_text("<p>missing</p>", encoding="utf-8")
+    (tmp_path / "reports").mkdir()
+    monkeypatch.setattr(web_app, "STATIC_DIR", tmp_path)
+    web_app._not_found_page.cache_clear()
+
+    with TestClient(web_app.app) as client:
+        first = client.get("/report/nope.html")
+        (tmp_path / "404.html").unlink()
+        second = client.get("/report/nope.html")
+        directory = client.get("/report/reports")
+
+    web_app._not_found_page.cache_clear()
+    assert first.status_code == second.status_code == directory.status_code == 404
+    assert first.content == second.content == directory.content == b"<p>missing</p>"
+    assert first.headers["cache-control"] == web_app.NOT_FOUND_CACHE_CONTROL
+
+
+def test_missing_report_without_404_page_uses_default(tmp_path, monkeypatch):
+    """output 目录中没有 404.html 时使用内置页面。"""
+    monkeypatch.setattr(web_app, "STATIC_DIR", tmp_path)
+
+    with TestClient(web_app.app) as client:
+        response = client.get("/report/nope.html")
+
+    assert response.status_code == 404
+    assert "报告不存在" in response.text
+
+
+def test_static_files_carry_cache_headers(tmp_path):
+    """静态文件响应应附带 Cache-Control 与 Last-Modified。"""
+    (tmp_path / "app.css").write_text("body {}", encoding="utf-8")
+    static_app = FastAPI()
+    static_app.mount("/static", web_app.CachedStaticFiles(directory=str(tmp_path)))
+
+    with TestClient(static_app) as client:
+        response = client.get("/static/app.css")
+        cached = client.get("/static/app.css", headers={"If-None-Match": response.headers["etag"]})
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == web_app.STATIC_CACHE_CONTROL
+    assert "last-modified" in response.headers
+    assert cached.status_code == 304
+    assert cached.headers["cache-control"] == web_app.STATIC_CACHE_CONTROL
+
+
+def test_websocket_events_are_text_frames_with_type_and_timestamp():
+    """WebSocket 事件应以文本帧发送，包含 type 与 timestamp。"""
+    with TestClient(web_app.app) as client:
+        with client.websocket_connect("/ws/analysis") as websocket:
+            connected = websocket.receive_text()
+            websocket.send_json({"action": "ping"})
+            pong = websocket.receive_json()
+
+    assert json.loads(connected)["type"] == "connected"
+    assert list(pong) == ["type", "timestamp"]
+    assert pong["type"] == "pong"
+
+
+def test_websocket_accepts_binary_json_frames():
+    """WebSocket 应同时接受文本帧与二进制帧的 JSON 请求。"""
+    with TestClient(web_app.app) as client:
+        with client.websocket_connect("/ws/analysis") as websocket:
+            websocket.receive_json()
+            websocket.send_bytes(b'{"action": "ping"}')
+            pong = websocket.receive_json()
+
+    assert pong["type"] == "pong"
 
 
 def test_async_job_endpoints_create_and_fetch(monkeypatch):
@@ -1,5 +1,9 @@
 """WebSocket 进度回调辅助函数测试。"""
 
+import asyncio
+import json
+from datetime import datetime
+
 from src.web import app as web_app
 
 
@@ -39,46 +43,174 @@ def test_build_ws_progress_callbacks_emits_expected_payloads(monkeypatch):
     ]
 
 
-def test_schedule_ws_message_uses_threadsafe_sender(monkeypatch):
-    """调度函数应通过 run_coroutine_threadsafe 发送并附带 timestamp。"""
+def test_schedule_ws_message_uses_threadsafe_sender():
+    """调度函数应通过 call_soon_threadsafe 把带 timestamp 的事件交给连接管理器合并。"""
     captured: dict[str, object] = {}
 
-    class _FakeAwaitable:
-        def __await__(self):
-            if False:
-                yield None
-            return None
-
-    class _FakeFuture:
-        def add_done_callback(self, callback):
-            callback(self)
-
-        def result(self):
-            return None
-
-    def _fake_send_personal(message, websocket):
-        captured["message"] = message
-        captured["websocket"] = websocket
-        return _FakeAwaitable()
-
-    def _fake_run_coroutine_threadsafe(coro, loop):
-        captured["loop"] = loop
-        captured["coro"] = coro
-        return _FakeFuture()
-
-    monkeypatch.setattr(web_app.manager, "send_personal", _fake_send_personal)
-    monkeypatch.setattr(web_app.asyncio, "run_coroutine_threadsafe", _fake_run_coroutine_threadsafe)
+    class _FakeLoop:
+        def call_soon_threadsafe(self, callback, *args):
+            captured["callback"] = callback
+            captured["args"] = args
 
     websocket = object()
-    loop = object()
     web_app._schedule_ws_message(
-        loop=loop,
+        loop=_FakeLoop(),
         websocket=websocket,
         payload={"type": "phase_started", "phase": "基础分析"},
     )
 
-    assert captured["loop"] is loop
-    assert captured["websocket"] is websocket
-    assert captured["message"]["type"] == "phase_started"
-    assert captured["message"]["phase"] == "基础分析"
-    assert "timestamp" in captured["message"]
+    sent_websocket, message = captured["args"]
+    assert captured["callback"] == web_app.manager.queue_event
+    assert sent_websocket is websocket
+    assert message["type"] == "phase_started"
+    assert message["phase"] == "基础分析"
+    assert "timestamp" in message
+
+
+class _FakeWebSocket:
+    """记录发送内容的 WebSocket 桩。"""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+
+    async def accept(self):
+        return None
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("closed")
+        self.sent.append(text)
+
+
+def test_broadcast_enqueues_without_waiting_and_drops_failed_connections():
+    """广播应只序列化一次、立即返回，并移除发送失败的连接。"""
+
+    async def _run():
+        manager = web_app.ConnectionManager()
+        slow, fast, broken = _FakeWebSocket(0.2), _FakeWebSocket(), _FakeWebSocket(fail=True)
+        for websocket in (slow, broken, fast):
+            await manager.connect(websocket)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await manager.broadcast({"type": "phase_started", "phase": "基础分析"})
+        elapsed = loop.time() - started
+
+        await asyncio.sleep(0.05)
+        fast_sent_early = list(fast.sent)
+        await manager.flush_and_disconnect(slow)
+        return manager, slow, fast, fast_sent_early, elapsed
+
+    manager, slow, fast, fast_sent_early, elapsed = asyncio.run(_run())
+
+    assert elapsed < 0.05
+    assert len(fast_sent_early) == 1
+    assert manager.active_connections == {fast}
+    assert slow.sent == fast.sent
+    assert json.loads(slow.sent[0]) == {"type": "phase_started", "phase": "基础分析"}
+
+
+def test_send_personal_falls_back_to_jsonable_encoder():
+    """基本类型消息直接编码，含 datetime 等值时回退到 jsonable_encoder。"""
+
+    async def _run():
+        manager = web_app.ConnectionManager()
+        websocket = _FakeWebSocket()
+        await manager.connect(websocket)
+        await manager.send_personal({"type": "ping", "count": 1}, websocket)
+        await manager.send_personal({"type": "done", "at": datetime(2024, 1, 2, 3, 4, 5)}, websocket)
+        await manager.flush_and_disconnect(websocket)
+        return websocket
+
+    frames = [json.loads(text) for text in asyncio.run(_run()).sent]
+
+    assert frames == [
+        {"type": "ping", "count": 1},
+        {"type": "done", "at": "2024-01-02T03:04:05"},
+    ]
+
+
+def test_send_queue_overflow_disconnects_slow_connection():
+    """发送队列写满时应断开慢连接，而不是无限堆积。"""
+
+    async def _run():
+        manager = web_app.ConnectionManager(queue_size=2)
+        websocket = _FakeWebSocket(delay=1.0)
+        await manager.connect(websocket)
+        for index in range(4):
+            await manager.send_personal({"index": index}, websocket)
+        return manager
+
+    manager = asyncio.run(_run())
+
+    assert manager.active_connections == set()
+    assert manager._queues == {}
+
+
+def test_connection_manager_tracks_connections_as_set():
+    """连接集合应支持重复断开而不报错。"""
+
+    async def _run():
+        manager = web_app.ConnectionManager()
+        websocket = _FakeWebSocket()
+
+        await manager.connect(websocket)
+        connected = set(manager.active_connections)
+
+        manager.disconnect(websocket)
+        manager.disconnect(websocket)
+        await asyncio.sleep(0)
+        return manager, websocket, connected
+
+    manager, websocket, connected = asyncio.run(_run())
+
+    assert connected == {websocket}
+    assert manager.active_connections == set()
+    assert manager._drain_tasks == {}
+
+
+def test_progress_events_are_merged_into_batch_frames():
+    """合并窗口内的进度事件应合并为一个 batch 帧，随后的普通消息保持顺序。"""
+
+    async def _run():
+        manager = web_app.ConnectionManager(batch_interval=10, batch_max_events=3)
+        websocket = _FakeWebSocket()
+        await manager.connect(websocket)
+
+        for index in range(4):
+            manager.queue_event(websocket, {"type": "agent_started", "agent": f"a{index}"})
+        await manager.send_personal({"type": "analysis_completed"}, websocket)
+        await manager.flush_and_disconnect(websocket)
+        return websocket
+
+    frames = [json.loads(text) for text in asyncio.run(_run()).sent]
+
+    assert frames[0]["type"] == "batch"
+    assert [event["agent"] for event in frames[0]["events"]] == ["a0", "a1", "a2"]
+    assert frames[1] == {"type": "agent_started", "agent": "a3"}
+    assert frames[2] == {"type": "analysis_completed"}
+
+
+def test_progress_events_flush_after_batch_interval():
+    """合并窗口结束后应自动发送缓冲的进度事件。"""
+
+    async def _run():
+        manager = web_app.ConnectionManager(batch_interval=0.01)
+        websocket = _FakeWebSocket()
+        await manager.connect(websocket)
+        manager.queue_event(websocket, {"type": "phase_started", "phase": "收集"})
+        manager.queue_event(websocket, {"type": "agent_started", "agent": "scout"})
+        await asyncio.sleep(0.05)
+        return manager, websocket
+
+    manager, websocket = asyncio.run(_run())
+
+    assert len(websocket.sent) == 1
+    assert [event["type"] for event in json.loads(websocket.sent[0])["events"]] == [
+        "phase_started",
+        "agent_started",
+    ]
+    assert manager._flush_handles == {}
@@ -2,6 +2,7 @@
 
 import asyncio
 import time
+from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
@@ -15,7 +16,14 @@ async def test_job_manager_status_transitions_to_succeeded(monkeypatch):
     """任务应经历 queued/running 并最终 succeeded。"""
 
     class _FakeCoordinator:
-        def __init__(self, environment=None, on_phase_start=None, on_phase_complete=None, on_agent_start=None):
+        def __init__(
+            self,
+            environment=None,
+            search_tool=None,
+            on_phase_start=None,
+            on_phase_complete=None,
+            on_agent_start=None,
+        ):
             self._on_phase_start = on_phase_start
             self._on_phase_complete = on_phase_complete
             self._on_agent_start = on_agent_start
@@ -78,12 +86,20 @@ async def test_job_manager_status_transitions_to_succeeded(monkeypatch):
         await manager.stop()
 
 
+@pytest.mark.slow
 @pytest.mark.asyncio
 async def test_job_manager_marks_timeout_with_structured_error(monkeypatch):
     """任务超时应被标记为 timed_out 并带结构化 error。"""
 
     class _SlowCoordinator:
-        def __init__(self, environment=None, on_phase_start=None, on_phase_complete=None, on_agent_start=None):
+        def __init__(
+            self,
+            environment=None,
+            search_tool=None,
+            on_phase_start=None,
+            on_phase_complete=None,
+            on_agent_start=None,
+        ):
             self._environment = environment
 
         def analyze(self, target, competitors=None, focus_areas=None):
@@ -159,7 +175,14 @@ async def test_job_manager_parallel_jobs_do_not_mix_run_ids_or_reports(monkeypat
     """并发任务应保持 run_id 隔离，且报告路径不互相覆盖。"""
 
     class _FakeCoordinator:
-        def __init__(self, environment=None, on_phase_start=None, on_phase_complete=None, on_agent_start=None):
+        def __init__(
+            self,
+            environment=None,
+            search_tool=None,
+            on_phase_start=None,
+            on_phase_complete=None,
+            on_agent_start=None,
+        ):
             self._environment = environment
 
         def analyze(self, target, competitors=None, focus_areas=None):
@@ -214,3 +237,12 @@ async def test_job_manager_parallel_jobs_do_not_mix_run_ids_or_reports(monkeypat
         assert payload_a["result"]["json_data"] != payload_b["result"]["json_data"]
     finally:
         await manager.stop()
+
+
+@pytest.mark.parametrize(
+    "report_path",
+    ["output/report.html", Path("output") / "report.html", "report.html"],
+)
+def test_build_static_url_uses_file_name(report_path):
+    """报告地址只取文件名，兼容 str 与 Path。"""
+    assert jobs_module.build_static_url(report_path) == "/static/report.html"
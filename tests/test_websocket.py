@@ -1,8 +1,10 @@
 """WebSocket 端到端事件流测试。"""
 
+import threading
 import time
 from types import SimpleNamespace
 
+import pytest
 from fastapi.testclient import TestClient
 
 from src.coordinator import CoordinatorResult
@@ -46,6 +48,9 @@ def test_ws_analysis_streams_phase_and_agent_events(monkeypatch):
         def generate_html(self, result):
             return "/tmp/ws_report.html"
 
+        def generate_json(self, result):
+            return "/tmp/ws_report.json"
+
     monkeypatch.setattr(web_app, "Coordinator", _FakeCoordinator)
     monkeypatch.setattr(web_app, "get_html_generator", lambda: _FakeHTMLGenerator())
 
@@ -74,13 +79,16 @@ def test_ws_analysis_streams_phase_and_agent_events(monkeypatch):
             received_event_types = set()
             for _ in range(20):
                 message = websocket.receive_json()
-                received_event_types.add(message.get("type"))
+                # 进度事件可能被合并为 batch 帧
+                events = message["events"] if message.get("type") == "batch" else [message]
+                received_event_types.update(event.get("type") for event in events)
                 if required_event_types.issubset(received_event_types):
                     break
 
             assert required_event_types.issubset(received_event_types)
 
 
+@pytest.mark.slow
 def test_ws_analysis_timeout_emits_structured_error(monkeypatch):
     """/ws/analysis 超时时应推送结构化错误对象。"""
 
@@ -121,3 +129,52 @@ def test_ws_analysis_timeout_emits_structured_error(monkeypatch):
             assert "Use /api/analyze/jobs" in error_message["hint"]
             assert error_message["timeout_seconds"] == 1
             assert error_message["run_id"] == "run-ws-timeout"
+
+
+def test_ws_analysis_answers_ping_while_running(monkeypatch):
+    """分析进行中仍应响应 ping，完成事件包含报告链接。"""
+    release = threading.Event()
+
+    class _BlockingCoordinator:
+        def __init__(self, environment=None, on_phase_start=None, on_phase_complete=None, on_agent_start=None):
+            pass
+
+        def analyze(self, target, competitors=None, focus_areas=None):
+            release.wait(timeout=5)
+            return CoordinatorResult(
+                target=target,
+                success=True,
+                duration=0.1,
+                agent_results={},
+                metadata={"total_discoveries": 3},
+            )
+
+    class _FakeHTMLGenerator:
+        def generate_html(self, result):
+            return "/tmp/ws_ping_report.html"
+
+        def generate_json(self, result):
+            return "/tmp/ws_ping_report.json"
+
+    monkeypatch.setattr(web_app, "Coordinator", _BlockingCoordinator)
+    monkeypatch.setattr(web_app, "get_html_generator", lambda: _FakeHTMLGenerator())
+
+    with TestClient(web_app.app) as client:
+        with client.websocket_connect("/ws/analysis") as websocket:
+            assert websocket.receive_json()["type"] == "connected"
+
+            websocket.send_json({"action": "analyze", "target": "Notion"})
+            assert websocket.receive_json()["type"] == "analysis_started"
+
+            websocket.send_json({"action": "ping"})
+            try:
+                assert websocket.receive_json()["type"] == "pong"
+            finally:
+                release.set()
+
+            completed = websocket.receive_json()
+
+    assert completed["type"] == "analysis_completed"
+    assert completed["total_discoveries"] == 3
+    assert completed["html_report"] == "/static/ws_ping_report.html"
+    assert completed["json_data"] == "/static/ws_ping_report.json"